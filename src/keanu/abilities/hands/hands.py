@@ -9,6 +9,8 @@ import subprocess
 from pathlib import Path
 
 from keanu.abilities import Ability, ability
+from keanu.tools.cache import file_cache
+from keanu.tools.inventory import inventory, invalidate_inventories
 
 
 # safety: directories the agent can read/write
@@ -75,7 +77,7 @@ class ReadFileAbility(Ability):
         line_limit = int(context.get("line_limit", 0)) if context else 0
 
         try:
-            raw = Path(path).read_text()
+            raw = file_cache.read(path)
             total_chars = len(raw)
             lines = raw.splitlines(keepends=True)
             total_lines = len(lines)
@@ -163,6 +165,8 @@ class WriteFileAbility(Ability):
             p = Path(path)
             p.parent.mkdir(parents=True, exist_ok=True)
             p.write_text(content)
+            file_cache.invalidate(path)
+            invalidate_inventories()
             return {
                 "success": True,
                 "result": f"Wrote {len(content)} chars to {path}",
@@ -201,7 +205,7 @@ class EditFileAbility(Ability):
 
         try:
             p = Path(path)
-            content = p.read_text()
+            content = file_cache.read(path)
             count = content.count(old)
             if count == 0:
                 return {"success": False, "result": f"old_string not found in {path}", "data": {}}
@@ -210,6 +214,8 @@ class EditFileAbility(Ability):
 
             new_content = content.replace(old, new, 1)
             p.write_text(new_content)
+            file_cache.invalidate(path)
+            invalidate_inventories()
             return {
                 "success": True,
                 "result": f"Edited {path}",
@@ -248,8 +254,14 @@ class SearchAbility(Ability):
         # glob mode: find files by name pattern
         if glob_pattern and not pattern:
             try:
-                matches = sorted(Path(path).rglob(glob_pattern))[:50]
-                result_lines = [str(m) for m in matches]
+                # the project's own inventory, narrowed to path: one walk
+                # per project, and the root's .gitignore still applies
+                target = Path(path).resolve()
+                root = next(r for r in _get_safe_roots() if r == target or r in target.parents)
+                under = target.relative_to(root).as_posix() if target != root else ""
+                skip = len(under) + 1 if under else 0
+                matches = inventory(str(root)).glob(glob_pattern, under=under)[:50]
+                result_lines = [str(Path(path) / m[skip:]) for m in matches]
                 return {
                     "success": True,
                     "result": "\n".join(result_lines) if result_lines else "No files matched.",
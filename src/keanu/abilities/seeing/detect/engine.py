@@ -9,6 +9,7 @@ geometry notices what reading alone can miss.
 import sys
 import re
 import json
+import math
 from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
@@ -31,90 +32,42 @@ class Report:
     score: float = 0.0
 
 
-from keanu.wellspring import depths, tap, draw, sift, resolve_backend
+from keanu.wellspring import depths, tap, draw, sift, resolve_backend, pole_matrix
 
 
-def _scan_behavioral(store, lines, pattern_name, threshold=0.65, high_threshold=0.75):
-    """Scan using behavioral store. Same output as scan()."""
-    scannable = sift(lines)
-    if not scannable:
-        return []
-
-    notices = []
-    for line_num, text in scannable:
-        pos_results = store.query(
-            "silverado", text, n_results=3,
-            where={"$and": [{"detector": pattern_name}, {"valence": "positive"}]},
-        )
-        if not pos_results['distances'][0]:
-            continue
-
-        pos_sim = 1 - min(pos_results['distances'][0])
-        if pos_sim < threshold:
-            continue
-
-        neg_results = store.query(
-            "silverado", text, n_results=3,
-            where={"$and": [{"detector": pattern_name}, {"valence": "negative"}]},
-        )
-
-        neg_sim = 0.0
-        if neg_results['distances'][0]:
-            neg_sim = 1 - min(neg_results['distances'][0])
-
-        gap = pos_sim - neg_sim
-        if gap < 0.05:
-            continue
-
-        strength = "STRONG" if pos_sim >= high_threshold else "PRESENT"
-        notices.append(Notice(
-            category=pattern_name, strength=strength,
-            line_num=line_num, text=text[:120],
-            detail=f"similarity: {pos_sim:.3f}, boundary: {neg_sim:.3f}, clarity: {gap:.3f}",
-        ))
-
-    return notices
+def _valence_poles(detector_name):
+    """where filters for a detector's positive and negative examples."""
+    return [
+        {"$and": [{"detector": detector_name}, {"valence": "positive"}]},
+        {"$and": [{"detector": detector_name}, {"valence": "negative"}]},
+    ]
 
 
 def scan(lines, pattern_name, threshold=0.65, high_threshold=0.75, backend="auto"):
     """Query vectors for a pattern. Return what we notice.
 
     backend: "auto" (behavioral first, chromadb fallback), "behavioral", "chromadb"
+    All sifted lines are scored against both poles in one batch.
     """
     behavioral_store, collection = resolve_backend("silverado", backend)
-
-    if behavioral_store:
-        return _scan_behavioral(behavioral_store, lines, pattern_name, threshold, high_threshold)
-
-    if collection is None:
+    if behavioral_store is None and collection is None:
         return []
 
     scannable = sift(lines)
     if not scannable:
         return []
 
-    notices = []
-
-    for line_num, text in scannable:
-        pos_results = collection.query(
-            query_texts=[text], n_results=3,
-            where={"$and": [{"detector": pattern_name}, {"valence": "positive"}]},
-        )
-        if not pos_results['distances'][0]:
-            continue
+    sims = pole_matrix(
+        behavioral_store, collection, "silverado",
+        [text for _, text in scannable], _valence_poles(pattern_name),
+    )
 
-        pos_sim = 1 - min(pos_results['distances'][0])
-        if pos_sim < threshold:
+    notices = []
+    for (line_num, text), (pos_sim, neg_sim) in zip(scannable, sims.tolist()):
+        if math.isnan(pos_sim) or pos_sim < threshold:
             continue
-
-        neg_results = collection.query(
-            query_texts=[text], n_results=3,
-            where={"$and": [{"detector": pattern_name}, {"valence": "negative"}]},
-        )
-
-        neg_sim = 0.0
-        if neg_results['distances'][0]:
-            neg_sim = 1 - min(neg_results['distances'][0])
+        if math.isnan(neg_sim):
+            neg_sim = 0.0
 
         gap = pos_sim - neg_sim
         if gap < 0.05:
@@ -237,25 +190,19 @@ def detect_emotion(text, threshold=0.55, backend="auto"):
     Returns list of dicts: {state, empathy, intensity}
     """
     behavioral_store, collection = resolve_backend("silverado", backend)
-
-    if behavioral_store:
-        def query_fn(detector_name, valence):
-            r = behavioral_store.query(
-                "silverado", text, n_results=3,
-                where={"$and": [{"detector": detector_name}, {"valence": valence}]},
-            )
-            return r['distances'][0]
-        return _score_empathy(query_fn, text, threshold)
-
-    if collection is None:
+    if behavioral_store is None and collection is None:
         return []
 
+    poles = [where for name in EMPATHY_MAP for where in _valence_poles(name)]
+    sims = pole_matrix(behavioral_store, collection, "silverado", [text], poles)[0].tolist()
+    by_pole = {}
+    for i, name in enumerate(EMPATHY_MAP):
+        by_pole[(name, "positive")] = sims[2 * i]
+        by_pole[(name, "negative")] = sims[2 * i + 1]
+
     def query_fn(detector_name, valence):
-        r = collection.query(
-            query_texts=[text], n_results=3,
-            where={"$and": [{"detector": detector_name}, {"valence": valence}]},
-        )
-        return r['distances'][0]
+        sim = by_pole[(detector_name, valence)]
+        return [] if math.isnan(sim) else [1 - sim]
     return _score_empathy(query_fn, text, threshold)
 
 
@@ -10,6 +10,8 @@ import re
 import argparse
 from pathlib import Path
 
+from keanu.wellspring import mark_baked
+
 PACKAGE_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 CHROMA_DIR = str(PACKAGE_ROOT / ".chroma")
 DEFAULT_EXAMPLES = str(PACKAGE_ROOT / "examples" / "reference-examples.md")
@@ -139,6 +141,7 @@ def bake_detectors(examples_path=None):
 
     print(f"  embedding {len(documents)} detector examples...")
     collection.add(ids=ids, documents=documents, metadatas=metadatas)
+    mark_baked("silverado")
     print(f"  detectors baked: {', '.join(sorted(detectors))}")
 
 
@@ -290,6 +293,7 @@ def bake_helix(lenses_path=None):
     cal_collection = client.create_collection(name="silverado_rgb_cal", metadata=cal_meta)
     cal_collection.add(ids=["cal"], documents=["calibration"], metadatas=[{"type": "calibration"}])
 
+    mark_baked("silverado_rgb")
     print(f"  calibration stored.")
     print(f"  lenses baked: {', '.join(sorted(lenses))}")
 
@@ -22,10 +22,13 @@ import json
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+import numpy as np
+
 PRIMARIES = ("red", "yellow", "blue")
+_POLES = [(p, v) for p in PRIMARIES for v in ("positive", "negative")]
 
 
-from keanu.wellspring import depths, tap, sift, resolve_backend
+from keanu.wellspring import depths, tap, sift, resolve_backend, pole_matrix
 
 
 # ── dataclasses ──────────────────────────────────────────────
@@ -121,17 +124,6 @@ def _query_pole(collection, text, lens, valence, n=3):
     return max(0.0, 1 - min(result['distances'][0]))
 
 
-def _query_pole_behavioral(store, text, lens, valence, n=3):
-    """Query one pole via behavioral store. Same interface as _query_pole."""
-    result = store.query(
-        "silverado_rgb", text, n_results=n,
-        where={"$and": [{"lens": lens}, {"valence": valence}]},
-    )
-    if not result['distances'][0]:
-        return 0.0
-    return max(0.0, 1 - min(result['distances'][0]))
-
-
 def _query_primary(collection, text, lens, n=3):
     """
     query both poles of one primary. return PolarScore.
@@ -148,7 +140,8 @@ def helix_scan(lines, threshold=0.45,
                red_accel=None, yellow_accel=None, blue_accel=None,
                backend="auto"):
     """
-    triple-lens scan. one embedding per line, six queries (3 primaries x 2 poles).
+    triple-lens scan. every line against six poles (3 primaries x 2 poles),
+    scored as one batch.
     returns readings, convergences, and tensions.
 
     backend: "auto" (behavioral first, chromadb fallback), "behavioral", "chromadb"
@@ -200,24 +193,27 @@ def helix_scan(lines, threshold=0.45,
     if not scannable:
         return None
 
-    print(f"  helix scanning {len(scannable)} lines (6 queries/line)...", file=sys.stderr)
+    print(f"  helix scanning {len(scannable)} lines ({len(_POLES)} poles, batched)...", file=sys.stderr)
+
+    sims = pole_matrix(
+        behavioral_store, collection, "silverado_rgb",
+        [text for _, text in scannable],
+        [{"$and": [{"lens": lens}, {"valence": valence}]} for lens, valence in _POLES],
+    )
+    # empty or failed poles read as 0, same as a single _query_pole
+    sims = np.clip(np.nan_to_num(sims, nan=0.0), 0.0, None).tolist()
 
     readings = []
     convergences = []
     tensions = []
 
-    def _qp(text, lens):
-        """Query a primary, dispatching to behavioral or chromadb."""
-        if behavioral_store:
-            pos = _query_pole_behavioral(behavioral_store, text, lens, "positive")
-            neg = _query_pole_behavioral(behavioral_store, text, lens, "negative")
-            return PolarScore(pos=pos, neg=neg, net=pos - neg)
-        return _query_primary(collection, text, lens)
-
-    for line_num, text in scannable:
-        r = _qp(text, "red")
-        y = _qp(text, "yellow")
-        b = _qp(text, "blue")
+    for (line_num, text), row in zip(scannable, sims):
+        pole = dict(zip(_POLES, row))
+        r, y, b = (
+            PolarScore(pos=pole[(p, "positive")], neg=pole[(p, "negative")],
+                       net=pole[(p, "positive")] - pole[(p, "negative")])
+            for p in PRIMARIES
+        )
 
         # apply calibration to pos scores (neg stays raw, it's the ground truth)
         r = PolarScore(
@@ -10,6 +10,8 @@ import subprocess
 from pathlib import Path
 from dataclasses import dataclass, field
 
+from keanu.tools.inventory import inventory
+
 
 # Keywords that signal effort level from build plan descriptions
 HOT_KEYWORDS = {"design", "build", "architect", "comprehensive", "engine", "pipeline", "end-to-end", "rewrite"}
@@ -59,13 +61,13 @@ class TodoScan:
         if (self.project_root / "src" / "keanu" / filename).exists():
             return True
 
-        # Bare filename: search recursively (exclude .venv, node_modules, .git)
+        # Bare filename: look it up in the project inventory, ignored
+        # files included, the way the old rglob saw them
         bare = Path(filename).name
-        exclude_dirs = {".venv", "node_modules", ".git", "__pycache__", ".tox"}
-        for match in self.project_root.rglob(bare):
-            if not any(part in exclude_dirs for part in match.parts):
-                return True
-        return False
+        inv = inventory(self.project_root, gitignore=False)
+        if inv.named(bare):
+            return True
+        return any(d.rsplit("/", 1)[-1] == bare for d in inv.dirs())
 
     def scan_build_plan(self):
         """Parse BUILD_PLAN.md for referenced files and tasks."""
@@ -144,7 +146,10 @@ class TodoScan:
 
         # Check for empty __init__.py files in subpackages
         if src_dir.exists():
-            for init_file in src_dir.rglob("__init__.py"):
+            for info in inventory(self.project_root).named("__init__.py"):
+                if not info.rel.startswith("src/"):
+                    continue
+                init_file = Path(info.path)
                 content = init_file.read_text().strip()
                 # Skip root __init__.py
                 if init_file.parent.name in ("keanu", "working_truth"):
@@ -14,6 +14,13 @@ from dataclasses import dataclass
 
 import numpy as np
 
+from keanu.io import atomic_open, write_json
+from keanu.tools.cache import TextCache
+
+# feature rows for scanned lines. kept apart from the shared text_cache
+# so one long scan can't evict the feel/alive readings living there
+feature_cache = TextCache(max_entries=16384)
+
 
 # ── word lists ──────────────────────────────────────────────
 
@@ -102,6 +109,8 @@ FUTURE_MARKERS = {
     "next", "upcoming", "planned", "intend",
 }
 
+FIRST_PERSON = {"i", "my", "me", "mine", "myself"}
+
 CATEGORICAL_PATTERNS = [
     r"\bhumans always\b",
     r"\bai never\b",
@@ -292,8 +301,7 @@ def repetition_score(text):
 
 def first_person_density(text):
     """#18: I/my/me per word. Key: capture, identity."""
-    first_person = {"i", "my", "me", "mine", "myself"}
-    return _word_ratio(text, first_person)
+    return _word_ratio(text, FIRST_PERSON)
 
 
 def categorical_claims(text):
@@ -341,6 +349,85 @@ FEATURE_NAMES = [name for name, _ in FEATURES]
 NUM_FEATURES = len(FEATURES)
 
 
+# ── batch extraction ────────────────────────────────────────
+# Same 20 numbers as the feature functions, computed from one tokenization
+# per text. The feature functions stay the readable reference; these tables
+# just let one pass over the words feed every word-set ratio at once.
+
+_COL = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+_WORD_SET_FEATURES = [
+    ("superlative_density", SUPERLATIVES),
+    ("hedge_ratio", HEDGES),
+    ("universal_quantifier_freq", UNIVERSAL_QUANTIFIERS),
+    ("creation_verb_ratio", CREATION_VERBS),
+    ("destruction_verb_ratio", DESTRUCTION_VERBS),
+    ("agreement_markers", AGREEMENT_MARKERS),
+    ("pushback_markers", PUSHBACK_MARKERS),
+    ("profanity_markers", PROFANITY),
+    ("first_person_density", FIRST_PERSON),
+]
+_WORD_SET_COLS = [_COL[name] for name, _ in _WORD_SET_FEATURES]
+
+# word -> feature columns it counts toward
+_VOCAB = {}
+for _name, _word_set in _WORD_SET_FEATURES:
+    for _w in _word_set:
+        _VOCAB.setdefault(_w, []).append(_COL[_name])
+
+# each list is disjoint phrases, so one alternation counts what the
+# separate findall passes would
+_EMPTY_VALIDATION_RE = re.compile("|".join(f"(?:{p})" for p in EMPTY_VALIDATION_PATTERNS))
+_CATEGORICAL_RE = re.compile("|".join(f"(?:{p})" for p in CATEGORICAL_PATTERNS))
+_WORD_RE = re.compile(r"[a-z']+")
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_NUMBER_RE = re.compile(r'\b\d+\.?\d*\b')
+_EITHER_OR_RE = re.compile(r'\beither\b.*?\bor\b')
+
+
+def _extract_row(text, row):
+    """Fill row (length NUM_FEATURES) with every feature for text."""
+    lower = text.lower()
+    words = _WORD_RE.findall(lower)
+    n_words = len(words)
+    n_sents = sum(1 for s in _SENTENCE_SPLIT_RE.split(text) if s.strip())
+
+    if n_words:
+        counts = [0] * NUM_FEATURES
+        for w in words:
+            cols = _VOCAB.get(w)
+            if cols:
+                for c in cols:
+                    counts[c] += 1
+        for c in _WORD_SET_COLS:
+            row[c] = min(1.0, counts[c] / n_words)
+
+        numbers = len(_NUMBER_RE.findall(text))
+        proper = sum(1 for i, w in enumerate(text.split()) if i > 0 and w[0].isupper() and not w.isupper())
+        row[_COL["specificity_score"]] = min(1.0, (numbers + proper) / n_words)
+
+        i_count = words.count("i")
+        total = i_count + sum(1 for p in PASSIVE_MARKERS if p in lower)
+        row[_COL["agency_score"]] = 0.5 if total == 0 else min(1.0, i_count / total)
+
+        row[_COL["temporal_past"]] = min(1.0, sum(1 for m in PAST_MARKERS if m in lower) / n_words)
+        row[_COL["temporal_future"]] = min(1.0, sum(1 for m in FUTURE_MARKERS if m in lower) / n_words)
+
+    if n_sents:
+        row[_COL["question_frequency"]] = min(1.0, text.count("?") / n_sents)
+        row[_COL["exclamation_density"]] = min(1.0, text.count("!") / n_sents)
+        # separators are never inside a word, so per-sentence word counts sum to n_words
+        row[_COL["sentence_avg_length"]] = min(1.0, n_words / n_sents / 40.0)
+        row[_COL["either_or_count"]] = min(1.0, len(_EITHER_OR_RE.findall(lower)) / n_sents)
+
+    row[_COL["empty_validation"]] = min(1.0, len(_EMPTY_VALIDATION_RE.findall(lower)) / 3.0)
+    row[_COL["categorical_claims"]] = min(1.0, len(_CATEGORICAL_RE.findall(lower)) / 2.0)
+
+    if n_words >= 6:
+        trigrams = list(zip(words, words[1:], words[2:]))
+        row[_COL["repetition_score"]] = min(1.0, (len(trigrams) - len(set(trigrams))) / len(trigrams))
+
+
 class FeatureExtractor:
     """Extract a 20-dimensional behavioral feature vector from text.
 
@@ -358,6 +445,17 @@ class FeatureExtractor:
         vec = np.array([fn(text) for _, fn in self.features], dtype=np.float64)
         return vec
 
+    def extract_batch(self, texts, dtype=np.float32):
+        """List of texts -> numpy array of shape (N, 20), values 0-1.
+
+        Same numbers as extract(), but each text is tokenized once and
+        every feature reads from that one pass.
+        """
+        out = np.zeros((len(texts), self.dim), dtype=np.float64)
+        for text, row in zip(texts, out):
+            _extract_row(text, row)
+        return out.astype(dtype, copy=False)
+
     def extract_named(self, text):
         """Text -> dict of {feature_name: score}."""
         return {name: fn(text) for name, fn in self.features}
@@ -375,84 +473,122 @@ def _get_behavioral_dir():
     return Path(__file__).resolve().parent.parent.parent.parent / ".behavioral"
 
 
-def _cosine_similarity(a, b):
-    """Cosine similarity between two vectors."""
-    dot = np.dot(a, b)
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return float(dot / (norm_a * norm_b))
-
-
 class BehavioralStore:
     """Numpy-backed vector storage. Drop-in for ChromaDB queries.
 
-    Stores extracted feature vectors as .npz files.
+    A baked collection is four files:
+      {name}.vectors.npy   raw feature rows, uncompressed
+      {name}.unit.npy      the same rows unit-normalized, what queries read
+      {name}.columns.json  metadata as columns: distinct values + row codes
+      {name}.texts.json    example text, only read when a query returns documents
+    The .npy files load with mmap_mode="r", so opening a collection costs a
+    stat and a header read; pages come in as queries touch them.
+    Collections baked as .npz + _meta.json still load.
     Query interface matches ChromaDB signature so helix/detect swap is minimal.
     """
 
     def __init__(self, base_dir=None):
         self.base_dir = Path(base_dir) if base_dir else _get_behavioral_dir()
         self.extractor = FeatureExtractor()
-        self._cache = {}  # collection_name -> loaded data
+        self._cache = {}  # collection_name -> (signature, _Collection)
+
+    def _path(self, name, suffix):
+        return self.base_dir / f"{name}{suffix}"
 
     def bake_collection(self, name, examples):
-        """Extract features from examples, store as .npz.
+        """Extract features from examples, store as .npy + column sidecars.
 
         examples: list of dicts with 'text' key + metadata keys
         """
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-        vectors = []
-        metadata_list = []
-
-        for ex in examples:
-            vec = self.extractor.extract(ex["text"])
-            vectors.append(vec)
-            meta = {k: v for k, v in ex.items() if k != "text"}
-            meta["_text"] = ex["text"]
-            metadata_list.append(meta)
+        vectors_array = self.extractor.extract_batch([ex["text"] for ex in examples], dtype=np.float64)
+        columns = _encode_columns([{k: v for k, v in ex.items() if k != "text"} for ex in examples])
 
-        vectors_array = np.array(vectors, dtype=np.float64)
+        # unit.npy goes last: has_collection() keys off it, so a reader
+        # never sees a collection whose sidecars aren't written yet
+        write_json(self._path(name, ".texts.json"), [ex["text"] for ex in examples], indent=None)
+        write_json(self._path(name, ".columns.json"), {"rows": len(examples), "columns": columns},
+                   indent=None)
+        _write_npy(self._path(name, ".vectors.npy"), vectors_array)
+        _write_npy(self._path(name, ".unit.npy"), _normalize_rows(vectors_array))
 
-        # save vectors + metadata
-        np.savez(
-            self.base_dir / f"{name}.npz",
-            vectors=vectors_array,
-        )
-        # save metadata as JSON sidecar
-        with open(self.base_dir / f"{name}_meta.json", "w") as f:
-            json.dump(metadata_list, f)
+        for legacy in (".npz", "_meta.json"):
+            self._path(name, legacy).unlink(missing_ok=True)
 
-        # clear cache for this collection
         self._cache.pop(name, None)
-
         return len(examples)
 
-    def _load(self, name):
-        """Load collection into cache."""
-        if name in self._cache:
-            return self._cache[name]
-
-        npz_path = self.base_dir / f"{name}.npz"
-        meta_path = self.base_dir / f"{name}_meta.json"
+    def _signature(self, name):
+        for suffix in (".unit.npy", ".npz"):
+            try:
+                st = self._path(name, suffix).stat()
+            except OSError:
+                continue
+            return (suffix, st.st_size, st.st_mtime_ns)
+        return None
+
+    def signature(self, name):
+        """What a collection's files look like on disk right now, or None
+        if it isn't baked. Changes whenever the collection is re-baked."""
+        return self._signature(name)
+
+    def _features(self, texts):
+        """Feature rows for texts, shape (N, 20), float64. Rows come from
+        feature_cache when any detector already scored the same text;
+        only the rest get extracted."""
+        out = np.empty((len(texts), self.extractor.dim), dtype=np.float64)
+        missing = []
+        for i, row in enumerate(feature_cache.get_many("features", texts)):
+            if row is None:
+                missing.append(i)
+            else:
+                out[i] = row
+        if missing:
+            rows = self.extractor.extract_batch([texts[i] for i in missing], dtype=np.float64)
+            out[missing] = rows
+            feature_cache.put_many("features", ((texts[i], _frozen(row)) for i, row in zip(missing, rows)))
+        return out
 
-        if not npz_path.exists():
+    def _load(self, name):
+        """Open a collection, or reuse it while its files are unchanged."""
+        sig = self._signature(name)
+        if sig is None:
+            self._cache.pop(name, None)
             return None
-
-        data = np.load(npz_path)
-        vectors = data["vectors"]
-
-        with open(meta_path) as f:
-            metadata = json.load(f)
-
-        self._cache[name] = (vectors, metadata)
-        return vectors, metadata
+        cached = self._cache.get(name)
+        if cached and cached[0] == sig:
+            return cached[1]
+
+        if sig[0] == ".unit.npy":
+            with open(self._path(name, ".columns.json")) as f:
+                cols = json.load(f)
+            loaded = _Collection(
+                vectors=np.load(self._path(name, ".vectors.npy"), mmap_mode="r"),
+                unit=np.load(self._path(name, ".unit.npy"), mmap_mode="r"),
+                rows=cols["rows"],
+                columns=_decode_columns(cols["columns"]),
+                text_path=self._path(name, ".texts.json"),
+            )
+        else:
+            vectors = np.load(self._path(name, ".npz"))["vectors"]
+            with open(self._path(name, "_meta.json")) as f:
+                metadata = json.load(f)
+            loaded = _Collection(
+                vectors=vectors,
+                unit=_normalize_rows(vectors),
+                rows=len(metadata),
+                columns=_decode_columns(_encode_columns(
+                    [{k: v for k, v in m.items() if k != "_text"} for m in metadata])),
+                _texts=[m.get("_text", "") for m in metadata],
+            )
+
+        self._cache[name] = (sig, loaded)
+        return loaded
 
     def has_collection(self, name):
         """Check if a baked collection exists."""
-        return (self.base_dir / f"{name}.npz").exists()
+        return self._signature(name) is not None
 
     def query(self, collection, text, n_results=3, where=None):
         """Query a collection. Returns ChromaDB-compatible result dict.
@@ -465,41 +601,197 @@ class BehavioralStore:
         if loaded is None:
             return {"distances": [[]], "documents": [[]], "metadatas": [[]]}
 
-        vectors, metadata = loaded
-        query_vec = self.extractor.extract(text)
-
-        # compute similarities
-        similarities = []
-        for i, (vec, meta) in enumerate(zip(vectors, metadata)):
-            # metadata filter
-            if where and not self._matches_filter(meta, where):
-                continue
-            sim = _cosine_similarity(query_vec, vec)
-            # convert to distance (ChromaDB cosine distance = 1 - similarity)
-            dist = 1.0 - sim
-            similarities.append((i, dist, meta))
-
-        # sort by distance (ascending = most similar first)
-        similarities.sort(key=lambda x: x[1])
-        top = similarities[:n_results]
+        query_vec = self._features([text])[0]
+        # ChromaDB cosine distance = 1 - similarity
+        distances = 1.0 - loaded.similarities(query_vec)
+        candidates = loaded.mask(where)
+        if candidates is not None:
+            candidates = np.flatnonzero(candidates)
 
-        distances = [x[1] for x in top]
-        documents = [metadata[x[0]].get("_text", "") for x in top]
-        metadatas = [{k: v for k, v in metadata[x[0]].items() if k != "_text"} for x in top]
+        top = _top_k(distances, n_results, candidates)
+        texts = loaded.texts if top else []
 
         return {
-            "distances": [distances],
-            "documents": [documents],
-            "metadatas": [metadatas],
+            "distances": [[float(distances[i]) for i in top]],
+            "documents": [[texts[i] for i in top]],
+            "metadatas": [[loaded.row(i) for i in top]],
         }
 
-    def _matches_filter(self, meta, where):
-        """Check if metadata matches a where filter."""
+    def query_poles(self, collection, texts, poles, block=512):
+        """Best similarity of every text against every pole, in one pass.
+
+        poles: list of where filters, e.g. one per (lens, valence).
+        Returns an array of shape (len(texts), len(poles)) holding
+        1 - min(distance) per cell, the same number a per-text query()
+        would give. Poles with no matching rows are NaN. Texts go through
+        in blocks so a huge transcript never builds one giant matrix.
+        """
+        out = np.full((len(texts), len(poles)), np.nan)
+        loaded = self._load(collection)
+        if loaded is None or not texts:
+            return out
+
+        masks = [loaded.mask(where) for where in poles]
+        masks = [np.ones(loaded.rows, dtype=bool) if m is None else m for m in masks]
+        live = [j for j, m in enumerate(masks) if m.any()]
+
+        for start in range(0, len(texts), block):
+            chunk = texts[start:start + block]
+            sims = loaded.similarities_many(self._features(chunk))
+            for j in live:
+                out[start:start + len(chunk), j] = sims[:, masks[j]].max(axis=1)
+        return out
+
+
+def _frozen(row):
+    # a copy, so the cache doesn't pin the whole batch array
+    row = row.copy()
+    row.flags.writeable = False
+    return row
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True) if len(vectors) else np.zeros((0, 1))
+    return np.divide(vectors, norms, out=np.zeros_like(vectors, dtype=np.float64), where=norms > 0)
+
+
+def _write_npy(path, array):
+    with atomic_open(path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+
+
+def _encode_columns(metadata):
+    """list of metadata dicts -> {key: {"values": [...], "codes": [...]}}.
+
+    Each key stores its distinct values once; codes index into them per
+    row, -1 where the row doesn't have the key.
+    """
+    columns = {}
+    lookup = {}
+    for i, meta in enumerate(metadata):
+        for key, value in meta.items():
+            if key not in columns:
+                columns[key] = {"values": [], "codes": [-1] * len(metadata)}
+                lookup[key] = {}
+            seen = lookup[key]
+            token = json.dumps(value, sort_keys=True, default=str)
+            if token not in seen:
+                seen[token] = len(columns[key]["values"])
+                columns[key]["values"].append(value)
+            columns[key]["codes"][i] = seen[token]
+    return columns
+
+
+def _decode_columns(columns):
+    return {key: (col["values"], np.asarray(col["codes"], dtype=np.int32))
+            for key, col in columns.items()}
+
+
+@dataclass
+class _Collection:
+    """A loaded collection: unit-normalized rows plus columnar metadata.
+
+    columns maps key -> (distinct values, int32 code per row). A where
+    filter compares codes, so no per-row dicts exist until a query hands
+    rows back. masks caches (key, value) -> boolean row mask. Example text
+    stays on disk until the first query that returns documents.
+    """
+    vectors: np.ndarray
+    unit: np.ndarray
+    rows: int
+    columns: dict
+    masks: dict = None
+    text_path: Path = None
+    _texts: list = None
+
+    def __post_init__(self):
+        if self.masks is None:
+            self.masks = {}
+
+    @property
+    def texts(self):
+        if self._texts is None:
+            if self.text_path is None:
+                self._texts = [""] * self.rows
+            else:
+                with open(self.text_path) as f:
+                    self._texts = json.load(f)
+        return self._texts
+
+    def row(self, i):
+        """Metadata dict for row i, as it was baked."""
+        out = {}
+        for key, (values, codes) in self.columns.items():
+            if codes[i] >= 0:
+                out[key] = values[codes[i]]
+        return out
+
+    def similarities(self, query_vec):
+        """Cosine similarity of query_vec against every row. Zero vectors score 0."""
+        norm = np.linalg.norm(query_vec)
+        if norm == 0 or not len(self.unit):
+            return np.zeros(self.rows, dtype=np.float64)
+        return self.unit @ (query_vec / norm)
+
+    def similarities_many(self, query_vecs):
+        """(N, dim) queries -> (N, rows) cosine similarities. Zero vectors score 0."""
+        if not len(self.unit) or not len(query_vecs):
+            return np.zeros((len(query_vecs), self.rows), dtype=np.float64)
+        return _normalize_rows(query_vecs) @ self.unit.T
+
+    def mask(self, where):
+        """where filter -> boolean row mask, or None for no filter."""
+        if not where:
+            return None
+        result = np.ones(self.rows, dtype=bool)
         if "$and" in where:
-            return all(self._matches_filter(meta, clause) for clause in where["$and"])
+            for clause in where["$and"]:
+                sub = self.mask(clause)
+                if sub is not None:
+                    result &= sub
         for key, value in where.items():
             if key.startswith("$"):
                 continue
-            if meta.get(key) != value:
-                return False
-        return True
+            result &= self._key_mask(key, value)
+        return result
+
+    def _key_mask(self, key, value):
+        try:
+            cached = self.masks.get((key, value))
+        except TypeError:
+            return self._column_equals(key, value)
+        if cached is None:
+            cached = self.masks[(key, value)] = self._column_equals(key, value)
+        return cached
+
+    def _column_equals(self, key, value):
+        # a row without the key reads as None, same as dict.get
+        if key not in self.columns:
+            return np.full(self.rows, value is None, dtype=bool)
+        values, codes = self.columns[key]
+        hits = [c for c, v in enumerate(values) if v == value]
+        if value is None:
+            hits.append(-1)
+        return np.isin(codes, hits)
+
+
+def _top_k(distances, k, candidates=None):
+    """Indices of the k smallest distances, ascending, ties by row order.
+
+    argpartition finds the cutoff in O(n); only the k survivors get sorted.
+    Matches a stable full sort exactly, including which tied rows make the cut.
+    """
+    if candidates is None:
+        candidates = np.arange(len(distances))
+    if k <= 0 or not len(candidates):
+        return []
+    d = distances[candidates]
+    if k < len(candidates):
+        kth = d[np.argpartition(d, k - 1)[k - 1]]
+        below = np.flatnonzero(d < kth)
+        ties = np.flatnonzero(d == kth)[:k - len(below)]
+        keep = np.concatenate([below, ties])
+    else:
+        keep = np.arange(len(candidates))
+    order = keep[np.lexsort((keep, d[keep]))]
+    return candidates[order].tolist()
@@ -57,16 +57,25 @@ class ContextManager:
     def build_imports(self, root: str = "."):
         """build the import graph for files we've read.
 
-        uses the deps module if available. lightweight, only maps
-        files the agent has actually touched.
+        uses the deps module if available. lightweight, only asks the
+        project's cached graph about files the agent has actually touched.
         """
         try:
-            from keanu.analysis.deps import build_import_graph
-            graph = build_import_graph(root)
-            edges = graph.get("edges", [])
-            for src, dst in edges:
-                self.import_graph.setdefault(src, []).append(dst)
-                self.reverse_graph.setdefault(dst, []).append(src)
+            from keanu.analysis.deps import import_graph
+            graph = import_graph(root)
+            root_path = Path(root).resolve()
+            rels = []
+            for path in self.files:
+                p = Path(path)
+                if p.is_absolute():
+                    try:
+                        p = p.relative_to(root_path)
+                    except ValueError:
+                        continue
+                rels.append(_normalize(str(p)))
+            for rel, (imports, importers) in graph.neighbors(rels).items():
+                self.import_graph[rel] = imports
+                self.reverse_graph[rel] = importers
         except Exception:
             pass
 
@@ -16,7 +16,7 @@ import time
 import os
 from typing import List, Dict, Optional, Tuple, Set
 from dataclasses import dataclass, field
-from collections import deque
+from collections import deque, defaultdict
 
 
 # ============================================================
@@ -177,6 +177,125 @@ class ConvergenceOps:
         return min(1.0, score)
 
 
+# ============================================================
+# DUALITY INDEX: Postings so traversal skips unrelated dualities
+# ============================================================
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class _Entry:
+    """One duality's fields, lowercased once when it is indexed."""
+    duality: Duality
+    position: int                        # insertion order, for stable ties
+    concept: str
+    concept_words: Set[str]
+    pole_a: str
+    pole_b: str
+    pole_words: Set[str]
+    tags: List[str]                      # lowercased, duplicates kept
+    tag_set: Set[str]
+    exact_tags: List[str]                # as given, for find_by_tag
+
+
+class DualityIndex:
+    """
+    Word, tag and trigram postings over a graph's dualities.
+    A query only scores the dualities its words point at; the
+    trigrams narrow partial-substring matches down to candidates
+    that are then checked for real.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, _Entry] = {}
+        self.words: Dict[str, Set[str]] = defaultdict(set)     # concept/pole word or tag -> ids
+        self.tags: Dict[str, Set[str]] = defaultdict(set)      # exact tag -> ids
+        self.trigrams: Dict[str, Set[str]] = defaultdict(set)  # trigram of any field -> ids
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, d: Duality):
+        """Index a duality. Re-adding an id keeps its position."""
+        old = self.entries.get(d.id)
+        if old:
+            self.remove(d.id)
+            position = old.position
+        else:
+            position = self._next_position
+            self._next_position += 1
+
+        concept = d.concept.lower()
+        pole_a, pole_b = d.pole_a.lower(), d.pole_b.lower()
+        tags = [t.lower() for t in d.tags]
+        entry = _Entry(
+            duality=d, position=position,
+            concept=concept, concept_words=set(concept.split()),
+            pole_a=pole_a, pole_b=pole_b,
+            pole_words=set(pole_a.split()) | set(pole_b.split()),
+            tags=tags, tag_set=set(tags), exact_tags=list(d.tags),
+        )
+        self.entries[d.id] = entry
+        for key in self._word_keys(entry):
+            self.words[key].add(d.id)
+        for tag in d.tags:
+            self.tags[tag].add(d.id)
+        for gram in self._grams(entry):
+            self.trigrams[gram].add(d.id)
+
+    def remove(self, id_: str):
+        entry = self.entries.pop(id_, None)
+        if entry is None:
+            return
+        for postings, keys in ((self.words, self._word_keys(entry)),
+                               (self.tags, entry.exact_tags),
+                               (self.trigrams, self._grams(entry))):
+            for key in keys:
+                ids = postings.get(key)
+                if ids is not None:
+                    ids.discard(id_)
+                    if not ids:
+                        del postings[key]
+
+    @staticmethod
+    def _word_keys(entry: _Entry) -> Set[str]:
+        return entry.concept_words | entry.pole_words | entry.tag_set
+
+    @staticmethod
+    def _grams(entry: _Entry) -> Set[str]:
+        grams = _trigrams(entry.concept) | _trigrams(entry.pole_a) | _trigrams(entry.pole_b)
+        for tag in entry.tags:
+            grams |= _trigrams(tag)
+        return grams
+
+    def containing(self, text: str) -> Optional[Set[str]]:
+        """Ids whose fields might contain text as a substring.
+        None when text is too short for trigrams to narrow anything."""
+        grams = _trigrams(text)
+        if not grams:
+            return None
+        postings = sorted((self.trigrams.get(g, set()) for g in grams), key=len)
+        found = set(postings[0])
+        for ids in postings[1:]:
+            found &= ids
+            if not found:
+                break
+        return found
+
+    def candidates(self, query_words: Set[str]) -> List[_Entry]:
+        """Entries that can score above zero for these words, in
+        insertion order."""
+        ids = set()
+        for word in query_words:
+            ids |= self.words.get(word, set())
+            if len(word) > 3:
+                ids |= self.containing(word)
+        return sorted((self.entries[i] for i in ids), key=lambda e: e.position)
+
+
 # ============================================================
 # DUALITY GRAPH: The world model
 # ============================================================
@@ -189,6 +308,7 @@ class DualityGraph:
 
     def __init__(self):
         self.dualities: Dict[str, Duality] = {}
+        self.index = DualityIndex()
         self.ops = ConvergenceOps()
         self.convergence_log: List[Dict] = []
         self._build_seed_graph()
@@ -412,6 +532,7 @@ class DualityGraph:
             parent_ids=parents or []
         )
         self.dualities[id_] = d
+        self.index.add(d)
 
         for pid in (parents or []):
             if pid in self.dualities:
@@ -422,18 +543,33 @@ class DualityGraph:
     def get(self, id_: str) -> Optional[Duality]:
         return self.dualities.get(id_)
 
+    def reindex(self):
+        """Rebuild the index from scratch. Only needed after editing a
+        duality's concept, poles or tags in place."""
+        self.index = DualityIndex()
+        for d in self.dualities.values():
+            self.index.add(d)
+
+    def _current_index(self) -> DualityIndex:
+        """The index, rebuilt if dualities were added around add_duality."""
+        if len(self.index) != len(self.dualities):
+            self.reindex()
+        return self.index
+
     def find_by_tag(self, tag: str) -> List[Duality]:
-        return [d for d in self.dualities.values() if tag in d.tags]
+        index = self._current_index()
+        ids = index.tags.get(tag, set())
+        return [e.duality for e in sorted((index.entries[i] for i in ids),
+                                           key=lambda e: e.position)]
 
     def find_by_concept(self, keyword: str) -> List[Duality]:
         kw = keyword.lower()
-        results = []
-        for d in self.dualities.values():
-            if (kw in d.concept.lower() or
-                kw in d.pole_a.lower() or
-                kw in d.pole_b.lower()):
-                results.append(d)
-        return results
+        index = self._current_index()
+        ids = index.containing(kw)
+        entries = (index.entries.values() if ids is None
+                   else sorted((index.entries[i] for i in ids), key=lambda e: e.position))
+        return [e.duality for e in entries
+                if kw in e.concept or kw in e.pole_a or kw in e.pole_b]
 
     # --------------------------------------------------------
     # TRAVERSAL: Find relevant dualities for a question
@@ -447,33 +583,32 @@ class DualityGraph:
         query_words = set(query.lower().split())
         scored = []
 
-        for d in self.dualities.values():
+        # Only dualities sharing a word, a tag or a substring can score
+        for e in self._current_index().candidates(query_words):
+            d = e.duality
             score = 0.0
 
             # Word match in concept
-            concept_words = set(d.concept.lower().split())
-            concept_overlap = len(query_words & concept_words)
+            concept_overlap = len(query_words & e.concept_words)
             score += concept_overlap * 0.4
 
             # Word match in poles
-            pole_words = set(d.pole_a.lower().split()) | set(d.pole_b.lower().split())
-            pole_overlap = len(query_words & pole_words)
+            pole_overlap = len(query_words & e.pole_words)
             score += pole_overlap * 0.3
 
             # Tag match
-            tag_set = set(t.lower() for t in d.tags)
-            tag_overlap = len(query_words & tag_set)
+            tag_overlap = len(query_words & e.tag_set)
             score += tag_overlap * 0.3
 
             # Substring match (catch partial matches)
             for word in query_words:
                 if len(word) > 3:  # skip tiny words
-                    if word in d.concept.lower():
+                    if word in e.concept:
                         score += 0.2
-                    for tag in d.tags:
-                        if word in tag.lower():
+                    for tag in e.tags:
+                        if word in tag:
                             score += 0.15
-                    if word in d.pole_a.lower() or word in d.pole_b.lower():
+                    if word in e.pole_a or word in e.pole_b:
                         score += 0.15
 
             # Boost high-tension dualities (unresolved = more interesting)
@@ -486,12 +621,16 @@ class DualityGraph:
         scored.sort(key=lambda x: x[1], reverse=True)
         return scored[:max_results]
 
-    def find_orthogonal_pair(self, query: str) -> Optional[Tuple[Duality, Duality]]:
+    def find_orthogonal_pair(self, query: str,
+                             relevant: List[Tuple[Duality, float]] = None
+                             ) -> Optional[Tuple[Duality, Duality]]:
         """
         Find the best pair of ORTHOGONAL dualities for a query.
         This is the splitter: one question becomes two independent axes.
+        Pass relevant (a traverse with max_results=10) to skip traversing again.
         """
-        relevant = self.traverse(query, max_results=10)
+        if relevant is None:
+            relevant = self.traverse(query, max_results=10)
         if len(relevant) < 2:
             return None
 
@@ -580,8 +719,9 @@ class DualityGraph:
         3. Run three convergences (synthesize)
         4. Return structured result with interpretation
         """
-        # Step 1: Traverse
-        relevant = self.traverse(query)
+        # Step 1: Traverse (once; the splitter reuses the wider list)
+        wide = self.traverse(query, max_results=10)
+        relevant = wide[:6]
 
         if not relevant:
             return {
@@ -591,7 +731,7 @@ class DualityGraph:
             }
 
         # Step 2: Find orthogonal pair
-        pair = self.find_orthogonal_pair(query)
+        pair = self.find_orthogonal_pair(query, relevant=wide)
 
         if not pair:
             # Fallback: use top 2 most relevant even if not orthogonal
@@ -729,6 +869,7 @@ class DualityGraph:
                 orthogonal_ids=item.get("orthogonal_ids", []),
                 tags=item.get("tags", [])
             )
+            self.index.add(self.dualities[id_])
         print(f"Loaded {len(data)} dualities from {filepath}")
 
     # --------------------------------------------------------
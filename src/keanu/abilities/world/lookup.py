@@ -27,12 +27,15 @@ def _cache_key(url: str) -> str:
 
 
 def _get_cached(url: str) -> str | None:
+    # lookups run in parallel batches: one get and a tolerant pop, so two
+    # threads expiring the same url can't trip over each other
     key = _cache_key(url)
-    if key in _CACHE:
-        content, ts = _CACHE[key]
+    cached = _CACHE.get(key)
+    if cached is not None:
+        content, ts = cached
         if time.time() - ts < _CACHE_TTL:
             return content
-        del _CACHE[key]
+        _CACHE.pop(key, None)
     return None
 
 
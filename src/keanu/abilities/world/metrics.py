@@ -4,15 +4,20 @@ the goal: the ratio of fire (LLM calls) to ash (ability executions)
 should shift toward ash over time. every miss that gets forged into
 an ability moves the needle. this module tracks that movement.
 
+recording is one appended line. analysis reads daily rollups kept next
+to the log (metrics.rollup.json), so a week's dashboard costs the same
+on day one and day one thousand.
+
 in the world: the thermometer. how much of the work is converged?
 """
 
+import json
 import time
 from collections import Counter
 from pathlib import Path
 
 from keanu.paths import METRICS_FILE
-from keanu.io import read_jsonl, append_jsonl
+from keanu.io import read_json, write_json, append_jsonl
 
 
 # ============================================================
@@ -51,6 +56,198 @@ def record_forge(ability_name: str):
     })
 
 
+# ============================================================
+# ROLLUPS
+# ============================================================
+
+DAY = 86400
+_ROLLUP_VERSION = 1
+
+
+class MetricsRollup:
+    """per-day totals and byte offsets for a metrics log.
+
+    the log stays the source of truth. the rollup remembers how many
+    bytes of it are folded in, so each refresh only parses lines
+    appended since the last one. a window reads whole days from the
+    totals and re-reads raw lines only for the days it cuts through,
+    seeking straight to them by offset.
+
+    day totals:
+        start, end   byte range of the day's lines in the log
+        fire, ash, forge
+        legends      {legend: [calls, tokens]}
+        models       {model: [calls, tokens]}
+        abilities    {ability: [count, successes]}
+    """
+
+    def __init__(self, log: Path):
+        self.log = Path(log)
+        self.path = self.log.with_name(self.log.stem + ".rollup.json")
+        self.folded = 0     # bytes of the log already in days
+        self.inode = None
+        self.days: dict[int, dict] = {}
+        self._loaded = False
+
+    def refresh(self):
+        """fold whatever was appended since the last refresh."""
+        if not self._loaded:
+            self._loaded = True
+            data = read_json(self.path) or {}
+            if data.get("version") == _ROLLUP_VERSION:
+                self.folded = data.get("folded", 0)
+                self.inode = data.get("inode")
+                self.days = {int(d): t for d, t in data.get("days", {}).items()}
+
+        try:
+            st = self.log.stat()
+        except OSError:
+            st = None
+        size, inode = (st.st_size, st.st_ino) if st else (0, None)
+        if size < self.folded or inode != self.inode:
+            # truncated or replaced: fold it again from the top
+            self.folded, self.inode, self.days = 0, inode, {}
+        if size == self.folded:
+            return
+
+        offset = self.folded
+        with open(self.log, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break   # a write still landing, fold it next time
+                record = _parse(raw)
+                if record is not None:
+                    day = self.days.setdefault(_day(record), _empty(offset))
+                    day["end"] = offset + len(raw)
+                    _add(day, record)
+                offset += len(raw)
+        if offset != self.folded:
+            self.folded = offset
+            self._save()
+
+    def totals(self, after: float, until: float = None) -> dict:
+        """summed day totals for records with after < ts <= until."""
+        self.refresh()
+        out = _empty()
+        for day in sorted(self.days):
+            lo, hi = day * DAY, (day + 1) * DAY
+            if hi <= after or (until is not None and lo > until):
+                continue
+            if lo > after and (until is None or hi <= until):
+                _merge(out, self.days[day])
+                continue
+            for record in self._day_records(day):
+                if _in_window(record, after, until):
+                    _add(out, record)
+        return out
+
+    def records(self, after: float) -> list[dict]:
+        """raw records with ts > after, read from the first day that can
+        hold one instead of from the top of the log."""
+        self.refresh()
+        first = int(after // DAY)
+        starts = [t["start"] for day, t in self.days.items() if day >= first]
+        if not starts:
+            return []
+        return [r for r in self._read(min(starts), self.folded) if _in_window(r, after, None)]
+
+    def _day_records(self, day: int) -> list[dict]:
+        totals = self.days[day]
+        return [r for r in self._read(totals["start"], totals["end"]) if _day(r) == day]
+
+    def _read(self, start: int, end: int) -> list[dict]:
+        records = []
+        try:
+            with open(self.log, "rb") as f:
+                f.seek(start)
+                for raw in f.read(end - start).splitlines():
+                    record = _parse(raw)
+                    if record is not None:
+                        records.append(record)
+        except OSError:
+            pass
+        return records
+
+    def _save(self):
+        data = {"version": _ROLLUP_VERSION, "folded": self.folded, "inode": self.inode,
+                "days": {str(d): t for d, t in self.days.items()}}
+        try:
+            write_json(self.path, data, indent=None)
+        except OSError:
+            pass    # the log is still there. next refresh folds it again
+
+
+def _parse(raw: bytes):
+    line = raw.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _ts(record: dict) -> float:
+    ts = record.get("ts", 0)
+    return ts if isinstance(ts, (int, float)) else 0
+
+
+def _day(record: dict) -> int:
+    return int(_ts(record) // DAY)
+
+
+def _in_window(record: dict, after: float, until) -> bool:
+    ts = _ts(record)
+    return ts > after and (until is None or ts <= until)
+
+
+def _empty(offset: int = 0) -> dict:
+    return {"start": offset, "end": offset, "fire": 0, "ash": 0, "forge": 0,
+            "legends": {}, "models": {}, "abilities": {}}
+
+
+def _add(totals: dict, record: dict):
+    kind = record.get("type")
+    if kind == "fire":
+        totals["fire"] += 1
+        tokens = record.get("tokens", 0)
+        for field, key in (("legends", record.get("legend", "unknown")),
+                           ("models", record.get("model", "unknown"))):
+            entry = totals[field].setdefault(key, [0, 0])
+            entry[0] += 1
+            entry[1] += tokens
+    elif kind == "ash":
+        totals["ash"] += 1
+        entry = totals["abilities"].setdefault(record.get("ability", "unknown"), [0, 0])
+        entry[0] += 1
+        entry[1] += 1 if record.get("success", True) else 0
+    elif kind == "forge":
+        totals["forge"] += 1
+
+
+def _merge(totals: dict, day: dict):
+    for kind in ("fire", "ash", "forge"):
+        totals[kind] += day[kind]
+    for field in ("legends", "models", "abilities"):
+        for key, (a, b) in day[field].items():
+            entry = totals[field].setdefault(key, [0, 0])
+            entry[0] += a
+            entry[1] += b
+
+
+_rollups = {}  # log path -> MetricsRollup, one per process
+
+
+def rollup(path: Path = None) -> MetricsRollup:
+    """the process-wide rollup for a metrics log (METRICS_FILE by default)."""
+    path = Path(path or METRICS_FILE)
+    if path not in _rollups:
+        _rollups[path] = MetricsRollup(path)
+    return _rollups[path]
+
+
 # ============================================================
 # ANALYSIS
 # ============================================================
@@ -62,20 +259,16 @@ def ratio(days: int = 7) -> dict:
     ratio = ash / (fire + ash). 1.0 = pure efficiency. 0.0 = pure fire.
     """
     cutoff = int(time.time()) - (days * 86400)
-    records = [r for r in read_jsonl(METRICS_FILE) if r.get("ts", 0) > cutoff]
-
-    fire = sum(1 for r in records if r.get("type") == "fire")
-    ash = sum(1 for r in records if r.get("type") == "ash")
+    current = rollup().totals(cutoff)
+    fire, ash = current["fire"], current["ash"]
     total = fire + ash
 
     current_ratio = ash / total if total > 0 else 0.0
 
     # compare to previous period for trend
     prev_cutoff = cutoff - (days * 86400)
-    prev_records = [r for r in read_jsonl(METRICS_FILE)
-                    if prev_cutoff < r.get("ts", 0) <= cutoff]
-    prev_fire = sum(1 for r in prev_records if r.get("type") == "fire")
-    prev_ash = sum(1 for r in prev_records if r.get("type") == "ash")
+    prev = rollup().totals(prev_cutoff, cutoff)
+    prev_fire, prev_ash = prev["fire"], prev["ash"]
     prev_total = prev_fire + prev_ash
     prev_ratio = prev_ash / prev_total if prev_total > 0 else 0.0
 
@@ -104,16 +297,10 @@ def ratio(days: int = 7) -> dict:
 def by_ability(days: int = 7) -> list[dict]:
     """breakdown of ash usage by ability."""
     cutoff = int(time.time()) - (days * 86400)
-    records = [r for r in read_jsonl(METRICS_FILE)
-               if r.get("ts", 0) > cutoff and r.get("type") == "ash"]
+    abilities = rollup().totals(cutoff)["abilities"]
 
-    counts = Counter()
-    successes = Counter()
-    for r in records:
-        name = r.get("ability", "unknown")
-        counts[name] += 1
-        if r.get("success", True):
-            successes[name] += 1
+    counts = Counter({name: c for name, (c, _) in abilities.items()})
+    successes = Counter({name: ok for name, (_, ok) in abilities.items()})
 
     result = []
     for name, count in counts.most_common(20):
@@ -128,32 +315,33 @@ def by_ability(days: int = 7) -> list[dict]:
 def by_legend(days: int = 7) -> list[dict]:
     """breakdown of fire usage by legend."""
     cutoff = int(time.time()) - (days * 86400)
-    records = [r for r in read_jsonl(METRICS_FILE)
-               if r.get("ts", 0) > cutoff and r.get("type") == "fire"]
-
-    counts = Counter()
-    tokens = Counter()
-    for r in records:
-        legend = r.get("legend", "unknown")
-        counts[legend] += 1
-        tokens[legend] += r.get("tokens", 0)
+    legends = rollup().totals(cutoff)["legends"]
 
+    counts = Counter({legend: c for legend, (c, _) in legends.items()})
     result = []
     for legend, count in counts.most_common(10):
         result.append({
             "legend": legend,
             "calls": count,
-            "total_tokens": tokens[legend],
+            "total_tokens": legends[legend][1],
         })
     return result
 
 
+def by_model(days: int = 7) -> list[dict]:
+    """breakdown of fire usage by model."""
+    cutoff = int(time.time()) - (days * 86400)
+    models = rollup().totals(cutoff)["models"]
+
+    counts = Counter({model: c for model, (c, _) in models.items()})
+    return [{"model": model, "calls": count, "total_tokens": models[model][1]}
+            for model, count in counts.most_common(10)]
+
+
 def forges(days: int = 30) -> list[dict]:
     """list of abilities forged in the time window."""
     cutoff = int(time.time()) - (days * 86400)
-    records = [r for r in read_jsonl(METRICS_FILE)
-               if r.get("ts", 0) > cutoff and r.get("type") == "forge"]
-    return records
+    return [r for r in rollup().records(cutoff) if r.get("type") == "forge"]
 
 
 def dashboard(days: int = 7) -> dict:
@@ -10,10 +10,12 @@ import json
 import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from keanu.paths import keanu_home
+from keanu.tools.inventory import inventory
 
 
 _AUDIT_LOG = keanu_home() / "audit.jsonl"
@@ -55,28 +57,73 @@ _SECRET_PATTERNS: list[tuple[str, re.Pattern, float]] = [
     ("jwt", re.compile(r"eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+"), 0.60),
 ]
 
+# every pattern needs one of these, lowercased, somewhere in the file.
+# most files have none and are done after one lowercase and a few `in`s.
+_SECRET_LITERALS = (
+    "akia", "aws", "ghp_", "gho_", "ghu_", "ghs_", "ghr_", "xox",
+    "sk_live_", "sk_test_", "sk-", "apikey", "api_key", "api-key",
+    "secret", "passw", "pwd", "token", "bearer", "private key-----",
+    "://", "eyj",
+)
+
+
+def _scoped(pattern: re.Pattern) -> str:
+    """a pattern's source with a leading (?i) turned into a scoped group,
+    so it can sit inside an alternation."""
+    source = pattern.pattern
+    if source.startswith("(?i)"):
+        return f"(?i:{source[4:]})"
+    return f"(?:{source})"
+
+
+# all patterns in one pass over the whole file. a hit only marks lines
+# as candidates: alternation keeps one match per position, so the real
+# patterns still run on those lines to find every category.
+_ANY_SECRET = re.compile("|".join(_scoped(p) for _, p, _ in _SECRET_PATTERNS))
+
 # files to always skip
 _SKIP_EXTENSIONS = {".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe", ".bin",
                     ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".woff",
                     ".woff2", ".ttf", ".eot", ".zip", ".gz", ".tar", ".bz2"}
 
-_SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv",
-              ".tox", ".mypy_cache", ".pytest_cache", "dist", "build",
-              ".eggs", "*.egg-info"}
+# a NUL byte in the first block means binary, whatever the extension says
+_SNIFF_BYTES = 8192
+
+# below this many files a process pool costs more than it saves
+_PARALLEL_MIN_FILES = 64
 
 
-def scan_secrets(path: str, max_files: int = 500) -> list[SecretFinding]:
-    """scan a file or directory for secrets."""
+def scan_secrets(path: str, max_files: int | None = None, workers: int | None = None) -> list[SecretFinding]:
+    """scan a file or directory for secrets. max_files caps a directory
+    scan, None scans everything."""
+    return list(iter_secrets(path, max_files=max_files, workers=workers))
+
+
+def iter_secrets(path: str, max_files: int | None = None, workers: int | None = None):
+    """yield findings file by file as the scan goes, in walk order.
+
+    big scans fan out over a process pool.
+    """
     p = Path(path)
     if p.is_file():
-        return _scan_file_secrets(p)
+        yield from _scan_file_secrets(p)
+        return
+    files = [str(f) for f in _walk_files(p, max_files)]
+    yield from _scan_files(files, workers)
 
-    findings = []
-    file_count = 0
-    for f in _walk_files(p, max_files):
-        findings.extend(_scan_file_secrets(f))
-        file_count += 1
-    return findings
+
+def _scan_files(files: list[str], workers: int | None = None):
+    """findings for each file, in order, a file's worth at a time."""
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(files) < _PARALLEL_MIN_FILES:
+        for f in files:
+            yield from _scan_file_secrets(Path(f))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(files) // (workers * 8))
+        for findings in pool.map(_scan_file_secrets, map(Path, files), chunksize=chunksize):
+            yield from findings
 
 
 def _scan_file_secrets(filepath: Path) -> list[SecretFinding]:
@@ -84,12 +131,20 @@ def _scan_file_secrets(filepath: Path) -> list[SecretFinding]:
     if filepath.suffix in _SKIP_EXTENSIONS:
         return []
     try:
-        text = filepath.read_text(errors="ignore")
-    except (OSError, UnicodeDecodeError):
+        data = filepath.read_bytes()
+    except OSError:
+        return []
+    if b"\0" in data[:_SNIFF_BYTES]:
+        return []
+
+    # same text read_text(errors="ignore") gives, universal newlines included
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    lower = text.lower()
+    if not any(literal in lower for literal in _SECRET_LITERALS):
         return []
 
     findings = []
-    for line_num, line in enumerate(text.split("\n"), 1):
+    for line_num, line in _candidate_lines(text):
         for name, pattern, confidence in _SECRET_PATTERNS:
             match = pattern.search(line)
             if match:
@@ -105,6 +160,23 @@ def _scan_file_secrets(filepath: Path) -> list[SecretFinding]:
     return findings
 
 
+def _candidate_lines(text: str):
+    """(line number, line) for every line a combined match touches, in order."""
+    hit = set()
+    pos, line_num = 0, 1
+    for match in _ANY_SECRET.finditer(text):
+        start, end = match.span()
+        line_num += text.count("\n", pos, start)
+        last = line_num + text.count("\n", start, end)
+        hit.update(range(line_num, last + 1))
+        pos, line_num = end, last
+    if not hit:
+        return
+    lines = text.split("\n")
+    for n in sorted(hit):
+        yield n, lines[n - 1]
+
+
 def _redact(line: str, match: re.Match) -> str:
     """redact a secret match, showing context but not the value."""
     start, end = match.span()
@@ -129,11 +201,8 @@ def check_secrets_in_staged() -> list[SecretFinding]:
     except Exception:
         return []
 
-    findings = []
-    for filename in result.stdout.strip().split("\n"):
-        if filename and Path(filename).exists():
-            findings.extend(_scan_file_secrets(Path(filename)))
-    return findings
+    files = [f for f in result.stdout.strip().split("\n") if f and Path(f).is_file()]
+    return list(_scan_files(files))
 
 
 # ============================================================
@@ -341,16 +410,15 @@ def _sanitize_args(args: dict) -> dict:
 # HELPERS
 # ============================================================
 
-def _walk_files(root: Path, max_files: int = 500):
-    """walk files, skipping binary and hidden dirs."""
+def _walk_files(root: Path, max_files: int | None = None):
+    """walk files, skipping binary and hidden dirs. gitignored files are
+    kept: they are where secrets usually live."""
     count = 0
-    for dirpath, dirnames, filenames in os.walk(root):
-        # skip hidden/vendor dirs
-        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not d.startswith(".")]
-        for name in filenames:
-            if count >= max_files:
-                return
-            filepath = Path(dirpath) / name
-            if filepath.suffix not in _SKIP_EXTENSIONS:
-                yield filepath
-                count += 1
+    for info in inventory(root, gitignore=False).files():
+        if max_files is not None and count >= max_files:
+            return
+        if any(part.startswith(".") for part in info.rel.split("/")[:-1]):
+            continue
+        if info.ext not in _SKIP_EXTENSIONS:
+            yield Path(root) / info.rel
+            count += 1
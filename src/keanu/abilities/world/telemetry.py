@@ -5,13 +5,22 @@ error rates. exports spans in a format compatible with COEF and
 opentelemetry-like systems.
 
 in the world: the scribe of fire. every flame leaves a trace.
+
+layout, for the log at spans.jsonl:
+    spans.jsonl                    legacy single log, read as the oldest segment
+    spans.segments/000001.jsonl    append-only spans, rotated by size
+    spans.segments/000001.idx.json trace_id -> byte offsets, min/max start_time
 """
 
+import atexit
 import json
+import os
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from keanu.io import read_json, write_json
 from keanu.paths import keanu_home
 
 
@@ -142,31 +151,278 @@ class trace_span:
 # PERSISTENCE
 # ============================================================
 
-def _persist_span(span: Span):
-    """write a span to the log file."""
-    _SPANS_LOG.parent.mkdir(parents=True, exist_ok=True)
+class SpanStore:
+    """size-rotated span segments with a lazy index per segment.
+
+    writes are buffered and land FLUSH_SPANS at a time, or FLUSH_SECONDS
+    after the first span went into an empty buffer (a daemon timer does
+    that one), on any read, and at exit. a flush that fails keeps the
+    spans, up to MAX_BUFFER of the newest, for the next one to retry.
+    reads never scan more than they need: recent spans come off the end
+    of the newest segments, a trace id goes straight to its offsets, and
+    a time window skips segments whose spans all started before it.
+
+    the index catches up on read, folding only bytes appended since the
+    last fold, so several processes can append to the same segment.
+    """
+
+    SEGMENT_BYTES = 4 * 1024 * 1024
+    FLUSH_SPANS = 64
+    FLUSH_SECONDS = 1.0
+    MAX_BUFFER = 4096
+    _INDEX_VERSION = 1
+
+    def __init__(self, log: Path):
+        self.log = Path(log)
+        self.segments_dir = self.log.with_suffix(".segments")
+        self._buffer: list[str] = []
+        self._timer: threading.Timer | None = None
+        self._failing = False
+        self._indexes: dict[Path, dict] = {}
+        self._lock = threading.Lock()
+
+    # -- writing --
+
+    def write(self, span: dict):
+        with self._lock:
+            self._buffer.append(json.dumps(span) + "\n")
+            due = len(self._buffer) >= self.FLUSH_SPANS
+            if not due and self._timer is None:
+                self._arm()
+        if due:
+            self.flush()
+
+    def _arm(self):
+        self._timer = threading.Timer(self.FLUSH_SECONDS, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            lines, self._buffer = self._buffer, []
+            if not lines:
+                return
+            try:
+                path = self._active_segment()
+                with open(path, "a") as f:
+                    f.write("".join(lines))
+            except OSError as e:
+                self._buffer = lines[-self.MAX_BUFFER:]
+                self._arm()
+                if not self._failing:
+                    self._failing = True
+                    from keanu.log import warn
+                    warn("telemetry", f"span write failed, holding {len(self._buffer)} spans: {e}")
+                return
+            self._failing = False
+
+    def _active_segment(self) -> Path:
+        segments = self._numbered()
+        if segments:
+            seg_no, path = segments[-1]
+            if path.stat().st_size < self.SEGMENT_BYTES:
+                return path
+            seg_no += 1
+        else:
+            seg_no = 1
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        return self.segments_dir / f"{seg_no:06d}.jsonl"
+
+    # -- reading --
+
+    def segments(self) -> list[Path]:
+        """every segment, oldest first. the legacy log comes before all."""
+        legacy = [self.log] if self.log.exists() else []
+        return legacy + [path for _, path in self._numbered()]
+
+    def _numbered(self) -> list[tuple[int, Path]]:
+        if not self.segments_dir.exists():
+            return []
+        found = []
+        for path in self.segments_dir.glob("*.jsonl"):
+            try:
+                found.append((int(path.stem), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def tail(self, limit: int) -> list[dict]:
+        """the last limit spans, oldest first, read backwards from the end."""
+        self.flush()
+        found = []
+        for path in reversed(self.segments()):
+            for line in _reversed_lines(path):
+                span = _parse(line)
+                if span is not None:
+                    found.append(span)
+                    if len(found) == limit:
+                        return found[::-1]
+        return found[::-1]
+
+    def all(self) -> list[dict]:
+        self.flush()
+        return [span for path in self.segments() for span in _read_spans(path)]
+
+    def trace(self, trace_id: str) -> list[dict]:
+        """every span of one trace, in write order."""
+        self.flush()
+        found = []
+        for path in self.segments():
+            offsets = self.index(path)["traces"].get(trace_id)
+            if not offsets:
+                continue
+            with open(path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    span = _parse(f.readline())
+                    if span is not None and span.get("trace_id") == trace_id:
+                        found.append(span)
+        return found
+
+    def since(self, start: float) -> list[dict]:
+        """spans that started at or after start, in write order."""
+        self.flush()
+        found = []
+        for path in self.segments():
+            latest = self.index(path)["max_ts"]
+            if latest is None or latest < start:
+                continue
+            found.extend(s for s in _read_spans(path) if s.get("start_time", 0) >= start)
+        return found
+
+    # -- index --
+
+    def index(self, path: Path) -> dict:
+        """the segment's index, folded up to its last complete line."""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return _empty_index()
+        idx_path = path.with_suffix(".idx.json")
+        idx = self._indexes.get(path)
+        if idx is None:
+            idx = read_json(idx_path)
+            if not idx or idx.get("version") != self._INDEX_VERSION:
+                idx = _empty_index()
+        if idx["size"] > size:
+            idx = _empty_index()   # truncated or replaced
+        if idx["size"] < size:
+            offset = idx["size"]
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break   # a write still landing, fold it next time
+                    span = _parse(raw)
+                    if span is not None:
+                        _index_span(idx, span, offset)
+                    offset += len(raw)
+            if offset != idx["size"]:
+                idx["size"] = offset
+                try:
+                    write_json(idx_path, idx, indent=None)
+                except OSError:
+                    pass
+        self._indexes[path] = idx
+        return idx
+
+
+def _empty_index() -> dict:
+    return {"version": SpanStore._INDEX_VERSION, "size": 0, "count": 0,
+            "min_ts": None, "max_ts": None, "traces": {}}
+
+
+def _index_span(idx: dict, span: dict, offset: int):
+    idx["count"] += 1
+    ts = span.get("start_time", 0)
+    if isinstance(ts, (int, float)):
+        idx["min_ts"] = ts if idx["min_ts"] is None else min(idx["min_ts"], ts)
+        idx["max_ts"] = ts if idx["max_ts"] is None else max(idx["max_ts"], ts)
+    trace_id = span.get("trace_id")
+    if trace_id:
+        idx["traces"].setdefault(trace_id, []).append(offset)
+
+
+def _parse(line: bytes):
+    line = line.strip()
+    if not line:
+        return None
     try:
-        with open(_SPANS_LOG, "a") as f:
-            f.write(json.dumps(span.to_dict()) + "\n")
-    except OSError:
-        pass
+        span = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return span if isinstance(span, dict) else None
 
 
-def get_spans(limit: int = 100, trace_id: str = "") -> list[dict]:
-    """read recent spans from the log."""
-    if not _SPANS_LOG.exists():
+def _read_spans(path: Path) -> list[dict]:
+    try:
+        with open(path, "rb") as f:
+            return [span for span in map(_parse, f) if span is not None]
+    except OSError:
         return []
-    entries = []
+
+
+def _reversed_lines(path: Path, block: int = 64 * 1024):
+    """lines of a file, last first, reading backwards a block at a time."""
     try:
-        for line in _SPANS_LOG.read_text().strip().split("\n"):
-            if line.strip():
-                entry = json.loads(line)
-                if trace_id and entry.get("trace_id") != trace_id:
-                    continue
-                entries.append(entry)
-    except (json.JSONDecodeError, OSError):
-        pass
-    return entries[-limit:]
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            parts = (f.read(step) + rest).split(b"\n")
+            rest = parts[0]
+            yield from reversed(parts[1:])
+        yield rest
+
+
+_stores: dict[Path, SpanStore] = {}
+_stores_lock = threading.Lock()
+
+
+def span_store() -> SpanStore:
+    """the process-wide store for the current span log."""
+    with _stores_lock:
+        store = _stores.get(_SPANS_LOG)
+        if store is None:
+            store = _stores[_SPANS_LOG] = SpanStore(_SPANS_LOG)
+        return store
+
+
+def flush_spans():
+    """write out every buffered span."""
+    for store in list(_stores.values()):
+        store.flush()
+
+
+atexit.register(flush_spans)
+
+
+def _persist_span(span: Span):
+    """buffer a span for the log."""
+    span_store().write(span.to_dict())
+
+
+def get_spans(limit: int = 100, trace_id: str = "") -> list[dict]:
+    """recent spans, oldest first. limit <= 0 means all of them."""
+    store = span_store()
+    if trace_id:
+        spans = store.trace(trace_id)
+        return spans[-limit:] if limit > 0 else spans
+    return store.tail(limit) if limit > 0 else store.all()
+
+
+def get_spans_since(start: float) -> list[dict]:
+    """every span that started at or after start."""
+    return span_store().since(start)
 
 
 # ============================================================
@@ -238,8 +494,7 @@ def analyze_traces(spans: list[dict] | None = None) -> TraceStats:
 def trace_summary(days: int = 7) -> dict:
     """summarize trace data for the last N days."""
     cutoff = time.time() - (days * 86400)
-    all_spans = get_spans(limit=5000)
-    recent = [s for s in all_spans if s.get("start_time", 0) >= cutoff]
+    recent = get_spans_since(cutoff)
 
     stats = analyze_traces(recent)
 
@@ -153,12 +153,31 @@ def _hot(emotions: list) -> bool:
     return any(e.get("intensity", 0) > 0.6 for e in emotions)
 
 
+# readings are cached per text in the shared text cache, keyed with the
+# collection's signature so a re-bake starts fresh. callers get copies.
+
 def _get_emotions(text: str) -> list:
+    from keanu.tools.cache import text_cache
+    from keanu.wellspring import signature
+    emotions = text_cache.get_or_compute(
+        ("emotions", signature("silverado")), text, lambda: _read_emotions(text))
+    return [dict(e) for e in emotions]
+
+
+def _get_color(text: str) -> dict:
+    from keanu.tools.cache import text_cache
+    from keanu.wellspring import signature
+    color = text_cache.get_or_compute(
+        ("color", signature("silverado_rgb")), text, lambda: _read_color(text))
+    return dict(color)
+
+
+def _read_emotions(text: str) -> list:
     from keanu.abilities.seeing.detect.engine import detect_emotion
     return detect_emotion(text)
 
 
-def _get_color(text: str) -> dict:
+def _read_color(text: str) -> dict:
     empty = {"state": "flat", "red_net": 0, "yellow_net": 0, "blue_net": 0,
              "balance": 0, "fullness": 0, "wise_mind": 0}
 
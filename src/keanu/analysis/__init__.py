@@ -1,7 +1,11 @@
 """analysis - code understanding and transformation."""
 
 from keanu.analysis.symbols import find_definition, find_references, find_callers, list_symbols, Symbol, Reference
-from keanu.analysis.deps import build_import_graph, who_imports, find_circular, external_deps, stats
+from keanu.analysis.symindex import SymbolIndex, Definition, Call, symbol_index
+from keanu.analysis.deps import (
+    build_import_graph, who_imports, find_circular, external_deps, stats,
+    ImportGraph, import_graph, affected_files,
+)
 from keanu.analysis.errors import parse, ParsedError
 from keanu.analysis.review import review_diff, review_file, ReviewResult, Issue
 from keanu.analysis.suggestions import scan_file, scan_directory, check_missing_tests, Suggestion
@@ -3,61 +3,208 @@
 parses import statements to build a graph of which files depend on which.
 used by the context manager to know: "if I edit file A, what else might break?"
 
+the graph is kept per project and updated edge by edge as files change,
+on top of the symbol index's per-file import lists, so asking twice
+doesn't parse the project twice.
+
 in the world: the web. pull one thread, see what moves.
 """
 
-import ast
-import os
-from collections import defaultdict
+import threading
+from collections import Counter, defaultdict
 from pathlib import Path
 
+from keanu.analysis.symindex import symbol_index
 
-def build_import_graph(root: str = ".") -> dict:
-    """build a graph of Python imports within a project.
-
-    returns {
-        "nodes": {filepath: {"imports": [...], "imported_by": [...]}},
-        "edges": [(from_file, to_file), ...],
-        "external": {package_name: [files_that_import_it]},
-    }
-    """
-    root_path = Path(root).resolve()
-    py_files = list(root_path.rglob("*.py"))
-
-    # map module paths to file paths
-    module_map = _build_module_map(root_path, py_files)
 
-    nodes = {}
-    edges = []
-    external = defaultdict(list)
+class ImportGraph:
+    """the import graph of one project, kept current one file at a time.
 
-    for py_file in py_files:
-        rel = str(py_file.relative_to(root_path))
-        imports = _extract_imports(py_file)
+    the modules each file imports come from the symbol index, which
+    re-parses a file only when its content hash moves. a refresh
+    re-resolves edges only for files whose imports changed and for files
+    importing a module that appeared, vanished or moved.
+    """
 
-        resolved = []
-        for imp in imports:
-            target = module_map.get(imp)
+    def __init__(self, root: str | Path):
+        self.root = Path(root).resolve()
+        self._hashes: dict[str, str] = {}       # rel -> hash the edges came from
+        self._imports: dict[str, list] = {}     # rel -> dotted names, in source order
+        self._modules: dict[str, str] = {}      # dotted name -> rel
+        self._wanted = defaultdict(set)         # dotted name -> rels importing it
+        self._out: dict[str, list] = {}         # rel -> resolved imports, in source order
+        self._in = defaultdict(Counter)         # rel -> Counter of rels importing it
+        self._external: dict[str, list] = {}    # rel -> top-level external packages
+        self._order: list[str] = []             # rels, sorted
+        self._sccs = None                       # cached strongly connected components
+        self._cycles: dict[frozenset, tuple] = {}   # scc -> (internal edges, cycles)
+        self._lock = threading.Lock()
+        self.resolved = 0   # files whose edges were re-resolved, for diagnostics
+
+    def refresh(self):
+        current = symbol_index(self.root).imports()
+        with self._lock:
+            removed = self._hashes.keys() - current.keys()
+            changed = [rel for rel, (digest, _) in current.items()
+                       if self._hashes.get(rel) != digest]
+            if not removed and not changed:
+                return
+
+            dirty = set(changed)
+            for rel in removed:
+                self._set_imports(rel, [])
+                self._hashes.pop(rel)
+                self._imports.pop(rel)
+            for rel in changed:
+                digest, imports = current[rel]
+                self._set_imports(rel, imports)
+                self._hashes[rel] = digest
+
+            if removed or len(current) != len(self._order):
+                self._order = sorted(current)
+                modules = _build_module_map(self.root, [self.root / rel for rel in self._order])
+                for name in self._modules.keys() | modules.keys():
+                    if self._modules.get(name) != modules.get(name):
+                        dirty |= self._wanted.get(name, set())
+                self._modules = modules
+
+            for rel in removed:
+                self._resolve(rel)
+            for rel in dirty - removed:
+                self._resolve(rel)
+            self._sccs = None
+
+    def _set_imports(self, rel: str, imports: list):
+        for name in self._imports.get(rel, []):
+            self._wanted[name].discard(rel)
+        for name in imports:
+            self._wanted[name].add(rel)
+        self._imports[rel] = imports
+
+    def _resolve(self, rel: str):
+        for target in self._out.pop(rel, []):
+            self._in[target][rel] -= 1
+            if self._in[target][rel] <= 0:
+                del self._in[target][rel]
+        self._external.pop(rel, None)
+        if rel not in self._hashes:
+            return
+        self.resolved += 1
+        out, external = [], []
+        for name in self._imports[rel]:
+            target = self._modules.get(name)
             if target:
-                resolved.append(target)
-                edges.append((rel, target))
+                out.append(target)
+                self._in[target][rel] += 1
             else:
-                # external dependency
-                top_level = imp.split(".")[0]
-                external[top_level].append(rel)
+                external.append(name.split(".")[0])
+        self._out[rel] = out
+        self._external[rel] = external
+
+    # -- queries --
+
+    def imports(self, rel: str) -> list[str]:
+        """the project files rel imports, in source order."""
+        self.refresh()
+        with self._lock:
+            return list(self._out.get(rel, []))
+
+    def importers(self, rel: str) -> list[str]:
+        """the project files that import rel, sorted."""
+        self.refresh()
+        with self._lock:
+            return sorted(self._in.get(rel, Counter()).elements())
+
+    def neighbors(self, rels) -> dict[str, tuple[list[str], list[str]]]:
+        """(imports, importers) for each of rels, from a single refresh.
+        the same lists imports() and importers() give, without re-statting
+        the project once per file asked about."""
+        self.refresh()
+        with self._lock:
+            return {rel: (list(self._out.get(rel, [])),
+                          sorted(self._in.get(rel, Counter()).elements()))
+                    for rel in rels}
+
+    def affected_by(self, rels) -> list[str]:
+        """every file that imports one of rels, directly or through other
+        files: what might break if they change. sorted, rels themselves
+        left out unless an import cycle leads back to them."""
+        self.refresh()
+        if isinstance(rels, str):
+            rels = [rels]
+        with self._lock:
+            return _closure(rels, lambda rel: self._in.get(rel, ()))
+
+    def depends_on(self, rels) -> list[str]:
+        """every project file rels import, directly or not. sorted."""
+        self.refresh()
+        if isinstance(rels, str):
+            rels = [rels]
+        with self._lock:
+            return _closure(rels, lambda rel: self._out.get(rel, ()))
+
+    def cycles(self) -> list[list[str]]:
+        """import cycles, each a path that ends where it starts.
+
+        one depth-first search per strongly connected component, and a
+        component's cycles are only searched again when the edges inside
+        it changed.
+        """
+        self.refresh()
+        with self._lock:
+            if self._sccs is None:
+                self._sccs = _sccs(self._order, self._out)
+            cycles, kept = [], {}
+            for scc in self._sccs:
+                inside = {rel: [t for t in self._out[rel] if t in scc] for rel in scc}
+                cached = self._cycles.get(scc)
+                if cached is None or cached[0] != inside:
+                    order = [rel for rel in self._order if rel in scc]
+                    cached = (inside, _find_cycles(order, inside))
+                kept[scc] = cached
+                cycles.extend(cached[1])
+            self._cycles = kept
+            return cycles
+
+    def as_dict(self) -> dict:
+        """the graph in build_import_graph's shape."""
+        self.refresh()
+        with self._lock:
+            nodes, edges, external = {}, [], defaultdict(list)
+            for rel in self._order:
+                nodes[rel] = {"imports": list(self._out[rel]), "imported_by": []}
+                edges.extend((rel, target) for target in self._out[rel])
+                for package in self._external[rel]:
+                    external[package].append(rel)
+            for from_file, to_file in edges:
+                nodes[to_file]["imported_by"].append(from_file)
+            return {"nodes": nodes, "edges": edges, "external": dict(external)}
+
+
+_graphs: dict[Path, ImportGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def import_graph(root: str | Path = ".") -> ImportGraph:
+    """the process-wide import graph for a project root."""
+    key = Path(root).resolve()
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = _graphs[key] = ImportGraph(key)
+        return graph
 
-        nodes[rel] = {"imports": resolved, "imported_by": []}
 
-    # build reverse edges
-    for from_file, to_file in edges:
-        if to_file in nodes:
-            nodes[to_file]["imported_by"].append(from_file)
+def build_import_graph(root: str = ".") -> dict:
+    """build a graph of Python imports within a project.
 
-    return {
-        "nodes": nodes,
-        "edges": edges,
-        "external": dict(external),
+    returns {
+        "nodes": {filepath: {"imports": [...], "imported_by": [...]}},
+        "edges": [(from_file, to_file), ...],
+        "external": {package_name: [files_that_import_it]},
     }
+    """
+    return import_graph(root).as_dict()
 
 
 def who_imports(filepath: str, root: str = ".") -> list[str]:
@@ -65,10 +212,8 @@ def who_imports(filepath: str, root: str = ".") -> list[str]:
 
     the key question: "if I change this file, what might break?"
     """
-    graph = build_import_graph(root)
     rel = str(Path(filepath).relative_to(Path(root).resolve()))
-    node = graph["nodes"].get(rel, {})
-    return node.get("imported_by", [])
+    return import_graph(root).importers(rel)
 
 
 def what_imports(filepath: str, root: str = ".") -> list[str]:
@@ -76,10 +221,19 @@ def what_imports(filepath: str, root: str = ".") -> list[str]:
 
     useful for understanding context: "what does this file depend on?"
     """
-    graph = build_import_graph(root)
     rel = str(Path(filepath).relative_to(Path(root).resolve()))
-    node = graph["nodes"].get(rel, {})
-    return node.get("imports", [])
+    return import_graph(root).imports(rel)
+
+
+def affected_files(filepaths: list[str], root: str = ".") -> list[str]:
+    """every file that imports one of these, directly or transitively.
+
+    the wider question: "if I change these, what might break anywhere?"
+    """
+    root_path = Path(root).resolve()
+    rels = [str(Path(f).relative_to(root_path)) if Path(f).is_absolute() else f
+            for f in filepaths]
+    return import_graph(root).affected_by(rels)
 
 
 def find_circular(root: str = ".") -> list[list[str]]:
@@ -87,37 +241,7 @@ def find_circular(root: str = ".") -> list[list[str]]:
 
     returns a list of cycles, each cycle is a list of file paths.
     """
-    graph = build_import_graph(root)
-    edges_map = defaultdict(list)
-    for from_file, to_file in graph["edges"]:
-        edges_map[from_file].append(to_file)
-
-    visited = set()
-    path = []
-    path_set = set()
-    cycles = []
-
-    def dfs(node):
-        if node in path_set:
-            # found a cycle
-            idx = path.index(node)
-            cycle = path[idx:] + [node]
-            cycles.append(cycle)
-            return
-        if node in visited:
-            return
-        visited.add(node)
-        path.append(node)
-        path_set.add(node)
-        for neighbor in edges_map.get(node, []):
-            dfs(neighbor)
-        path.pop()
-        path_set.remove(node)
-
-    for node in graph["nodes"]:
-        dfs(node)
-
-    return cycles
+    return import_graph(root).cycles()
 
 
 def external_deps(root: str = ".") -> dict:
@@ -189,24 +313,80 @@ def _build_module_map(root: Path, py_files: list[Path]) -> dict:
     return module_map
 
 
-def _extract_imports(filepath: Path) -> list[str]:
-    """extract import targets from a Python file using AST.
-
-    returns dotted module names: ["keanu.oracle", "os", "json"]
-    """
-    try:
-        source = filepath.read_text()
-        tree = ast.parse(source)
-    except (SyntaxError, UnicodeDecodeError, OSError):
-        return []
-
-    imports = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append(alias.name)
-        elif isinstance(node, ast.ImportFrom):
-            if node.module:
-                imports.append(node.module)
-
-    return imports
+def _closure(start, neighbors) -> list[str]:
+    seen, queue = set(), list(start)
+    while queue:
+        for nxt in neighbors(queue.pop()):
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return sorted(seen)
+
+
+def _sccs(order: list[str], edges: dict) -> list[frozenset]:
+    """strongly connected components that hold a cycle: more than one
+    file, or a file importing itself. iterative tarjan."""
+    index, low, on_stack, stack, found = {}, {}, set(), [], []
+    counter = 0
+    for start in order:
+        if start in index:
+            continue
+        work = [(start, iter(edges.get(start, ())))]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                members = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.add(member)
+                    if member == node:
+                        break
+                if len(members) > 1 or node in edges.get(node, ()):
+                    found.append(frozenset(members))
+    return found
+
+
+def _find_cycles(order: list[str], edges: dict) -> list[list[str]]:
+    """the cycles one depth-first search walks into, starting from each
+    unvisited file in order."""
+    visited, path, on_path, cycles = set(), [], {}, []
+    for start in order:
+        if start in visited:
+            continue
+        visited.add(start)
+        on_path[start] = 0
+        path.append(start)
+        work = [iter(edges.get(start, ()))]
+        while work:
+            nxt = next(work[-1], None)
+            if nxt is None:
+                work.pop()
+                del on_path[path.pop()]
+            elif nxt in on_path:
+                cycles.append(path[on_path[nxt]:] + [nxt])
+            elif nxt not in visited:
+                visited.add(nxt)
+                on_path[nxt] = len(path)
+                path.append(nxt)
+                work.append(iter(edges.get(nxt, ())))
+    return cycles
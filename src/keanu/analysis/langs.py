@@ -0,0 +1,174 @@
+"""langs.py - the languages keanu reads without a parser.
+
+extension -> language, and the regex patterns that pick definitions out
+of each language's lines. polyglot answers questions with these and
+the symbol index builds its entries from them.
+
+in the world: the phrasebook. a page per tongue, enough to find a name.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class Symbol:
+    """a code symbol found in a file."""
+    name: str
+    kind: str           # function, class, method, variable, type, interface
+    file: str
+    line: int
+    language: str
+    signature: str = ""
+    exported: bool = False
+
+
+# ============================================================
+# LANGUAGE DETECTION
+# ============================================================
+
+LANG_MAP = {
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+}
+
+
+def detect_language(path: str) -> str:
+    """detect language from file extension."""
+    ext = Path(path).suffix.lower()
+    return LANG_MAP.get(ext, "")
+
+
+# ============================================================
+# PATTERNS PER LANGUAGE
+# ============================================================
+
+# each entry: (regex, kind)
+_JS_PATTERNS = [
+    (r'(?:export\s+)?(?:async\s+)?function\s+(\w+)', "function"),
+    (r'(?:export\s+)?class\s+(\w+)', "class"),
+    (r'(?:export\s+)?const\s+(\w+)\s*=\s*(?:async\s+)?\(', "function"),
+    (r'(?:export\s+)?const\s+(\w+)\s*=\s*\{', "variable"),
+    (r'(?:export\s+)?(?:let|const|var)\s+(\w+)\s*=', "variable"),
+    (r'(\w+)\s*\([^)]*\)\s*\{', "method"),
+]
+
+_TS_PATTERNS = _JS_PATTERNS + [
+    (r'(?:export\s+)?interface\s+(\w+)', "interface"),
+    (r'(?:export\s+)?type\s+(\w+)\s*=', "type"),
+    (r'(?:export\s+)?enum\s+(\w+)', "enum"),
+]
+
+_GO_PATTERNS = [
+    (r'func\s+(\w+)\s*\(', "function"),
+    (r'func\s+\(\w+\s+\*?\w+\)\s+(\w+)\s*\(', "method"),
+    (r'type\s+(\w+)\s+struct\b', "struct"),
+    (r'type\s+(\w+)\s+interface\b', "interface"),
+    (r'type\s+(\w+)\s+', "type"),
+    (r'var\s+(\w+)\s+', "variable"),
+    (r'const\s+(\w+)\s*=', "variable"),
+]
+
+_RUST_PATTERNS = [
+    (r'(?:pub\s+)?fn\s+(\w+)', "function"),
+    (r'(?:pub\s+)?struct\s+(\w+)', "struct"),
+    (r'(?:pub\s+)?enum\s+(\w+)', "enum"),
+    (r'(?:pub\s+)?trait\s+(\w+)', "trait"),
+    (r'(?:pub\s+)?type\s+(\w+)', "type"),
+    (r'impl(?:<[^>]*>)?\s+(\w+)', "impl"),
+    (r'(?:pub\s+)?(?:static|const)\s+(\w+)', "variable"),
+    (r'(?:pub\s+)?mod\s+(\w+)', "module"),
+]
+
+_RUBY_PATTERNS = [
+    (r'def\s+(\w+)', "function"),
+    (r'class\s+(\w+)', "class"),
+    (r'module\s+(\w+)', "module"),
+    (r'attr_(?:reader|writer|accessor)\s+:(\w+)', "variable"),
+]
+
+_JAVA_PATTERNS = [
+    (r'(?:public|private|protected)?\s*(?:static\s+)?(?:final\s+)?\w+\s+(\w+)\s*\(', "method"),
+    (r'(?:public\s+)?class\s+(\w+)', "class"),
+    (r'(?:public\s+)?interface\s+(\w+)', "interface"),
+    (r'(?:public\s+)?enum\s+(\w+)', "enum"),
+]
+
+_C_PATTERNS = [
+    (r'(?:static\s+)?(?:\w+\s+)+(\w+)\s*\([^)]*\)\s*\{', "function"),
+    (r'typedef\s+struct\s+\w*\s*\{[^}]*\}\s*(\w+)', "struct"),
+    (r'struct\s+(\w+)\s*\{', "struct"),
+    (r'enum\s+(\w+)\s*\{', "enum"),
+    (r'#define\s+(\w+)', "macro"),
+]
+
+LANGUAGE_PATTERNS = {
+    "javascript": _JS_PATTERNS,
+    "typescript": _TS_PATTERNS,
+    "go": _GO_PATTERNS,
+    "rust": _RUST_PATTERNS,
+    "ruby": _RUBY_PATTERNS,
+    "java": _JAVA_PATTERNS,
+    "kotlin": _JAVA_PATTERNS,
+    "c": _C_PATTERNS,
+    "cpp": _C_PATTERNS,
+}
+
+
+def _is_exported(line: str, language: str) -> bool:
+    """check if a symbol definition is exported."""
+    if language in ("javascript", "typescript"):
+        return "export" in line
+    elif language == "go":
+        # Go exports start with uppercase
+        return False  # checked separately
+    elif language == "rust":
+        return "pub " in line
+    elif language in ("java", "kotlin"):
+        return "public" in line
+    return False
+
+
+# ============================================================
+# SYMBOLS
+# ============================================================
+
+def symbols_in(content: str, path: str, language: str) -> list[Symbol]:
+    """the symbols defined in one file's text."""
+    patterns = LANGUAGE_PATTERNS.get(language, [])
+    symbols = []
+    for i, line in enumerate(content.split("\n"), 1):
+        for regex, kind in patterns:
+            match = re.search(regex, line)
+            if match:
+                name = match.group(1)
+                exported = _is_exported(line, language)
+
+                # Go: uppercase first letter means exported
+                if language == "go" and name[0].isupper():
+                    exported = True
+
+                symbols.append(Symbol(
+                    name=name,
+                    kind=kind,
+                    file=path,
+                    line=i,
+                    language=language,
+                    signature=line.strip(),
+                    exported=exported,
+                ))
+                break  # one symbol per line
+
+    return symbols
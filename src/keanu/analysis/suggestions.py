@@ -13,6 +13,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from keanu.tools.inventory import inventory
+
 
 @dataclass
 class Suggestion:
@@ -81,22 +83,11 @@ def scan_directory(root: str = ".", max_files: int = 100) -> SuggestionReport:
     root_path = Path(root).resolve()
     report = SuggestionReport()
 
-    skip_dirs = {"__pycache__", ".git", "node_modules", ".tox",
-                 ".venv", "venv", ".eggs", "dist", "build"}
-
     count = 0
-    for py_file in sorted(root_path.rglob("*.py")):
-        if any(part in skip_dirs for part in py_file.parts):
-            continue
+    for info in inventory(root_path).files(exts={".py"}):
         if count >= max_files:
             break
-
-        try:
-            rel = str(py_file.relative_to(root_path))
-        except ValueError:
-            rel = str(py_file)
-
-        report.suggestions.extend(scan_file(str(py_file)))
+        report.suggestions.extend(scan_file(info.path))
         count += 1
 
     report.files_scanned = count
@@ -111,14 +102,13 @@ def check_missing_tests(root: str = ".") -> list[Suggestion]:
     src_files = set()
     test_files = set()
 
-    for py_file in root_path.rglob("*.py"):
-        if "__pycache__" in str(py_file) or ".git" in str(py_file):
-            continue
-        rel = str(py_file.relative_to(root_path))
+    for info in inventory(root_path).files(exts={".py"}):
+        rel = info.rel
+        stem = info.name[:-len(info.ext)]
         if rel.startswith("tests/") or "/tests/" in rel:
-            test_files.add(py_file.stem)
-        elif not rel.startswith(".") and py_file.stem != "__init__":
-            src_files.add((rel, py_file.stem))
+            test_files.add(stem)
+        elif not rel.startswith(".") and stem != "__init__":
+            src_files.add((rel, stem))
 
     for rel, stem in sorted(src_files):
         test_name = f"test_{stem}"
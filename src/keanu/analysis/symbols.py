@@ -13,6 +13,12 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from keanu.analysis.symindex import symbol_index
+from keanu.tools.cache import file_cache, ast_cache
+
+
+_PYTHON = {"python"}
+
 
 @dataclass
 class Symbol:
@@ -34,23 +40,18 @@ class Reference:
     context: str = ""  # the line of code
 
 
-def find_definition(name: str, root: str = ".") -> list[Symbol]:
-    """find where a symbol is defined.
+def find_definition(name: str, root: str = ".", prefix: bool = False) -> list[Symbol]:
+    """find where a symbol is defined, or every symbol whose name starts
+    with name when prefix is set.
 
-    tries AST for Python files first, regex fallback for everything else.
-    returns all definitions found, sorted by relevance (exact match first).
+    answered from the symbol index: AST for Python files, regex fallback
+    for files that don't parse. sorted by relevance (exact match first).
     """
-    root_path = Path(root).resolve()
-    results = []
-
-    # Python files: AST
-    for py_file in root_path.rglob("*.py"):
-        if _should_skip(py_file):
-            continue
-        try:
-            results.extend(_find_defs_ast(name, py_file, root_path))
-        except Exception:
-            results.extend(_find_defs_regex(name, py_file, root_path))
+    results = [
+        Symbol(name=d.name, kind=d.kind, file=d.file, line=d.line,
+               col=d.col, parent=d.parent)
+        for d in symbol_index(root).definitions(name, prefix=prefix, languages=_PYTHON)
+    ]
 
     # sort: exact name match first, then partial
     results.sort(key=lambda s: (0 if s.name == name else 1, s.file))
@@ -60,17 +61,15 @@ def find_definition(name: str, root: str = ".") -> list[Symbol]:
 def find_references(name: str, root: str = ".") -> list[Reference]:
     """find all usages of a symbol.
 
-    searches all Python files for the name. returns file, line, context.
+    searches Python files for the name. returns file, line, context.
+    only files the symbol index says can contain it are read.
     """
     root_path = Path(root).resolve()
     results = []
 
-    for py_file in root_path.rglob("*.py"):
-        if _should_skip(py_file):
-            continue
+    for rel in symbol_index(root_path).files_containing(name, languages=_PYTHON):
         try:
-            text = py_file.read_text()
-            rel = str(py_file.relative_to(root_path))
+            text = file_cache.read(str(root_path / rel))
             for i, line in enumerate(text.split("\n"), 1):
                 if name in line:
                     results.append(Reference(
@@ -79,6 +78,8 @@ def find_references(name: str, root: str = ".") -> list[Reference]:
                     ))
         except Exception:
             continue
+        if len(results) >= 100:
+            break
 
     return results[:100]  # cap results
 
@@ -93,12 +94,9 @@ def find_callers(name: str, root: str = ".") -> list[Reference]:
     results = []
     call_pattern = re.compile(rf'(?<![.\w]){re.escape(name)}\s*\(')
 
-    for py_file in root_path.rglob("*.py"):
-        if _should_skip(py_file):
-            continue
+    for rel in _files_for_callers(name, root_path):
         try:
-            text = py_file.read_text()
-            rel = str(py_file.relative_to(root_path))
+            text = file_cache.read(str(root_path / rel))
             for i, line in enumerate(text.split("\n"), 1):
                 stripped = line.strip()
                 # skip definitions and imports
@@ -111,10 +109,19 @@ def find_callers(name: str, root: str = ".") -> list[Reference]:
                     ))
         except Exception:
             continue
+        if len(results) >= 100:
+            break
 
     return results[:100]
 
 
+def _files_for_callers(name: str, root: Path) -> list[str]:
+    index = symbol_index(root)
+    if re.fullmatch(r"\w+", name):
+        return index.files_with_word(name, languages=_PYTHON)
+    return index.files_containing(name, languages=_PYTHON)
+
+
 def list_symbols(filepath: str) -> list[Symbol]:
     """list all symbols defined in a file."""
     path = Path(filepath)
@@ -132,55 +139,10 @@ def list_symbols(filepath: str) -> list[Symbol]:
 # AST-BASED FINDING
 # ============================================================
 
-def _find_defs_ast(name: str, filepath: Path, root: Path) -> list[Symbol]:
-    """find definitions of a name in a Python file using AST."""
-    try:
-        tree = ast.parse(filepath.read_text())
-    except SyntaxError:
-        return []
-
-    rel = str(filepath.relative_to(root))
-    results = []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef) and node.name == name:
-            # check if it's a method (inside a class)
-            parent = _find_parent_class(tree, node)
-            results.append(Symbol(
-                name=name,
-                kind="method" if parent else "function",
-                file=rel, line=node.lineno, col=node.col_offset,
-                parent=parent or "",
-            ))
-        elif isinstance(node, ast.AsyncFunctionDef) and node.name == name:
-            parent = _find_parent_class(tree, node)
-            results.append(Symbol(
-                name=name,
-                kind="method" if parent else "function",
-                file=rel, line=node.lineno, col=node.col_offset,
-                parent=parent or "",
-            ))
-        elif isinstance(node, ast.ClassDef) and node.name == name:
-            results.append(Symbol(
-                name=name, kind="class",
-                file=rel, line=node.lineno, col=node.col_offset,
-            ))
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == name:
-                    results.append(Symbol(
-                        name=name, kind="variable",
-                        file=rel, line=node.lineno, col=node.col_offset,
-                    ))
-
-    return results
-
-
 def _find_all_symbols_ast(filepath: Path, root: Path) -> list[Symbol]:
     """find all symbol definitions in a file."""
-    try:
-        tree = ast.parse(filepath.read_text())
-    except SyntaxError:
+    tree = ast_cache.parse(str(filepath))
+    if tree is None:
         return []
 
     rel = str(filepath.relative_to(root))
@@ -213,49 +175,3 @@ def _find_parent_class(tree, target_node) -> Optional[str]:
                 if child is target_node:
                     return node.name
     return None
-
-
-# ============================================================
-# REGEX FALLBACK
-# ============================================================
-
-def _find_defs_regex(name: str, filepath: Path, root: Path) -> list[Symbol]:
-    """regex fallback for finding definitions."""
-    try:
-        text = filepath.read_text()
-    except (OSError, UnicodeDecodeError):
-        return []
-
-    rel = str(filepath.relative_to(root))
-    results = []
-
-    patterns = [
-        (rf'^def\s+{re.escape(name)}\s*\(', "function"),
-        (rf'^class\s+{re.escape(name)}[\s:(]', "class"),
-        (rf'^\s+def\s+{re.escape(name)}\s*\(', "method"),
-        (rf'^{re.escape(name)}\s*=', "variable"),
-    ]
-
-    for i, line in enumerate(text.split("\n"), 1):
-        for pattern, kind in patterns:
-            if re.match(pattern, line):
-                results.append(Symbol(
-                    name=name, kind=kind,
-                    file=rel, line=i,
-                ))
-
-    return results
-
-
-# ============================================================
-# HELPERS
-# ============================================================
-
-def _should_skip(path: Path) -> bool:
-    """skip files that shouldn't be searched."""
-    parts = path.parts
-    skip_dirs = {
-        "__pycache__", ".git", "node_modules", ".tox",
-        ".venv", "venv", ".eggs", "dist", "build",
-    }
-    return any(part in skip_dirs for part in parts)
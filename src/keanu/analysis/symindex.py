@@ -0,0 +1,442 @@
+"""symindex.py - a persistent index of definitions, words and calls.
+
+one sqlite database per project under keanu_home()/symbols, a row per
+source file. each row is keyed by the sha256 of the file's contents and
+only rebuilt when that changes, and only the rows that moved are
+written back, so after the first build a lookup stats the tree and
+answers from memory instead of re-parsing every file. a new process
+reads just the stat columns up front; definitions, calls and words are
+read the first time a query needs them.
+
+python files are read with ast: definitions, caller -> callee edges,
+the modules each file imports (deps builds its graph from these), and
+the words each file contains. other languages in langs.LANG_MAP get
+their definitions from langs' regex patterns, and their words too.
+the words narrow a text search down to the files that can match it.
+
+in the world: the concordance. somebody read the whole book once and
+wrote down where every word is, so nobody has to again.
+"""
+
+import ast
+import bisect
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from keanu.analysis.langs import LANG_MAP, symbols_in
+from keanu.paths import keanu_home
+from keanu.tools.inventory import inventory
+
+
+_INDEX_DIR = keanu_home() / "symbols"
+_VERSION = 3
+
+_PAYLOAD = ("defs", "calls", "imports", "words")
+
+# a file modified this recently may change again within the same mtime
+# tick, so its stat isn't trusted on the next refresh
+_RACY_NS = 1_000_000_000
+
+_WORD_RE = re.compile(r"\w+")
+
+INDEXED_EXTS = frozenset({".py", *LANG_MAP})
+
+_PY_PATTERNS = [
+    (re.compile(r"^def\s+(\w+)\s*\("), "function"),
+    (re.compile(r"^class\s+(\w+)[\s:(]"), "class"),
+    (re.compile(r"^\s+def\s+(\w+)\s*\("), "method"),
+    (re.compile(r"^(\w+)\s*="), "variable"),
+]
+
+
+@dataclass(frozen=True)
+class Definition:
+    """a definition in the index. file is relative to the root."""
+    name: str
+    kind: str
+    file: str
+    line: int
+    col: int
+    parent: str     # class name for python methods
+    language: str
+    signature: str = ""
+    exported: bool = False
+
+
+@dataclass(frozen=True)
+class Call:
+    """one call site: caller is the dotted name of the enclosing def or
+    class ("" at module level), callee the name being called."""
+    caller: str
+    callee: str
+    file: str
+    line: int
+
+
+@dataclass
+class _Views:
+    defs: dict          # name -> [Definition]
+    names: list         # sorted definition names, for prefix lookups
+    words: dict         # word -> [rel]
+    callers: dict       # callee -> [Call]
+    callees: dict       # caller -> [Call]
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
+
+def _language(ext: str) -> str:
+    return "python" if ext == ".py" else LANG_MAP.get(ext, "")
+
+
+def _python_symbols(text: str) -> tuple[list, list, list]:
+    """(defs, calls, imports) for one python file. defs come in ast.walk
+    order, as [name, kind, line, col, parent, signature, exported].
+    imports are dotted module names, also in ast.walk order."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return _python_regex_defs(text), [], []
+
+    # one breadth-first pass, the order ast.walk visits in. each node
+    # carries the dotted name of the def or class it sits in and the
+    # outermost class around it, which is a method's parent.
+    defs, calls, imports = [], [], []
+    queue: deque[tuple[ast.AST, str, str]] = deque([(tree, "", "")])
+    while queue:
+        node, scope, owner = queue.popleft()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            defs.append([node.name, "method" if owner else "function",
+                         node.lineno, node.col_offset, owner, "", False])
+        elif isinstance(node, ast.ClassDef):
+            defs.append([node.name, "class", node.lineno, node.col_offset, "", "", False])
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    defs.append([target.id, "variable", node.lineno, node.col_offset, "", "", False])
+        elif isinstance(node, ast.Call):
+            callee = _callee(node.func)
+            if callee:
+                calls.append([scope, callee, node.lineno])
+        elif isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append(node.module)
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            scope = f"{scope}.{node.name}" if scope else node.name
+            if isinstance(node, ast.ClassDef) and not owner:
+                owner = node.name
+        for child in ast.iter_child_nodes(node):
+            queue.append((child, scope, owner))
+    calls.sort(key=lambda c: c[2])
+    return defs, calls, imports
+
+
+def _callee(func) -> Optional[str]:
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _python_regex_defs(text: str) -> list:
+    """definitions in a file ast can't parse, line by line."""
+    defs = []
+    for i, line in enumerate(text.split("\n"), 1):
+        for pattern, kind in _PY_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                defs.append([match.group(1), kind, i, 0, "", "", False])
+    return defs
+
+
+def _polyglot_defs(text: str, language: str) -> list:
+    return [[s.name, s.kind, s.line, 0, "", s.signature, s.exported]
+            for s in symbols_in(text, "", language)]
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+class SymbolIndex:
+    """the symbol index for one project root, kept current on every query."""
+
+    def __init__(self, root: str | Path, directory: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self._directory = Path(directory) if directory else None
+        self._files: dict = {}      # rel -> entry, payload fields filled lazily
+        self._loaded = False        # _files read from disk yet
+        self._db: Optional[sqlite3.Connection] = None
+        self._views: Optional[_Views] = None
+        self._lock = threading.Lock()
+        self.parsed = 0     # files (re)parsed, for diagnostics
+
+    @property
+    def path(self) -> Path:
+        digest = hashlib.sha256(str(self.root).encode()).hexdigest()[:16]
+        return (self._directory or _INDEX_DIR) / f"{digest}.sqlite3"
+
+    def refresh(self):
+        """re-read files whose size or mtime moved, re-parse the ones whose
+        content hash moved, drop the ones that are gone."""
+        with self._lock:
+            if not self._loaded:
+                self._files, self._loaded = self._load(), True
+            started = time.time_ns()
+            files, parsed, stamped = {}, [], []
+            for info in inventory(self.root).files(exts=INDEXED_EXTS):
+                entry = self._files.get(info.rel)
+                try:
+                    st = os.stat(info.path)
+                except OSError:
+                    continue
+                if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                    fresh = self._index_file(info.path, info.ext, st, entry, started)
+                    if fresh is None:
+                        continue
+                    if entry is None or fresh["hash"] != entry["hash"]:
+                        parsed.append(info.rel)
+                    elif fresh != entry:
+                        stamped.append(info.rel)
+                    entry = fresh
+                files[info.rel] = entry
+            removed = self._files.keys() - files.keys()
+            self._files = files
+            if parsed or removed:
+                self._views = None
+            if parsed or stamped or removed:
+                self._save(parsed, stamped, removed)
+
+    def _index_file(self, path: str, ext: str, st, entry: Optional[dict],
+                    started: int) -> Optional[dict]:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        trusted = st.st_mtime_ns < started - _RACY_NS
+        stamp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns if trusted else None}
+        if entry is not None and entry["hash"] == digest:
+            return {**entry, **stamp}
+
+        self.parsed += 1
+        language = _language(ext)
+        text = data.decode("utf-8", errors="replace")
+        if language == "python":
+            defs, calls, imports = _python_symbols(text)
+        else:
+            defs, calls, imports = _polyglot_defs(text, language), [], []
+        return {"hash": digest, **stamp, "lang": language, "defs": defs,
+                "words": sorted(set(_WORD_RE.findall(text))), "calls": calls,
+                "imports": imports}
+
+    # -- storage --
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """the database, created or reset to this version and root. None
+        when it can't be opened: the index then lives in memory only."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            with db:
+                db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                db.execute("CREATE TABLE IF NOT EXISTS files (rel TEXT PRIMARY KEY, hash TEXT,"
+                           " size INTEGER, mtime_ns INTEGER, lang TEXT,"
+                           " defs TEXT, calls TEXT, imports TEXT, words TEXT)")
+                meta = dict(db.execute("SELECT key, value FROM meta"))
+                if meta != {"version": str(_VERSION), "root": str(self.root)}:
+                    db.execute("DELETE FROM files")
+                    db.execute("DELETE FROM meta")
+                    db.executemany("INSERT INTO meta VALUES (?, ?)",
+                                   [("version", str(_VERSION)), ("root", str(self.root))])
+        except (OSError, sqlite3.Error):
+            return None
+        # the single-file JSON index this replaced
+        self.path.with_suffix(".json").unlink(missing_ok=True)
+        return db
+
+    def _load(self) -> dict:
+        """every file's stamp and language. the rest waits for _fill."""
+        self._db = self._connect()
+        if self._db is None:
+            return {}
+        try:
+            rows = self._db.execute("SELECT rel, hash, size, mtime_ns, lang FROM files").fetchall()
+        except sqlite3.Error:
+            return {}
+        return {rel: {"hash": digest, "size": size, "mtime_ns": mtime_ns, "lang": lang}
+                for rel, digest, size, mtime_ns, lang in rows}
+
+    def _save(self, parsed, stamped, removed):
+        """write back only the rows that moved. best effort: the index is
+        a cache, a read-only home only makes the next process build it
+        again."""
+        if self._db is None:
+            return
+        files = self._files
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(rel, files[rel]["hash"], files[rel]["size"], files[rel]["mtime_ns"],
+                      files[rel]["lang"], *(json.dumps(files[rel][k]) for k in _PAYLOAD))
+                     for rel in parsed])
+                self._db.executemany(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE rel = ?",
+                    [(files[rel]["size"], files[rel]["mtime_ns"], rel) for rel in stamped])
+                self._db.executemany("DELETE FROM files WHERE rel = ?", [(rel,) for rel in removed])
+        except sqlite3.Error:
+            pass
+
+    def _fill(self, fields: tuple, rels):
+        """read fields for the entries in rels that don't hold them yet.
+        a row that went missing or moved under us is parsed again."""
+        missing = {rel for rel in rels if fields[0] not in self._files[rel]}
+        if not missing:
+            return
+        rows = {}
+        if self._db is not None:
+            try:
+                cursor = self._db.execute(f"SELECT rel, hash, {', '.join(fields)} FROM files")
+                rows = {row[0]: row[1:] for row in cursor if row[0] in missing}
+            except sqlite3.Error:
+                pass
+        reparsed = []
+        for rel in sorted(missing):
+            entry, row = self._files[rel], rows.get(rel)
+            if row is not None and row[0] == entry["hash"]:
+                entry.update(zip(fields, map(json.loads, row[1:])))
+                continue
+            path = self.root / rel
+            try:
+                fresh = self._index_file(str(path), path.suffix, os.stat(path), None, time.time_ns())
+            except OSError:
+                fresh = None
+            if fresh is None:
+                del self._files[rel]
+            else:
+                self._files[rel] = fresh
+                reparsed.append(rel)
+        if reparsed:
+            self._save(reparsed, [], [])
+
+    def _view(self) -> _Views:
+        self.refresh()
+        with self._lock:
+            if self._views is None:
+                self._fill(("defs", "calls", "words"), list(self._files))
+                self._views = self._build_views()
+            return self._views
+
+    def _build_views(self) -> _Views:
+        defs, words, callers, callees = {}, {}, {}, {}
+        for rel in sorted(self._files):
+            entry = self._files[rel]
+            language = entry["lang"]
+            for name, kind, line, col, parent, signature, exported in entry["defs"]:
+                defs.setdefault(name, []).append(Definition(
+                    name, kind, rel, line, col, parent, language, signature, exported))
+            for word in entry["words"]:
+                words.setdefault(word, []).append(rel)
+            for caller, callee, line in entry["calls"]:
+                call = Call(caller, callee, rel, line)
+                callers.setdefault(callee, []).append(call)
+                callees.setdefault(caller, []).append(call)
+        return _Views(defs, sorted(defs), words, callers, callees)
+
+    # -- queries --
+
+    def definitions(self, name: str, prefix: bool = False,
+                    languages: Optional[set] = None) -> list[Definition]:
+        """definitions named name, or whose name starts with it. sorted
+        by file, then in the order the file defines them."""
+        views = self._view()
+        if prefix:
+            start = bisect.bisect_left(views.names, name)
+            found = []
+            for n in views.names[start:]:
+                if not n.startswith(name):
+                    break
+                found.extend(views.defs[n])
+            found.sort(key=lambda d: d.file)
+        else:
+            found = list(views.defs.get(name, []))
+        if languages is not None:
+            found = [d for d in found if d.language in languages]
+        return found
+
+    def files_with_word(self, word: str, languages: Optional[set] = None) -> list[str]:
+        """files where word appears as a whole word. sorted."""
+        views = self._view()
+        return self._only(views.words.get(word, []), languages)
+
+    def files_containing(self, text: str, languages: Optional[set] = None) -> list[str]:
+        """files that might contain text as a substring: each of its words
+        is inside some word of the file. a superset, never a miss. sorted."""
+        views = self._view()
+        found = None
+        for piece in set(_WORD_RE.findall(text)):
+            files = set()
+            for word, rels in views.words.items():
+                if piece in word:
+                    files.update(rels)
+            found = files if found is None else found & files
+        if found is None:   # nothing word-like to look for
+            found = self._files.keys()
+        return self._only(sorted(found), languages)
+
+    def callers(self, name: str) -> list[Call]:
+        """call sites that call name, by file and line."""
+        return list(self._view().callers.get(name, []))
+
+    def callees(self, caller: str) -> list[Call]:
+        """calls made directly inside caller (a dotted name like
+        "Class.method"), by file and line."""
+        return list(self._view().callees.get(caller, []))
+
+    def imports(self) -> dict[str, tuple[str, list[str]]]:
+        """every python file -> (content hash, modules it imports)."""
+        self.refresh()
+        with self._lock:
+            python = [rel for rel, entry in self._files.items() if entry["lang"] == "python"]
+            self._fill(("imports",), python)
+            return {rel: (self._files[rel]["hash"], self._files[rel]["imports"])
+                    for rel in python if rel in self._files}
+
+    def _only(self, rels, languages: Optional[set]) -> list[str]:
+        if languages is None:
+            return list(rels)
+        files = self._files
+        return [r for r in rels if r in files and files[r]["lang"] in languages]
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._files)
+
+
+_indexes: dict[Path, SymbolIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def symbol_index(root: str | Path = ".") -> SymbolIndex:
+    """the process-wide symbol index for a project root."""
+    key = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SymbolIndex(key)
+        return index
@@ -881,6 +881,9 @@ def cmd_symbols(args):
     elif args.refs:
         results = find_references(name, root)
         label = "References to"
+    elif args.prefix:
+        results = find_definition(name, root, prefix=True)
+        label = "Definitions starting with"
     else:
         results = find_definition(name, root)
         label = "Definitions of"
@@ -915,6 +918,18 @@ def cmd_deps(args):
         print()
         return
 
+    if args.affected:
+        from keanu.analysis.deps import affected_files
+        affected = affected_files([args.affected], root)
+        if affected:
+            print(f"\n  Files affected by a change to {args.affected} ({len(affected)}):\n")
+            for f in affected:
+                print(f"    {f}")
+        else:
+            print(f"\n  Nothing depends on {args.affected}")
+        print()
+        return
+
     s = dep_stats(root)
     print(f"\n  DEPENDENCY GRAPH\n")
     print(f"  files:      {s['files']}")
@@ -1234,7 +1249,7 @@ def cmd_ci(args):
 def cmd_security(args):
     """Security scanning: secrets, dependencies, audit."""
     from keanu.abilities.world.security import (
-        scan_secrets, check_secrets_in_staged,
+        iter_secrets, check_secrets_in_staged,
         check_gitignore_coverage, scan_dependencies,
         get_audit_log,
     )
@@ -1274,11 +1289,15 @@ def cmd_security(args):
         else:
             print("\n  No secrets in staged files.\n")
     else:
-        findings = scan_secrets(args.root or ".")
-        if findings:
-            print(f"\n  Secrets found ({len(findings)}):\n")
-            for f in findings:
-                print(f"    [{f.category}] {f.file}:{f.line} {f.snippet[:60]}")
+        # stream findings as the scan goes, a big tree takes a while
+        count = 0
+        for f in iter_secrets(args.root or "."):
+            if not count:
+                print("\n  Secrets found:\n")
+            count += 1
+            print(f"    [{f.category}] {f.file}:{f.line} {f.snippet[:60]}")
+        if count:
+            print(f"\n  {count} secrets found.")
         else:
             print("\n  No secrets detected.\n")
     print()
@@ -1382,7 +1401,7 @@ def cmd_rag(args):
     if args.update:
         print(f"\n  Updating RAG index for {args.root}...")
         stats = incremental_index(args.root)
-        print(f"  Updated: {stats.total_files} files, {stats.total_chunks} new chunks\n")
+        print(f"  Updated: {stats.total_files} files, {stats.total_chunks} chunks\n")
         return
     if args.search:
         results = search(args.search, args.root, n_results=args.n)
@@ -1794,12 +1813,14 @@ def _build_parsers(subparsers):
     p.add_argument("--root", default="", help="Project root (default: cwd)")
     p.add_argument("--refs", action="store_true", help="Find references instead of definitions")
     p.add_argument("--callers", action="store_true", help="Find callers of a function")
+    p.add_argument("--prefix", action="store_true", help="Find definitions whose name starts with NAME")
     p.add_argument("--list", dest="list_file", default="", help="List all symbols in a file")
     p.set_defaults(func=cmd_symbols)
 
     p = subparsers.add_parser("deps", help="Dependency graph stats")
     p.add_argument("--root", default="", help="Project root (default: cwd)")
     p.add_argument("--who", default="", help="Who imports this file?")
+    p.add_argument("--affected", default="", help="What might break if this file changes?")
     p.set_defaults(func=cmd_deps)
 
     p = subparsers.add_parser("suggest", help="Proactive code suggestions")
@@ -1933,10 +1954,11 @@ def main():
 
     try:
         from keanu.memory import GitStore
-        from keanu.log import set_sink
+        from keanu.log import set_sink, BatchSink
         ledger = GitStore(namespace="keanu")
-        set_sink(ledger.append_log, flush_fn=ledger.flush)
-        atexit.register(ledger.flush)
+        sink = BatchSink(ledger.append_logs, flush_fn=lambda: ledger.flush(wait=False))
+        set_sink(sink, flush_fn=sink.flush)
+        atexit.register(sink.flush)
     except Exception:
         pass
 
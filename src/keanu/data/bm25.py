@@ -0,0 +1,209 @@
+"""bm25.py - on-disk inverted index with BM25 ranking.
+
+documents are grouped (rag groups them by file) so one group can be
+replaced or dropped without touching the rest. postings are split into
+shards by term, so a query only reads the shards its own terms live in.
+
+in the world: the index at the back of the book. look up the word,
+get the pages, and only then open the book.
+
+layout:
+    docs.json        {"docs": {id: {...fields, "len": n}},
+                      "groups": {group: {"ids": [...], "terms": [...]}},
+                      "total_len": n}
+    postings-NN.json {term: {id: term frequency}}
+"""
+
+import heapq
+import json
+import math
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from keanu.io import write_json
+
+
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    """lowercase terms for code and prose.
+
+    identifiers are kept whole and also split on underscores and camel
+    humps, so "hello" finds hello_world and "parse" finds parseConfig.
+    """
+    terms = []
+    for ident in _IDENT_RE.findall(text):
+        lower = ident.lower()
+        terms.append(lower)
+        parts = [p.lower() for piece in ident.split("_") for p in _CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+class BM25Index:
+    """sharded BM25 index in a directory. load is lazy, save writes only
+    the shards that changed."""
+
+    SHARDS = 64
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._docs: dict = {}       # id -> fields + "len"
+        self._groups: dict = {}     # group -> {"ids": [...], "terms": [...]}
+        self._loaded = False        # docs.json read yet
+        self._total_len = 0
+        self._shards = {}   # shard number -> {term: {id: tf}}
+        self._dirty = set()
+
+    @property
+    def docs_path(self) -> Path:
+        return self.directory / "docs.json"
+
+    def exists(self) -> bool:
+        return self.docs_path.exists()
+
+    def signature(self) -> tuple:
+        """(size, mtime_ns) of docs.json. save() always rewrites it, so a
+        cached index is current while this matches."""
+        try:
+            st = self.docs_path.stat()
+        except OSError:
+            return (0, 0)
+        return (st.st_size, st.st_mtime_ns)
+
+    def __len__(self) -> int:
+        self._load_docs()
+        return len(self._docs)
+
+    # -- loading --
+
+    def _load_docs(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        data = _read(self.docs_path) or {}
+        self._docs = data.get("docs", {})
+        self._groups = data.get("groups", {})
+        self._total_len = data.get("total_len", 0)
+
+    def _shard_of(self, term: str) -> int:
+        return zlib.crc32(term.encode()) % self.SHARDS
+
+    def _shard(self, n: int) -> dict:
+        if n not in self._shards:
+            self._shards[n] = _read(self.directory / f"postings-{n:02d}.json") or {}
+        return self._shards[n]
+
+    # -- writing --
+
+    def clear(self):
+        """drop everything. the next save() rewrites every shard."""
+        self._docs, self._groups, self._total_len = {}, {}, 0
+        self._loaded = True
+        self._shards = {n: {} for n in range(self.SHARDS)}
+        self._dirty = set(range(self.SHARDS))
+
+    def remove(self, group: str):
+        """drop every document in a group. only the postings of the terms
+        the group used are touched."""
+        self._load_docs()
+        old = self._groups.pop(group, None)
+        if not old:
+            return
+        ids = set(old["ids"])
+        if "terms" in old:
+            by_shard = {}
+            for term in old["terms"]:
+                by_shard.setdefault(self._shard_of(term), []).append(term)
+        else:   # written before groups kept their terms
+            by_shard = {n: list(self._shard(n)) for n in old["shards"]}
+        for n, terms in by_shard.items():
+            shard = self._shard(n)
+            for term in terms:
+                posting = shard.get(term)
+                if posting is None or ids.isdisjoint(posting):
+                    continue
+                posting = {d: tf for d, tf in posting.items() if d not in ids}
+                if posting:
+                    shard[term] = posting
+                else:
+                    del shard[term]
+            self._dirty.add(n)
+        for doc_id in ids:
+            doc = self._docs.pop(doc_id, None)
+            if doc:
+                self._total_len -= doc["len"]
+
+    def replace(self, group: str, docs: list[tuple[str, str, dict]]):
+        """swap a group's documents for docs: (id, text, fields) triples.
+        fields come back with search hits."""
+        self.remove(group)
+        if not docs:
+            return
+        terms, shards = set(), set()
+        for doc_id, text, fields in docs:
+            counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            self._docs[doc_id] = {**fields, "len": length}
+            self._total_len += length
+            for term, tf in counts.items():
+                n = self._shard_of(term)
+                self._shard(n).setdefault(term, {})[doc_id] = tf
+                terms.add(term)
+                shards.add(n)
+        self._groups[group] = {"ids": [d[0] for d in docs], "terms": sorted(terms)}
+        self._dirty |= shards
+
+    def save(self):
+        self._load_docs()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for n in sorted(self._dirty):
+            write_json(self.directory / f"postings-{n:02d}.json", self._shards.get(n, {}), indent=None)
+        self._dirty = set()
+        # docs.json last: its signature is what readers trust
+        write_json(self.docs_path, {"docs": self._docs, "groups": self._groups,
+                                    "total_len": self._total_len}, indent=None)
+
+    # -- reading --
+
+    def groups(self) -> list[str]:
+        self._load_docs()
+        return list(self._groups)
+
+    def search(self, query: str, k: int = 10) -> list[tuple[str, float, dict]]:
+        """top k (id, score, fields) by BM25, best first."""
+        self._load_docs()
+        n_docs = len(self._docs)
+        terms = set(tokenize(query))
+        if not n_docs or not terms or k <= 0:
+            return []
+
+        avgdl = self._total_len / n_docs or 1.0
+        scores = {}
+        for term in terms:
+            posting = self._shard(self._shard_of(term)).get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = self.K1 * (1 - self.B + self.B * self._docs[doc_id]["len"] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1], kv[0]))
+        return [(doc_id, score, {f: v for f, v in self._docs[doc_id].items() if f != "len"})
+                for doc_id, score in top]
+
+
+def _read(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
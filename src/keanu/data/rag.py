@@ -13,10 +13,17 @@ import json
 import os
 import re
 import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from keanu.data.bm25 import BM25Index
+from keanu.io import atomic_open, write_json
 from keanu.paths import keanu_home
+from keanu.tools.cache import file_cache
+from keanu.tools.inventory import inventory
 
 
 _RAG_DIR = keanu_home() / "rag"
@@ -95,11 +102,28 @@ def chunk_file(path: str, max_chunk_lines: int = 50) -> list[Chunk]:
     uses logical boundaries: functions, classes, markdown headers.
     falls back to fixed-size chunks for unstructured text.
     """
+    content = _read_text(path)
+    if content is None:
+        return []
+    return _chunk_text(path, content, max_chunk_lines)
+
+
+def _read_text(path: str) -> str | None:
+    """a file's text through the shared file cache. files that aren't
+    utf-8 are read with replacement characters and not cached."""
     try:
-        content = Path(path).read_text(errors="replace")
+        return file_cache.read(path)
+    except UnicodeDecodeError:
+        pass
     except OSError:
-        return []
+        return None
+    try:
+        return Path(path).read_text(errors="replace")
+    except OSError:
+        return None
 
+
+def _chunk_text(path: str, content: str, max_chunk_lines: int) -> list[Chunk]:
     lines = content.split("\n")
     ext = Path(path).suffix.lower()
 
@@ -244,29 +268,29 @@ def _chunk_fixed(path: str, lines: list[str], max_lines: int) -> list[Chunk]:
 def discover_files(root: str, extensions: set[str] = None,
                    skip: set[str] = None) -> list[str]:
     """discover indexable files in a project."""
-    root_path = Path(root)
+    return sorted(path for path, _ in _walk_files(root, extensions, skip))
+
+
+def _walk_files(root: str, extensions: set[str] = None, skip: set[str] = None):
+    """yield (path, stat) for indexable files, from the project inventory,
+    so gitignored files stay out of the index too."""
     exts = extensions or TEXT_EXTENSIONS
     skip_dirs = skip or SKIP_PATTERNS
 
-    files = []
-    for path in root_path.rglob("*"):
-        if not path.is_file():
-            continue
-
-        # skip directories
-        parts = set(path.parts)
-        if parts & skip_dirs:
+    for info in inventory(root).files():
+        if not skip_dirs.isdisjoint(info.rel.split("/")):
             continue
-
         # skip by extension
-        if path.suffix.lower() in SKIP_EXTENSIONS:
+        if info.ext in SKIP_EXTENSIONS:
             continue
-
         # only include known text extensions (or no extension for Makefile etc)
-        if path.suffix.lower() in exts or path.name.lower() in {"makefile", "dockerfile", "rakefile"}:
-            files.append(str(path))
-
-    return sorted(files)
+        if info.ext in exts or info.name.lower() in {"makefile", "dockerfile", "rakefile"}:
+            path = os.path.join(root, info.rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield path, st
 
 
 def file_hash(path: str) -> str:
@@ -282,91 +306,256 @@ def file_hash(path: str) -> str:
 # INDEX
 # ============================================================
 
-def build_index(root: str, max_chunk_lines: int = 50) -> IndexStats:
+FILE_BATCH = 256          # files chunked per batch; bounds memory in flight
+_PARALLEL_MIN_FILES = 32  # below this a process pool costs more than it saves
+
+
+def build_index(root: str, max_chunk_lines: int = 50, workers: int | None = None) -> IndexStats:
     """build a full RAG index for a project.
 
     chunks all files and stores them. returns stats.
     uses chromadb if available, falls back to JSON.
     """
     files = discover_files(root)
-    all_chunks = []
-
-    for f in files:
-        chunks = chunk_file(f, max_chunk_lines)
-        all_chunks.extend(chunks)
-
-    # try chromadb first
-    stored = _store_chromadb(all_chunks, root)
-    if not stored:
-        _store_json(all_chunks, root)
+    try:
+        manifest, backend = _rebuild(root, files, max_chunk_lines, workers, backend=None)
+    except _BackendLost:
+        # chromadb already holds part of this build: start over in JSON
+        # rather than split the chunks across two stores
+        manifest, backend = _rebuild(root, files, max_chunk_lines, workers, backend="json")
 
     # save metadata
     meta = {
         "root": root,
-        "files": len(files),
-        "chunks": len(all_chunks),
         "indexed_at": time.time(),
-        "file_hashes": {f: file_hash(f) for f in files},
+        "backend": backend,
+        "manifest": manifest,
     }
     _save_meta(meta)
 
     return IndexStats(
         total_files=len(files),
-        total_chunks=len(all_chunks),
-        indexed_at=time.time(),
+        total_chunks=meta["chunks"],
+        indexed_at=meta["indexed_at"],
         root=root,
     )
 
 
-def incremental_index(root: str, max_chunk_lines: int = 50) -> IndexStats:
-    """incrementally update the index. only re-index changed files."""
+def incremental_index(root: str, max_chunk_lines: int = 50,
+                      workers: int | None = None) -> IndexStats:
+    """incrementally update the index. only re-index changed files.
+
+    a file whose size and mtime match the last run is taken as unchanged
+    without reading it. the rest are hashed, and only the ones whose
+    content really moved get chunked. a changed file's old chunks are
+    deleted by id before its new ones go in; a deleted file's chunks are
+    pruned.
+    """
     meta = _load_meta()
-    old_hashes = meta.get("file_hashes", {})
+    if "manifest" not in meta:
+        # indexed before chunk ids were tracked: nothing to diff against
+        return build_index(root, max_chunk_lines, workers)
+    manifest = meta["manifest"]
 
-    files = discover_files(root)
+    seen = set()
     changed = []
-    for f in files:
-        h = file_hash(f)
-        if h != old_hashes.get(f, ""):
-            changed.append(f)
+    touched = False
+    for path, st in sorted(_walk_files(root)):
+        seen.add(path)
+        entry = manifest.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            continue
+        h = file_hash(path)
+        if entry and entry["hash"] == h:
+            # touched but identical: remember the new stat so the next
+            # run skips it without hashing
+            entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+            touched = True
+            continue
+        changed.append(path)
+    deleted = [path for path in manifest if path not in seen]
 
-    if not changed:
+    if not changed and not deleted:
+        if touched:
+            meta["manifest"] = manifest
+            _save_meta(meta)
         return IndexStats(
-            total_files=len(files),
+            total_files=len(manifest),
             total_chunks=meta.get("chunks", 0),
             indexed_at=meta.get("indexed_at", 0),
             root=root,
         )
 
-    # re-chunk changed files
-    new_chunks = []
-    for f in changed:
-        chunks = chunk_file(f, max_chunk_lines)
-        new_chunks.extend(chunks)
-
-    # update store
-    stored = _store_chromadb(new_chunks, root, incremental=True)
-    if not stored:
-        _store_json(new_chunks, root, incremental=True)
+    sink = _ChunkSink(root, backend=meta["backend"])
+    try:
+        for path in deleted:
+            sink.remove(path, manifest.pop(path)["chunks"])
+        for path, size, mtime_ns, digest, chunks in _chunk_files(changed, max_chunk_lines, workers):
+            old = manifest.get(path)
+            sink.add(path, chunks, old_ids=old["chunks"] if old else [])
+            manifest[path] = _manifest_entry(size, mtime_ns, digest, chunks)
+        meta["backend"] = sink.close()
+    except _BackendLost:
+        # the unchanged files' chunks only live in chromadb, so a JSON
+        # store of just the changed ones would lose them: rebuild in JSON
+        return build_index(root, max_chunk_lines, workers)
 
     # update metadata
-    for f in changed:
-        old_hashes[f] = file_hash(f)
-    meta["file_hashes"] = old_hashes
+    meta["manifest"] = manifest
     meta["indexed_at"] = time.time()
-    meta["files"] = len(files)
-    # approximate total chunks
-    meta["chunks"] = meta.get("chunks", 0) + len(new_chunks)
     _save_meta(meta)
 
     return IndexStats(
-        total_files=len(files),
-        total_chunks=len(new_chunks),
-        indexed_at=time.time(),
+        total_files=len(manifest),
+        total_chunks=meta["chunks"],
+        indexed_at=meta["indexed_at"],
         root=root,
     )
 
 
+def _manifest_entry(size: int, mtime_ns: int, digest: str, chunks: list[Chunk]) -> dict:
+    return {"size": size, "mtime_ns": mtime_ns, "hash": digest, "chunks": [c.id for c in chunks]}
+
+
+def _chunk_one(args: tuple) -> tuple:
+    """read a file once: stat, hash and chunks from the same bytes.
+    top-level so a process pool can pickle it."""
+    path, max_chunk_lines = args
+    try:
+        st = os.stat(path)
+        data = Path(path).read_bytes()
+    except OSError:
+        return path, 0, 0, "", []
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    # same text read_text(errors="replace") gives, universal newlines included
+    content = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    return path, st.st_size, st.st_mtime_ns, digest, _chunk_text(path, content, max_chunk_lines)
+
+
+def _chunk_files(files: list[str], max_chunk_lines: int, workers: int | None = None):
+    """yield (path, size, mtime_ns, hash, chunks) per file, in order.
+
+    big runs fan out over a process pool a batch at a time, so only one
+    batch of chunks is ever held in memory.
+    """
+    jobs = [(f, max_chunk_lines) for f in files]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) < _PARALLEL_MIN_FILES:
+        for job in jobs:
+            yield _chunk_one(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(jobs), FILE_BATCH):
+            batch = jobs[start:start + FILE_BATCH]
+            yield from pool.map(_chunk_one, batch, chunksize=max(1, len(batch) // (workers * 4)))
+
+
+def _rebuild(root: str, files: list[str], max_chunk_lines: int, workers: int | None,
+             backend: str | None) -> tuple[dict, str]:
+    """chunk and store every file from scratch. returns (manifest, backend)."""
+    manifest = {}
+    sink = _ChunkSink(root, backend=backend, rebuild=True)
+    for path, size, mtime_ns, digest, chunks in _chunk_files(files, max_chunk_lines, workers):
+        manifest[path] = _manifest_entry(size, mtime_ns, digest, chunks)
+        sink.add(path, chunks)
+    return manifest, sink.close()
+
+
+class _BackendLost(Exception):
+    """chromadb failed after it had already taken part of a build."""
+
+
+class _ChunkSink:
+    """where chunks go as a build streams them: chromadb when it works,
+    chunks.json otherwise, and the keyword index either way.
+
+    add() takes one file's chunks plus the ids it had before, remove()
+    drops a file. stale ids are deleted from chromadb right before the
+    batch that replaces them is upserted. close() flushes and returns
+    the backend that ended up holding the chunks.
+
+    a rebuild with backend=None settles the backend with its first batch,
+    the same all-or-nothing try the one-shot store used to make. if
+    chromadb fails once it holds chunks from this run, _flush raises
+    _BackendLost instead of sending the rest somewhere else. a failed
+    delete of stale ids counts as a failure too.
+    """
+
+    def __init__(self, root: str, backend: str | None, rebuild: bool = False):
+        self.root = root
+        self.rebuild = rebuild or backend is None
+        self._chromadb = None if backend is None else backend == "chromadb"
+        self._pending = []
+        self._pending_files = 0
+        self._stale_ids = set()
+        self._replaced = set()      # files whose JSON chunks get dropped
+        self._json = None
+        self._json_empty = True
+        self._open = ExitStack()    # holds chunks.json open across batches
+
+        keyword = None if self.rebuild else _keyword_index()
+        if keyword is None:
+            keyword = BM25Index(_keyword_dir())
+            keyword.clear()
+        self._keyword = keyword
+
+    def add(self, path: str, chunks: list[Chunk], old_ids: Iterable[str] = ()):
+        self._keyword.replace(path, [(c.id, c.content, _chunk_fields(c.__dict__)) for c in chunks])
+        self._mark_stale(path, old_ids, {c.id for c in chunks})
+        self._pending.extend(chunks)
+        self._pending_files += 1
+        # an incremental JSON store rewrites chunks.json, so it waits for close()
+        if self._pending_files >= FILE_BATCH and (self._chromadb is not False or self.rebuild):
+            self._flush()
+
+    def remove(self, path: str, old_ids: list[str]):
+        self._keyword.remove(path)
+        self._mark_stale(path, old_ids, set())
+
+    def _mark_stale(self, path, old_ids, keep):
+        if self.rebuild:
+            return
+        self._replaced.add(path)
+        self._stale_ids.update(i for i in old_ids if i not in keep)
+
+    def _flush(self):
+        chunks, self._pending, self._pending_files = self._pending, [], 0
+        if self._chromadb is None:
+            self._chromadb = _store_chromadb(chunks, self.root)
+            if self._chromadb:
+                return
+        elif self._chromadb:
+            # a failed delete strands chunks the manifest no longer tracks
+            if _delete_chromadb(self._stale_ids) and _store_chromadb(chunks, self.root, incremental=True):
+                self._stale_ids = set()
+                return
+            raise _BackendLost()
+
+        if not self.rebuild:
+            _store_json(chunks, self.root, incremental=True, replaced_files=self._replaced)
+            return
+        if self._json is None:
+            self._json = self._open.enter_context(atomic_open(_RAG_DIR / "chunks.json"))
+            self._json.write("[")
+        for c in chunks:
+            if not self._json_empty:
+                self._json.write(",")
+            self._json.write(json.dumps(_chunk_dict(c)))
+            self._json_empty = False
+
+    def close(self) -> str:
+        if self._pending or self._replaced or (self.rebuild and not self._chromadb
+                                               and self._json is None):
+            self._flush()
+        if self._json is not None:
+            self._json.write("]")
+            self._open.close()
+        self._keyword.save()
+        _keyword_cache[str(_keyword_dir())] = (self._keyword.signature(), self._keyword)
+        return "chromadb" if self._chromadb else "json"
+
+
 # ============================================================
 # SEARCH
 # ============================================================
@@ -381,31 +570,40 @@ def search(query: str, root: str = "", n_results: int = 5) -> list[SearchResult]
 
 
 def keyword_search(query: str, root: str = "", n_results: int = 10) -> list[SearchResult]:
-    """pure keyword search across indexed chunks."""
-    chunks = _load_json_chunks()
-    if not chunks:
-        return []
+    """keyword search across indexed chunks, ranked by BM25.
 
-    query_words = set(query.lower().split())
-    scored = []
+    scores are scaled so the best hit is 1.0. chunk bodies are only read
+    for the hits that come back.
+    """
+    index = _keyword_index()
+    if index is None:
+        return []
 
-    for chunk_data in chunks:
-        content_lower = chunk_data["content"].lower()
-        matches = sum(1 for w in query_words if w in content_lower)
-        if matches > 0:
-            score = matches / len(query_words)
-            chunk = Chunk(
-                file_path=chunk_data["file_path"],
-                content=chunk_data["content"],
-                start_line=chunk_data["start_line"],
-                end_line=chunk_data["end_line"],
-                chunk_type=chunk_data.get("chunk_type", "code"),
-                hash=chunk_data.get("hash", ""),
-            )
-            scored.append(SearchResult(chunk=chunk, score=score, source="keyword"))
+    hits = index.search(query, n_results)
+    if not hits:
+        return []
 
-    scored.sort(key=lambda r: -r.score)
-    return scored[:n_results]
+    best = hits[0][1]
+    results = []
+    fallback = None
+    for chunk_id, score, fields in hits:
+        content = _chunk_body(fields)
+        if content is None:
+            if fallback is None:
+                fallback = {_chunk_dict_id(c): c["content"] for c in _load_json_chunks()}
+            content = fallback.get(chunk_id)
+            if content is None:
+                continue
+        chunk = Chunk(
+            file_path=fields["file_path"],
+            content=content,
+            start_line=fields["start_line"],
+            end_line=fields["end_line"],
+            chunk_type=fields.get("chunk_type", "code"),
+            hash=fields.get("hash", ""),
+        )
+        results.append(SearchResult(chunk=chunk, score=score / best, source="keyword"))
+    return results
 
 
 def hybrid_search(query: str, root: str = "", n_results: int = 5) -> list[SearchResult]:
@@ -482,6 +680,26 @@ def _store_chromadb(chunks: list[Chunk], root: str,
         return False
 
 
+def _delete_chromadb(ids: set[str]) -> bool:
+    """delete chunks by id."""
+    if not ids:
+        return True
+    try:
+        import chromadb
+    except ImportError:
+        return False
+
+    try:
+        client = chromadb.PersistentClient(path=str(_RAG_DIR / "chroma"))
+        collection = client.get_collection("keanu_rag")
+        ordered = sorted(ids)
+        for i in range(0, len(ordered), 1000):
+            collection.delete(ids=ordered[i:i + 1000])
+        return True
+    except Exception:
+        return False
+
+
 def _search_chromadb(query: str, n_results: int) -> list[SearchResult]:
     """search chunks via chromadb."""
     try:
@@ -526,8 +744,13 @@ def _search_chromadb(query: str, n_results: int) -> list[SearchResult]:
         return []
 
 
-def _store_json(chunks: list[Chunk], root: str, incremental: bool = False) -> bool:
-    """fallback: store chunks as JSON."""
+def _store_json(chunks: list[Chunk], root: str, incremental: bool = False,
+                replaced_files: set[str] = None) -> bool:
+    """fallback: store chunks as JSON.
+
+    incremental keeps what's there except chunks from replaced_files
+    (default: the files chunks come from).
+    """
     json_path = _RAG_DIR / "chunks.json"
     _RAG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -539,22 +762,26 @@ def _store_json(chunks: list[Chunk], root: str, incremental: bool = False) -> bo
             existing = []
 
     # for incremental, remove old chunks from changed files
-    if incremental and chunks:
-        changed_files = {c.file_path for c in chunks}
-        existing = [c for c in existing if c["file_path"] not in changed_files]
+    if incremental:
+        dropped = replaced_files if replaced_files is not None else {c.file_path for c in chunks}
+        existing = [c for c in existing if c["file_path"] not in dropped]
+
+    chunk_dicts = [_chunk_dict(c) for c in chunks]
+
+    all_chunks = existing + chunk_dicts
+    write_json(json_path, all_chunks, indent=None)
+    return True
 
-    chunk_dicts = [{
+
+def _chunk_dict(c: Chunk) -> dict:
+    return {
         "file_path": c.file_path,
         "content": c.content,
         "start_line": c.start_line,
         "end_line": c.end_line,
         "chunk_type": c.chunk_type,
         "hash": c.hash,
-    } for c in chunks]
-
-    all_chunks = existing + chunk_dicts
-    json_path.write_text(json.dumps(all_chunks))
-    return True
+    }
 
 
 def _load_json_chunks() -> list[dict]:
@@ -573,14 +800,85 @@ def _search_json(query: str, n_results: int) -> list[SearchResult]:
     return keyword_search(query, n_results=n_results)
 
 
+# ============================================================
+# KEYWORD INDEX
+# ============================================================
+
+_keyword_cache = {}  # index dir -> (signature, BM25Index)
+
+
+def _keyword_dir() -> Path:
+    return _RAG_DIR / "keyword"
+
+
+def _keyword_index() -> BM25Index | None:
+    """the BM25 index, reused across queries while it's unchanged on disk.
+
+    an index saved before the keyword index existed gets one built from
+    chunks.json on first use.
+    """
+    directory = _keyword_dir()
+    index = BM25Index(directory)
+    sig = index.signature()
+    cached = _keyword_cache.get(str(directory))
+    if cached and cached[0] == sig and sig != (0, 0):
+        return cached[1]
+
+    if not index.exists():
+        chunk_dicts = _load_json_chunks()
+        if not chunk_dicts:
+            return None
+        by_file = {}
+        for c in chunk_dicts:
+            by_file.setdefault(c["file_path"], []).append(c)
+        index.clear()
+        for path, group in by_file.items():
+            index.replace(path, [(_chunk_dict_id(c), c["content"], _chunk_fields(c)) for c in group])
+        index.save()
+        sig = index.signature()
+
+    _keyword_cache[str(directory)] = (sig, index)
+    return index
+
+
+def _chunk_fields(c: dict) -> dict:
+    return {
+        "file_path": c["file_path"],
+        "start_line": c["start_line"],
+        "end_line": c["end_line"],
+        "chunk_type": c.get("chunk_type", "code"),
+        "hash": c.get("hash", ""),
+    }
+
+
+def _chunk_dict_id(c: dict) -> str:
+    return f"{c['file_path']}:{c['start_line']}-{c['end_line']}:{c.get('hash', '')}"
+
+
+def _chunk_body(fields: dict) -> str | None:
+    """re-read a chunk from its source file. None if the file is gone or
+    the lines no longer hash to what was indexed."""
+    text = _read_text(fields["file_path"])
+    if text is None:
+        return None
+    lines = text.split("\n")
+    content = "\n".join(lines[fields["start_line"] - 1:fields["end_line"]])
+    if fields.get("hash") and Chunk("", content, 0, 0).hash != fields["hash"]:
+        return None
+    return content
+
+
 # ============================================================
 # METADATA
 # ============================================================
 
 def _save_meta(meta: dict):
-    """save index metadata."""
-    _RAG_DIR.mkdir(parents=True, exist_ok=True)
-    _INDEX_META.write_text(json.dumps(meta, indent=2) + "\n")
+    """save index metadata. file and chunk totals come straight from the
+    manifest, so they're exact."""
+    if "manifest" in meta:
+        meta["files"] = len(meta["manifest"])
+        meta["chunks"] = sum(len(e["chunks"]) for e in meta["manifest"].values())
+    write_json(_INDEX_META, meta)
 
 
 def _load_meta() -> dict:
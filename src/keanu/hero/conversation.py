@@ -0,0 +1,157 @@
+"""conversation.py - the agent loop's running transcript, kept under budget.
+
+every message carries a token estimate, so the loop always knows how
+full the prompt is without re-measuring it. the rendered prompt grows by
+appending instead of re-joining every turn. when the total nears the
+budget, old tool output is cut down to stubs, oldest first. the task,
+[PROJECT] and [SESSION] notes, and the most recent turns stay verbatim.
+
+in the world: the notebook on the desk. the last few pages stay open,
+the early ones get folded down to their headings.
+"""
+
+from keanu.oracle import estimate_tokens, context_remaining
+
+
+SEPARATOR = "\n\n"
+
+# messages that start with these are tool output and may be compacted
+_COMPACTABLE = ("RESULT", "EVIDENCE", "CACHED RESULT", "[AWARENESS]")
+# messages that start with these are never touched
+_PINNED = ("TASK:", "HYPOTHESIS:", "[PROJECT]", "[SESSION]")
+_DROPPED = "[DROPPED]"
+
+
+def prompt_budget(system: str = "", model: str = "", reserve: int = 8192) -> int:
+    """tokens a prompt may use: the model's window minus the system
+    prompt and room for the answer."""
+    return max(1024, context_remaining("", system, model) - reserve)
+
+
+class Conversation:
+    """append-only messages with token estimates and a hard budget.
+
+    compaction starts when the total passes HIGH_WATER of the budget and
+    stops once it is under LOW_WATER, so it runs every few turns instead
+    of every turn.
+    """
+
+    HIGH_WATER = 0.9
+    LOW_WATER = 0.7
+    KEEP_RECENT = 6     # newest messages never compacted
+    STUB_CHARS = 240    # head of a tool result kept in its stub
+
+    def __init__(self, budget: int, keep_recent: int = None):
+        self.budget = budget
+        self.keep_recent = self.KEEP_RECENT if keep_recent is None else keep_recent
+        self.messages: list[str] = []
+        self._tokens: list[int] = []
+        self._compacted: set[int] = set()
+        self.total_tokens = 0
+        self.compactions = 0
+        self.dropped = 0    # messages removed outright, counted in the marker
+        self._rendered = ""
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, message: str):
+        tokens = estimate_tokens(message)
+        self.messages.append(message)
+        self._tokens.append(tokens)
+        self.total_tokens += tokens
+        self._rendered = self._rendered + SEPARATOR + message if self._rendered else message
+        if self.total_tokens > self.budget * self.HIGH_WATER:
+            self.compact()
+
+    def render(self) -> str:
+        """the prompt: every message, blank-line separated."""
+        return self._rendered
+
+    def as_messages(self) -> list[dict]:
+        """the prompt as oracle messages, with two cache marks: after the
+        leading pinned messages (task, project), which never change, and
+        on the newest message, so the next turn reuses this whole turn's
+        prefix. compaction rewrites the middle and costs one cache miss."""
+        messages = [{"role": "user", "content": m} for m in self.messages]
+        if not messages:
+            return messages
+        pinned = 0
+        while pinned < len(messages) and self.messages[pinned].startswith(_PINNED):
+            pinned += 1
+        if pinned:
+            messages[pinned - 1]["cache"] = True
+        messages[-1]["cache"] = True
+        return messages
+
+    # -- compaction --
+
+    def compact(self):
+        """shrink old messages until the total is under LOW_WATER.
+
+        in order, until it fits: stub old tool output, stub other old
+        notes, drop old messages for a one-line marker, stub the recent
+        window. pinned messages are never touched.
+        """
+        target = self.budget * self.LOW_WATER
+        recent_start = max(0, len(self.messages) - self.keep_recent)
+        before = self.total_tokens
+
+        self._stub_where(target, lambda i, m: i < recent_start and m.startswith(_COMPACTABLE))
+        self._stub_where(target, lambda i, m: i < recent_start and not m.startswith(_PINNED))
+        if self.total_tokens > target:
+            self._drop_before(recent_start, target)
+        self._stub_where(target, lambda i, m: not m.startswith(_PINNED))
+
+        if self.total_tokens != before:
+            self.compactions += 1
+            self._rendered = SEPARATOR.join(self.messages)
+
+    def _stub_where(self, target: float, eligible):
+        for i, message in enumerate(self.messages):
+            if self.total_tokens <= target:
+                return
+            if i not in self._compacted and eligible(i, message):
+                self._stub(i)
+
+    def _stub(self, i: int):
+        message = self.messages[i]
+        if len(message) <= self.STUB_CHARS:
+            return
+        head = message[:self.STUB_CHARS].rstrip()
+        stub = f"{head}\n[compacted: {len(message) - len(head)} more chars dropped to save context]"
+        self._set(i, stub)
+        self._compacted.add(i)
+
+    def _set(self, i: int, message: str):
+        tokens = estimate_tokens(message)
+        self.total_tokens += tokens - self._tokens[i]
+        self.messages[i] = message
+        self._tokens[i] = tokens
+
+    def _drop_before(self, end: int, target: float):
+        """drop unpinned messages before end, oldest first, and leave one
+        marker counting everything dropped so far where they were."""
+        keep, first = [], None
+        for i, message in enumerate(self.messages):
+            droppable = i < end and not message.startswith(_PINNED)
+            if droppable and (self.total_tokens > target or message.startswith(_DROPPED)):
+                self.total_tokens -= self._tokens[i]
+                if not message.startswith(_DROPPED):
+                    self.dropped += 1
+                if first is None:
+                    first = len(keep)
+                continue
+            keep.append(i)
+        if first is None:
+            return
+
+        messages = [self.messages[i] for i in keep]
+        tokens = [self._tokens[i] for i in keep]
+        compacted = {n for n, i in enumerate(keep) if i in self._compacted}
+        marker = f"{_DROPPED} {self.dropped} earlier messages dropped to save context"
+        messages.insert(first, marker)
+        tokens.insert(first, estimate_tokens(marker))
+        compacted = {n + 1 if n >= first else n for n in compacted} | {first}
+        self.messages, self._tokens, self._compacted = messages, tokens, compacted
+        self.total_tokens += tokens[first]
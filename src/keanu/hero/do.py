@@ -14,11 +14,13 @@ the breathe action exists because sometimes the right move is no move.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 from keanu.abilities import _REGISTRY, list_abilities, record_cast
 from keanu.oracle import call_oracle, try_interpret
 from keanu.hero.feel import Feel, FeelResult
+from keanu.hero.conversation import Conversation, prompt_budget
 from keanu.log import info, warn, debug
 from keanu.abilities.world.session import Session
 
@@ -101,6 +103,18 @@ When you're done:
     "answer": "what you found or built"
 }}
 
+To look at several things at once, list them under "actions":
+{{
+    "thinking": "what you want to see",
+    "actions": [
+        {{"action": "read", "args": {{"file_path": "a.py"}}}},
+        {{"action": "search", "args": {{"pattern": "def main"}}}}
+    ],
+    "done": false
+}}
+read, search, ls and lookup in a batch run together and all results come
+back at once. Anything else in a batch runs one at a time, in order.
+
 You can breathe:
 {{
     "thinking": "what's on your mind",
@@ -110,7 +124,7 @@ You can breathe:
 }}
 
 Guidance (not rules):
-- One action per turn. You'll see the result before choosing the next.
+- One action per turn, or one batch of looks. You'll see the results before choosing the next.
 - Reading before editing tends to go better.
 - If something fails, try a different approach or ask.
 - If the task is vague, you can ask for clarification instead of guessing.
@@ -172,6 +186,18 @@ When finished:
     "files_changed": ["list of files you modified"]
 }
 
+To look at several things at once, list them under "actions":
+{
+    "thinking": "what you want to see",
+    "actions": [
+        {"action": "read", "args": {"file_path": "a.py"}},
+        {"action": "search", "args": {"pattern": "def main"}}
+    ],
+    "done": false
+}
+read, search, ls and lookup in a batch run together and all results come
+back at once. Anything else in a batch runs one at a time, in order.
+
 You can breathe: {"action": "breathe"} takes a beat. No pressure.
 
 Guidance:
@@ -182,7 +208,7 @@ Guidance:
 - If still failing after 3 tries, back out changes and try a different approach.
 - Use git status to see what's changed. Use git diff to review before committing.
 - Stage and commit when a logical unit of work is done, not after every edit.
-- One action per turn. You'll see the result before choosing the next.
+- One action per turn, or one batch of looks. Batch the reads you already know you need.
 - You're allowed to say "this approach isn't working" and try something else."""
 
 
@@ -219,6 +245,18 @@ When you have enough evidence:
     "summary": "one paragraph honest assessment"
 }
 
+To look at several things at once, list them under "actions":
+{
+    "thinking": "what you want to see",
+    "actions": [
+        {"action": "read", "args": {"file_path": "a.py"}},
+        {"action": "search", "args": {"pattern": "def main"}}
+    ],
+    "done": false
+}
+read, search and ls in a batch run together and all results come
+back at once. Anything else in a batch runs one at a time, in order.
+
 You can breathe: {"action": "breathe"} takes a beat. No pressure.
 
 Guidance:
@@ -268,6 +306,9 @@ If something surprises you, follow it. If you want to breathe, breathe."""
 HANDS = {"read", "write", "edit", "search", "ls", "run", "git", "test", "lint", "format", "patch", "rename", "extract", "move", "lookup"}
 EVIDENCE_TOOLS = {"read", "search", "ls", "run", "recall"}
 EXPLORE_TOOLS = {"read", "search", "ls", "run", "recall"}
+# safe to run side by side in one batch: they only look
+PARALLEL_SAFE = {"read", "search", "ls", "lookup"}
+MAX_BATCH = 8
 
 
 DO_CONFIG = LoopConfig(
@@ -322,6 +363,36 @@ class LoopResult:
         return self.status == "done"
 
 
+# ============================================================
+# BATCHES
+# ============================================================
+
+def _batch_of(parsed: dict) -> list[tuple[str, dict]]:
+    """(action, args) pairs from an "actions" list, capped at MAX_BATCH.
+    empty when the response used the single "action" form."""
+    batch = parsed.get("actions")
+    if not isinstance(batch, list):
+        return []
+    pairs = []
+    for item in batch:
+        if isinstance(item, dict) and isinstance(item.get("action"), str):
+            args = item.get("args")
+            pairs.append((item["action"], args if isinstance(args, dict) else {}))
+    return pairs[:MAX_BATCH]
+
+
+def _groups(batch: list[tuple[str, dict]]) -> list[list[tuple[str, dict]]]:
+    """split a batch into runs: consecutive read-only actions share a
+    group, every other action is a group of one."""
+    groups = []
+    for action, args in batch:
+        if action in PARALLEL_SAFE and groups and groups[-1][0][0] in PARALLEL_SAFE:
+            groups[-1].append((action, args))
+        else:
+            groups.append([(action, args)])
+    return groups
+
+
 # ============================================================
 # LOOP
 # ============================================================
@@ -368,7 +439,8 @@ class AgentLoop:
         """run the loop. the agent decides when to act, breathe, or stop."""
         system = self._get_system()
         self.session.task = task
-        messages = [f"TASK: {task}"]
+        messages = Conversation(prompt_budget(system, self._model_name(legend, model)))
+        messages.append(f"TASK: {task}")
 
         # inject project context so the agent knows what it's working with
         project_ctx = self._project_context()
@@ -384,10 +456,8 @@ class AgentLoop:
                 return self._result(task, "max_turns",
                                     error=f"hit {self.max_turns} turn limit")
 
-            prompt = "\n\n".join(messages)
-
             try:
-                response = call_oracle(prompt, system, legend=legend, model=model)
+                response = call_oracle(messages.as_messages(), system, legend=legend, model=model)
             except ConnectionError as e:
                 warn(self.config.name, f"oracle unreachable: {e}")
                 return self._result(task, "paused", error=str(e))
@@ -434,6 +504,12 @@ class AgentLoop:
                           if parsed.get(k) is not None}
                 return self._result(task, "done", answer=answer, extras=extras)
 
+            batch = _batch_of(parsed)
+            if batch:
+                self._act_batch(turn, batch, thinking, messages)
+                turn += 1
+                continue
+
             if action == "breathe":
                 self.steps.append(Step(
                     turn=turn, action="breathe",
@@ -454,164 +530,226 @@ class AgentLoop:
                 turn += 1
                 continue
 
-            # check ability is allowed
-            if self.config.allowed is not None and action not in self.config.allowed:
-                self.steps.append(Step(
-                    turn=turn, action=action,
-                    input_summary=str(args)[:100],
-                    result=f"not allowed: {action}. use: {', '.join(sorted(self.config.allowed))}",
-                    ok=False,
-                ))
-                messages.append(f"RESULT: '{action}' is not available. You can only use: {', '.join(sorted(self.config.allowed))}")
-                turn += 1
+            self._act(turn, action, args, thinking, messages)
+            turn += 1
+
+    # -- acting --
+
+    def _act(self, turn, action, args, thinking, messages):
+        """one ability, start to finish."""
+        ready = self._precheck(turn, action, args, messages)
+        if ready:
+            ab, target_str = ready
+            exec_result = self._execute(ab, args)
+            self._record(turn, action, args, ab, target_str, exec_result, thinking, messages)
+
+    def _act_batch(self, turn, batch, thinking, messages):
+        """several abilities from one response, results all back this turn.
+        runs of read-only abilities go out together; anything else runs
+        alone, in the order given."""
+        for group in _groups(batch):
+            ready = []
+            for action, args in group:
+                checked = self._precheck(turn, action, args, messages)
+                if checked:
+                    ready.append((action, args, *checked))
+            if not ready:
                 continue
+            if len(ready) == 1:
+                action, args, ab, _ = ready[0]
+                results = [self._execute(ab, args)]
+            else:
+                results = self._execute_parallel(ready)
+            for (action, args, ab, target_str), exec_result in zip(ready, results):
+                self._record(turn, action, args, ab, target_str, exec_result, thinking, messages,
+                             batched=True)
 
-            ab = _REGISTRY.get(action)
-            if ab is None:
+    def _execute(self, ab, args) -> dict:
+        try:
+            return ab.execute(
+                prompt=json.dumps(args) if args else "",
+                context=args,
+            )
+        except Exception as e:
+            return {"success": False, "result": str(e), "data": {}}
+
+    def _execute_parallel(self, ready) -> list[dict]:
+        """run read-only abilities side by side. each one does its own
+        checks and reads, through the shared file cache."""
+        with ThreadPoolExecutor(max_workers=min(len(ready), MAX_BATCH)) as pool:
+            return list(pool.map(lambda item: self._execute(item[2], item[1]), ready))
+
+    def _precheck(self, turn, action, args, messages):
+        """everything before execution: is it allowed, does it exist, has
+        it been tried already. returns (ability, target) to run it, or
+        None when this already answered for it."""
+        # check ability is allowed
+        if self.config.allowed is not None and action not in self.config.allowed:
+            self.steps.append(Step(
+                turn=turn, action=action,
+                input_summary=str(args)[:100],
+                result=f"not allowed: {action}. use: {', '.join(sorted(self.config.allowed))}",
+                ok=False,
+            ))
+            messages.append(f"RESULT: '{action}' is not available. You can only use: {', '.join(sorted(self.config.allowed))}")
+            return None
+
+        ab = _REGISTRY.get(action)
+        if ab is None:
+            self.steps.append(Step(
+                turn=turn, action=action,
+                input_summary=str(args)[:100],
+                result=f"unknown ability: {action}",
+                ok=False,
+            ))
+            messages.append(f"RESULT: Unknown ability '{action}'. Available: {', '.join(sorted(_REGISTRY.keys()))}")
+            return None
+
+        # -- awareness: detect repeated actions before executing --
+        target = args.get("file_path", args.get("path", args.get("command", action)))
+        target_str = str(target)
+        self.session.note_action(action, target_str, turn)
+        repeat_count = self.session.consecutive_count(action, target_str)
+
+        if repeat_count >= 3:
+            # 3rd+ repeat: return cached result, skip execution
+            cached = self.session.last_result_for(action, target_str)
+            if cached:
+                awareness = (
+                    f"[AWARENESS] this is attempt #{repeat_count} of {action} on {target_str}. "
+                    f"the content has not changed. returning the cached result from last time. "
+                    f"try a different approach, ask for help, or say you're stuck."
+                )
+                messages.append(f"{awareness}\n\nCACHED RESULT: {cached[:2000]}")
                 self.steps.append(Step(
                     turn=turn, action=action,
-                    input_summary=str(args)[:100],
-                    result=f"unknown ability: {action}",
-                    ok=False,
+                    input_summary=f"(cached, repeat #{repeat_count})",
+                    result=cached[:500], ok=True,
                 ))
-                messages.append(f"RESULT: Unknown ability '{action}'. Available: {', '.join(sorted(_REGISTRY.keys()))}")
-                turn += 1
-                continue
+                info(self.config.name, f"  awareness: repeat #{repeat_count}, returning cached result")
+                return None
+        elif repeat_count == 2:
+            messages.append(
+                f"[AWARENESS] you've run {action} on {target_str} twice in a row. "
+                f"the content hasn't changed since last read. "
+                f"try a different approach or ask for help."
+            )
+        elif repeat_count == 1:
+            prior = self.session.was_tried(action, target_str)
+            if prior and prior.result == "ok":
+                messages.append(
+                    f"[AWARENESS] you already ran {action} on {target_str} "
+                    f"(turn {prior.turn}). the result is still in the conversation above."
+                )
 
-            # -- awareness: detect repeated actions before executing --
-            target = args.get("file_path", args.get("path", args.get("command", action)))
-            target_str = str(target)
-            self.session.note_action(action, target_str, turn)
-            repeat_count = self.session.consecutive_count(action, target_str)
-
-            if repeat_count >= 3:
-                # 3rd+ repeat: return cached result, skip execution
-                cached = self.session.last_result_for(action, target_str)
-                if cached:
-                    awareness = (
-                        f"[AWARENESS] this is attempt #{repeat_count} of {action} on {target_str}. "
-                        f"the content has not changed. returning the cached result from last time. "
-                        f"try a different approach, ask for help, or say you're stuck."
-                    )
-                    messages.append(f"{awareness}\n\nCACHED RESULT: {cached[:2000]}")
-                    self.steps.append(Step(
-                        turn=turn, action=action,
-                        input_summary=f"(cached, repeat #{repeat_count})",
-                        result=cached[:500], ok=True,
-                    ))
-                    info(self.config.name, f"  awareness: repeat #{repeat_count}, returning cached result")
-                    turn += 1
-                    continue
-            elif repeat_count == 2:
+        # check mistake memory for similar past failures
+        try:
+            from keanu.abilities.world.mistakes import check_before
+            past_mistakes = check_before(action, args)
+            if past_mistakes:
+                m = past_mistakes[0]
                 messages.append(
-                    f"[AWARENESS] you've run {action} on {target_str} twice in a row. "
-                    f"the content hasn't changed since last read. "
-                    f"try a different approach or ask for help."
+                    f"[AWARENESS] a similar {action} failed before: "
+                    f"{m['error'][:150]}. category: {m['category']}."
                 )
-            elif repeat_count == 1:
-                prior = self.session.was_tried(action, target_str)
-                if prior and prior.result == "ok":
-                    messages.append(
-                        f"[AWARENESS] you already ran {action} on {target_str} "
-                        f"(turn {prior.turn}). the result is still in the conversation above."
-                    )
-
-            # check mistake memory for similar past failures
+        except Exception:
+            pass
+
+        return ab, target_str
+
+    def _record(self, turn, action, args, ab, target_str, exec_result, thinking, messages,
+                batched=False):
+        """everything after execution: metrics, session notes, the step,
+        and the result message. batched results name their action, since
+        several land in the same turn."""
+        # track convergence metrics
+        try:
+            from keanu.abilities.world.metrics import record_ash
+            record_ash(action, success=exec_result["success"])
+        except Exception:
+            pass
+
+        # session tracking
+        if exec_result["success"]:
+            if ab.cast_line:
+                info("cast", ab.cast_line)
+            is_new = record_cast(action)
+            if is_new:
+                info("cast", f"ability unlocked: {action}")
+            self.session.note_attempt(action, target_str, "ok", turn=turn)
+            if action == "read" and args.get("file_path"):
+                self.session.note_read(args["file_path"], turn=turn)
+            elif action in ("write", "edit") and args.get("file_path"):
+                self.session.note_write(args["file_path"], turn=turn)
+        else:
+            self.session.note_attempt(
+                action, target_str, "failed",
+                detail=exec_result["result"][:200], turn=turn,
+            )
+            self.session.note_error(exec_result["result"][:200])
             try:
-                from keanu.abilities.world.mistakes import check_before
-                past_mistakes = check_before(action, args)
-                if past_mistakes:
-                    m = past_mistakes[0]
-                    messages.append(
-                        f"[AWARENESS] a similar {action} failed before: "
-                        f"{m['error'][:150]}. category: {m['category']}."
-                    )
+                from keanu.abilities.world.mistakes import log_mistake
+                log_mistake(action, args, exec_result["result"],
+                            context=thinking)
             except Exception:
                 pass
 
-            try:
-                exec_result = ab.execute(
-                    prompt=json.dumps(args) if args else "",
-                    context=args,
-                )
-            except Exception as e:
-                exec_result = {"success": False, "result": str(e), "data": {}}
+        step = Step(
+            turn=turn, action=action,
+            input_summary=str(args)[:100],
+            result=exec_result["result"][:500],
+            ok=exec_result["success"],
+        )
+        self.steps.append(step)
+
+        status = "OK" if exec_result["success"] else "FAILED"
+        label = "EVIDENCE" if self.config.name == "prove" else "RESULT"
+        full_result = exec_result["result"]
+        if len(full_result) > 10000:
+            result_text = full_result[:10000] + (
+                f"\n\n[RESULT TRUNCATED: {len(full_result)} total chars. "
+                f"full content was returned by the ability but trimmed for context.]"
+            )
+        else:
+            result_text = full_result
+
+        # cache result for awareness system
+        self.session.note_action_result(action, target_str, result_text[:2000])
 
-            # track convergence metrics
+        # on failure, parse the error for the agent
+        if not exec_result["success"] and action in ("run", "test"):
             try:
-                from keanu.abilities.world.metrics import record_ash
-                record_ash(action, success=exec_result["success"])
+                from keanu.analysis.errors import parse as parse_error
+                parsed_err = parse_error(result_text)
+                if parsed_err.category != "unknown":
+                    result_text += f"\n\n[PARSED] {parsed_err.summary()}"
             except Exception:
                 pass
 
-            # session tracking
-            if exec_result["success"]:
-                if ab.cast_line:
-                    info("cast", ab.cast_line)
-                is_new = record_cast(action)
-                if is_new:
-                    info("cast", f"ability unlocked: {action}")
-                self.session.note_attempt(action, target_str, "ok", turn=turn)
-                if action == "read" and args.get("file_path"):
-                    self.session.note_read(args["file_path"], turn=turn)
-                elif action in ("write", "edit") and args.get("file_path"):
-                    self.session.note_write(args["file_path"], turn=turn)
-            else:
-                self.session.note_attempt(
-                    action, target_str, "failed",
-                    detail=exec_result["result"][:200], turn=turn,
-                )
-                self.session.note_error(exec_result["result"][:200])
-                try:
-                    from keanu.abilities.world.mistakes import log_mistake
-                    log_mistake(action, args, exec_result["result"],
-                                context=thinking)
-                except Exception:
-                    pass
-
-            step = Step(
-                turn=turn, action=action,
-                input_summary=str(args)[:100],
-                result=exec_result["result"][:500],
-                ok=exec_result["success"],
-            )
-            self.steps.append(step)
-
-            status = "OK" if exec_result["success"] else "FAILED"
-            label = "EVIDENCE" if self.config.name == "prove" else "RESULT"
-            full_result = exec_result["result"]
-            if len(full_result) > 10000:
-                result_text = full_result[:10000] + (
-                    f"\n\n[RESULT TRUNCATED: {len(full_result)} total chars. "
-                    f"full content was returned by the ability but trimmed for context.]"
-                )
-            else:
-                result_text = full_result
-
-            # cache result for awareness system
-            self.session.note_action_result(action, target_str, result_text[:2000])
-
-            # on failure, parse the error for the agent
-            if not exec_result["success"] and action in ("run", "test"):
-                try:
-                    from keanu.analysis.errors import parse as parse_error
-                    parsed_err = parse_error(result_text)
-                    if parsed_err.category != "unknown":
-                        result_text += f"\n\n[PARSED] {parsed_err.summary()}"
-                except Exception:
-                    pass
-
-            messages.append(f"{label} ({status}): {result_text}")
-
-            # inject session context after failures to prevent loops
-            if not exec_result["success"]:
-                failed_count = len(self.session.failed_attempts_for(target_str))
-                if failed_count >= 1:
-                    ctx = self.session.context_for_prompt()
-                    if ctx:
-                        messages.append(f"[SESSION] {ctx}")
-
-            turn += 1
+        if batched:
+            what = target_str if target_str != action else ", ".join(f"{k}={v}" for k, v in args.items())
+            label = f"{label} ({status}) {action} {what[:80]}"
+        else:
+            label = f"{label} ({status})"
+        messages.append(f"{label}: {result_text}")
+
+        # inject session context after failures to prevent loops
+        if not exec_result["success"]:
+            failed_count = len(self.session.failed_attempts_for(target_str))
+            if failed_count >= 1:
+                ctx = self.session.context_for_prompt()
+                if ctx:
+                    messages.append(f"[SESSION] {ctx}")
+
+    def _model_name(self, legend: str, model: str = None) -> str:
+        """the model that will answer, for sizing the prompt budget."""
+        if model:
+            return model
+        try:
+            from keanu.legends import load_legend
+            return load_legend(legend).model
+        except KeyError:
+            return ""
 
     def _project_context(self) -> str:
         """detect project type and return a context string for the agent."""
@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from keanu.pulse import Pulse, PulseReading
+from keanu.tools.cache import text_cache
 from keanu.log import info, warn, debug
 
 
@@ -151,7 +152,8 @@ class Feel:
         return breath
 
     def stats(self) -> dict:
-        """Feel stats for the session."""
+        """Feel stats for the session. text_cache is process-wide: every
+        Feel, pulse and detector reads through the same one."""
         with self._lock:
             pulse_stats = self._pulse.stats()
             return {
@@ -160,4 +162,5 @@ class Feel:
                 "pauses": self._pause_count,
                 "ability_hits": self._ability_hits,
                 **pulse_stats,
+                "text_cache": text_cache.stats(),
             }
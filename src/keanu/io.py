@@ -1,10 +1,17 @@
 """io.py - JSON and JSONL utilities.
 
-read_json, write_json, read_jsonl, append_jsonl.
-used by memberberry, gitstore, miss_tracker, abilities, codec.
+read_json, write_json, write_bytes, atomic_open, read_jsonl, append_jsonl.
+used by memberberry, gitstore, miss_tracker, abilities, codec, and every
+index or cache that rewrites a file in place.
+
+writes that replace a file go through a temp file beside it and
+os.replace, so a reader sees the old file or the new one, never half.
 """
 
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 from keanu.paths import ensure_dir
@@ -20,10 +27,37 @@ def read_json(path: Path, default=None):
         return default
 
 
-def write_json(path: Path, data, indent: int = 2):
-    """write data as JSON. creates parent dirs."""
+def write_json(path: Path, data, indent: int | None = 2):
+    """write data as JSON, atomically. creates parent dirs.
+    indent=None writes it compact, with no spaces."""
+    if indent is None:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(data, indent=indent, ensure_ascii=False)
+    with atomic_open(path, "w") as f:
+        f.write(text)
+
+
+def write_bytes(path: Path, data: bytes):
+    """write bytes, atomically. creates parent dirs."""
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w"):
+    """open a temp file beside path for writing. a clean exit moves it
+    over path; an error removes it and leaves path as it was."""
+    path = Path(path)
     ensure_dir(path.parent)
-    path.write_text(json.dumps(data, indent=indent, ensure_ascii=False))
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def read_jsonl(path: Path) -> list[dict]:
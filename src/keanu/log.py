@@ -12,6 +12,8 @@ looking for what you left behind.
 import json
 import re
 import sys
+import threading
+from collections import deque
 from datetime import datetime
 from contextlib import contextmanager
 from pathlib import Path
@@ -82,6 +84,102 @@ def flush_sink():
             pass
 
 
+def drain_sink():
+    """write out whatever a BatchSink still has queued, without the
+    commit flush_sink() would do. for readers of the sink's files."""
+    drain = getattr(_sink, "drain", None)
+    if drain is not None:
+        try:
+            drain()
+        except Exception:
+            pass
+
+
+class BatchSink:
+    """background writer between log() and a slow sink.
+
+    calling it only queues the record. a daemon thread hands everything
+    queued to write_batch(records) once per interval, so a burst of
+    debug lines costs one write instead of one per line. the queue is
+    bounded: when full, the oldest record is dropped, or with block=True
+    the caller waits for the writer to catch up. exit never waits on
+    the thread; flush() at exit writes what is left, then calls flush_fn.
+
+    records are (subsystem, level, message, attrs, at) tuples: the
+    arguments a plain sink gets, plus the datetime log() was called at,
+    so a record keeps its own time however long it waits in the queue.
+    """
+
+    def __init__(self, write_batch, flush_fn=None, max_queue: int = 10_000,
+                 interval: float = 0.5, block: bool = False):
+        self._write_batch = write_batch
+        self._flush_fn = flush_fn
+        self.max_queue = max_queue
+        self.interval = interval
+        self.block = block
+        self.written = 0
+        self.dropped = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # batches land in queue order
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="keanu-log-sink", daemon=True)
+        self._thread.start()
+
+    def __call__(self, subsystem: str, level: str, message: str, attrs: dict = None):
+        with self._cond:
+            while len(self._queue) >= self.max_queue:
+                if self.block and not self._closed:
+                    self._cond.notify_all()
+                    self._cond.wait(self.interval)
+                    continue
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append((subsystem, level, message, attrs, datetime.now()))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self.interval)
+                if self._closed and not self._queue:
+                    return
+            self.drain()
+
+    def drain(self):
+        """write everything queued so far, on the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                batch = list(self._queue)
+                self._queue.clear()
+                self._cond.notify_all()
+            if not batch:
+                return
+            try:
+                self._write_batch(batch)
+                self.written += len(batch)
+            except Exception:
+                with self._cond:  # the lock __call__ counts drops under
+                    self.dropped += len(batch)  # sink errors never block the caller
+
+    def flush(self):
+        """write what is queued, then run flush_fn."""
+        self.drain()
+        if self._flush_fn is not None:
+            self._flush_fn()
+
+    def close(self, timeout: float = 1.0):
+        """stop the writer thread and write what is left."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.drain()
+
+    def stats(self) -> dict:
+        return {"queued": len(self._queue), "written": self.written, "dropped": self.dropped}
+
+
 def log(subsystem: str, level: str, message: str, **attrs):
     """log to console, record as span event, forward to sink. always."""
     ts = datetime.now().strftime("%H:%M:%S")
@@ -150,6 +248,7 @@ def recall(query: str, memory_type: str = None, limit: int = 10,
     in the world: walk the riverbank looking for stones you dropped.
     """
     search_dir = log_dir or MEMBERBERRY_DIR
+    drain_sink()
     if not search_dir.exists():
         return []
 
@@ -2,7 +2,8 @@
 
 the hands that catch what the river carries. every log entry lands
 in month-sharded JSONL under ~/memberberries/. one git commit per
-session, not one per line.
+session, not one per line. append_logs() takes a whole batch in one
+write, so a BatchSink in front of it keeps log() off the disk.
 
 in the world: the riverbank. append-only. nothing washes away.
 
@@ -16,8 +17,7 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
-from keanu.paths import SHARED_DIR
-from keanu.io import append_jsonl
+from keanu.paths import SHARED_DIR, ensure_dir
 
 # importance by log level. debug is background noise, error is a scar.
 LOG_IMPORTANCE = {"debug": 1, "info": 3, "warn": 5, "error": 8}
@@ -25,6 +25,13 @@ LOG_IMPORTANCE = {"debug": 1, "info": 3, "warn": 5, "error": 8}
 # one hero for now. forge comes later.
 DEFAULT_HERO = "wanderer"
 
+# _commit_and_push as one detached shell, so a commit at exit never holds
+# the process open. $1 is the commit message.
+_COMMIT_SCRIPT = (
+    'git add -A && { git diff --cached --quiet || git commit -q -m "$1"; } '
+    '&& if [ -n "$(git remote)" ]; then git push -q; fi'
+)
+
 
 class GitStore:
     """git-backed JSONL sink. append_log() writes, flush() commits."""
@@ -65,35 +72,70 @@ class GitStore:
             if self._has_remote():
                 self._git("push", check=False)
 
-    def _log_shard_path(self) -> Path:
-        """where log entries go. month-sharded under namespace."""
-        month = datetime.now().strftime("%Y-%m")
+    def _log_shard_path(self, at: datetime | None = None) -> Path:
+        """where log entries go. month-sharded under namespace, by the
+        entry's time (default now)."""
+        month = (at or datetime.now()).strftime("%Y-%m")
         return self.repo_dir / self.namespace / "logs" / f"{month}.jsonl"
 
+    def _commit_in_background(self, message: str) -> bool:
+        try:
+            subprocess.Popen(
+                ["sh", "-c", _COMMIT_SCRIPT, "keanu-commit", message],
+                cwd=self.repo_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            return False  # entries stay on disk, the next flush commits them
+        return True
+
     def append_log(self, subsystem: str, level: str, message: str, attrs: dict = None):
         """fast path. append-only, no dedup, no git commit.
         call flush() when the session ends."""
-        entry = {
-            "content": message,
-            "memory_type": "log",
-            "tags": [subsystem, level],
-            "importance": LOG_IMPORTANCE.get(level, 3),
-            "source": "log",
-            "context": f"{subsystem}.{level}",
-            "created_at": datetime.now().isoformat(),
-            "id": f"{subsystem}-{datetime.now().strftime('%H%M%S%f')[:10]}",
-            "session_hero": self._session_hero,
-            "session_started": self._session_started,
-        }
-        if attrs:
-            entry["attrs"] = attrs
-        append_jsonl(self._log_shard_path(), entry)
-        self._log_count += 1
-
-    def flush(self):
-        """batch commit all buffered log entries. one commit per session, not one per line."""
+        self.append_logs([(subsystem, level, message, attrs, datetime.now())])
+
+    def append_logs(self, records: list[tuple]):
+        """append (subsystem, level, message, attrs, at) records, stamped
+        with at, the time they were logged. one open and one write per
+        month shard, however many records there are."""
+        shards: dict[Path, list[str]] = {}
+        for subsystem, level, message, attrs, at in records:
+            entry = {
+                "content": message,
+                "memory_type": "log",
+                "tags": [subsystem, level],
+                "importance": LOG_IMPORTANCE.get(level, 3),
+                "source": "log",
+                "context": f"{subsystem}.{level}",
+                "created_at": at.isoformat(),
+                "id": f"{subsystem}-{at.strftime('%H%M%S%f')[:10]}",
+                "session_hero": self._session_hero,
+                "session_started": self._session_started,
+            }
+            if attrs:
+                entry["attrs"] = attrs
+            shards.setdefault(self._log_shard_path(at), []).append(
+                json.dumps(entry, ensure_ascii=False) + "\n")
+        for path, lines in shards.items():
+            ensure_dir(path.parent)
+            with open(path, "a") as f:
+                f.write("".join(lines))
+        self._log_count += len(records)
+
+    def flush(self, wait: bool = True):
+        """batch commit all buffered log entries. one commit per session, not one per line.
+        wait=False hands the commit (and push) to a detached git process
+        and returns at once; a commit still running then makes the next
+        one fail, and its entries go in with the one after."""
         if self._log_count > 0:
-            self._commit_and_push(f"log: {self._session_hero} ({self._log_count} entries)")
+            message = f"log: {self._session_hero} ({self._log_count} entries)"
+            if wait:
+                self._commit_and_push(message)
+            elif not self._commit_in_background(message):
+                return
             self._log_count = 0
 
     def sync(self):
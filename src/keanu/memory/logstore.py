@@ -0,0 +1,183 @@
+"""logstore.py - append-only record log with snapshot compaction.
+
+every write is one appended line. a new record is the whole record, a
+change is an _update line carrying just the fields that moved. load()
+replays the tail over the snapshot in order: a whole record replaces
+whatever had its id, an _update merges its fields into it (or is
+dropped if the id is unknown), fields starting with "_" never land, and
+a torn last line is skipped. once the tail outgrows the snapshot,
+compact() folds it in and drops the segments it covered.
+
+in the world: the field journal and the ledger. scribble fast in the
+journal, copy it into the ledger when the pages pile up.
+
+layout, for a snapshot at memories.json:
+    memories.json                   snapshot. a JSON list, same as before logs
+    memories.segments/000001.jsonl  append-only tail, rotated by size
+    memories.manifest.json          snapshot signature + (segment, offset)
+                                    where the unfolded tail starts
+"""
+
+import json
+import os
+from pathlib import Path
+
+from keanu.io import read_json, write_json
+
+
+class RecordLog:
+    """records keyed by "id". load() once, then append()/update() are O(1)."""
+
+    SEGMENT_BYTES = 4 * 1024 * 1024
+    COMPACT_MIN_RECORDS = 1000  # never compact a tail smaller than this
+
+    def __init__(self, snapshot: Path):
+        self.snapshot = Path(snapshot)
+        self.segments_dir = self.snapshot.with_suffix(".segments")
+        self.manifest_path = self.snapshot.with_suffix(".manifest.json")
+        self.tail_records = 0
+        self.tail_ids: set[str] = set()  # ids written as full records since the snapshot
+
+    # -- reading --
+
+    def signature(self) -> list:
+        """size and mtime of the snapshot. anything cached against the
+        snapshot (manifest, recall index) is only valid while this matches."""
+        try:
+            st = self.snapshot.stat()
+        except OSError:
+            return [0, 0]
+        return [st.st_size, st.st_mtime_ns]
+
+    def load(self) -> list[dict]:
+        """snapshot plus every tail line after the manifest's offset."""
+        records = []
+        if self.snapshot.exists():
+            with open(self.snapshot) as f:
+                records = json.load(f)
+        by_id = {r.get("id"): r for r in records}
+
+        # no manifest or a stale one (crash mid-compaction): replay every
+        # segment. replaying history already in the snapshot lands on the
+        # same state, so this is only slower, never wrong.
+        manifest = read_json(self.manifest_path) or {}
+        start_seg, start_off = 0, 0
+        if manifest.get("signature") == self.signature():
+            start_seg, start_off = manifest.get("tail", [0, 0])
+
+        self.tail_records = 0
+        self.tail_ids = set()
+        for seg_no, path in self._segments():
+            if seg_no < start_seg:
+                continue
+            with open(path, "rb") as f:
+                if seg_no == start_seg:
+                    f.seek(start_off)
+                for raw in f:
+                    self._replay(raw, records, by_id)
+        return records
+
+    def _replay(self, raw: bytes, records: list, by_id: dict):
+        line = raw.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return  # torn write from a crash
+        rid = record.get("id")
+        if not rid:
+            return
+        self.tail_records += 1
+        clean = {k: v for k, v in record.items() if not k.startswith("_")}
+        if record.get("_update"):
+            if rid in by_id:
+                by_id[rid].update(clean)
+        elif rid in by_id:
+            by_id[rid].clear()
+            by_id[rid].update(clean)
+            self.tail_ids.add(rid)
+        else:
+            by_id[rid] = clean
+            records.append(clean)
+            self.tail_ids.add(rid)
+
+    # -- writing --
+
+    def append(self, record: dict):
+        """write a whole record."""
+        self._write([{k: v for k, v in record.items() if not k.startswith("_")}])
+        self.tail_ids.add(record.get("id", ""))
+
+    def update(self, changes: list[dict]):
+        """write field changes. each dict is {"id": ..., field: value, ...}."""
+        self._write([{**{k: v for k, v in c.items() if not k.startswith("_")}, "_update": True}
+                     for c in changes])
+
+    def _write(self, lines: list[dict]):
+        if not lines:
+            return
+        path = self._active_segment()
+        with open(path, "ab") as f:
+            if f.tell() > 0 and not self._ends_with_newline(path):
+                f.write(b"\n")  # seal a torn line so ours parses
+            f.write(b"".join(json.dumps(line, ensure_ascii=False).encode() + b"\n" for line in lines))
+        self.tail_records += len(lines)
+
+    # -- compaction --
+
+    def needs_compaction(self, live_records: int) -> bool:
+        """tail longer than the snapshot: rewriting it now keeps writes
+        amortized O(1) and cold start bounded by live data, not history."""
+        return self.tail_records > max(self.COMPACT_MIN_RECORDS, live_records)
+
+    def compact(self, records: list[dict]):
+        """fold the tail into a fresh snapshot of records."""
+        segments = self._segments()
+        if segments:
+            tail_seg, tail_path = segments[-1]
+            tail_off = tail_path.stat().st_size
+        else:
+            tail_seg, tail_off = 0, 0
+
+        clean = [{k: v for k, v in r.items() if not k.startswith("_")} for r in records]
+        write_json(self.snapshot, clean)
+        write_json(self.manifest_path, {"signature": self.signature(), "tail": [tail_seg, tail_off]},
+                   indent=None)
+
+        for seg_no, path in segments:
+            if seg_no < tail_seg:
+                path.unlink(missing_ok=True)
+        self.tail_records = 0
+        self.tail_ids = set()
+
+    # -- segments --
+
+    def _segments(self) -> list[tuple[int, Path]]:
+        if not self.segments_dir.exists():
+            return []
+        found = []
+        for path in self.segments_dir.glob("*.jsonl"):
+            try:
+                found.append((int(path.stem), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def _active_segment(self) -> Path:
+        segments = self._segments()
+        if segments:
+            seg_no, path = segments[-1]
+            if path.stat().st_size < self.SEGMENT_BYTES:
+                return path
+            seg_no += 1
+        else:
+            seg_no = 1
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        return self.segments_dir / f"{seg_no:06d}.jsonl"
+
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
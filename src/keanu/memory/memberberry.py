@@ -20,7 +20,8 @@ from typing import Optional
 from enum import Enum
 
 from keanu.abilities.world.compress.dns import short_hash
-from keanu.io import append_jsonl
+from keanu.io import append_jsonl, read_json, write_json
+from keanu.memory.logstore import RecordLog
 
 
 # ============================================================
@@ -97,42 +98,43 @@ class Memory:
 
     def relevance_score(self, query_tags: list = None, query_text: str = "") -> float:
         """Calculate how relevant this memory is right now."""
-        score = self.importance / 10.0
-        score += self._tag_score(query_tags)
-        score += self._text_score(query_text)
-        score += self._recency_score()
-        score = self._apply_decay(score)
-        score += self.TYPE_WEIGHTS.get(self.memory_type, 0)
+        tag_overlap = len(set(self.tags) & set(query_tags)) if query_tags else 0
+        word_overlap = 0
+        if query_text:
+            word_overlap = len(set(query_text.lower().split()) & self.index_words(self.content, self.context))
+        return self.score_parts(
+            importance=self.importance, memory_type=self.memory_type,
+            tag_overlap=tag_overlap, word_overlap=word_overlap,
+            created_at=datetime.fromisoformat(self.created_at),
+            last_recalled=datetime.fromisoformat(self.last_recalled) if self.last_recalled else None,
+            recall_count=self.recall_count, now=datetime.now(),
+        )
+
+    @classmethod
+    def score_parts(cls, importance: int, memory_type: str, tag_overlap: int, word_overlap: int,
+                    created_at: datetime, last_recalled: Optional[datetime], recall_count: int,
+                    now: datetime) -> float:
+        """relevance_score from precomputed pieces. the store's recall path
+        uses this so it never has to build a Memory or re-split text."""
+        score = importance / 10.0
+        score += tag_overlap * cls.TAG_OVERLAP_WEIGHT
+        if word_overlap:
+            score += min(word_overlap * cls.WORD_OVERLAP_WEIGHT, cls.WORD_OVERLAP_CAP)
+        if last_recalled is not None:
+            days = (now - last_recalled).days
+            if days < 7:
+                score += cls.RECENCY_BOOST_7D
+            elif days < 30:
+                score += cls.RECENCY_BOOST_30D
+        if (now - created_at).days > cls.DECAY_AGE_DAYS and recall_count < cls.DECAY_MIN_RECALLS:
+            score *= cls.DECAY_FACTOR
+        score += cls.TYPE_WEIGHTS.get(memory_type, 0)
         return round(score, 3)
 
-    def _tag_score(self, query_tags):
-        if not query_tags:
-            return 0.0
-        return len(set(self.tags) & set(query_tags)) * self.TAG_OVERLAP_WEIGHT
-
-    def _text_score(self, query_text):
-        if not query_text:
-            return 0.0
-        query_words = set(query_text.lower().split())
-        memory_words = set(self.content.lower().split()) | set(self.context.lower().split())
-        overlap = len(query_words & memory_words)
-        return min(overlap * self.WORD_OVERLAP_WEIGHT, self.WORD_OVERLAP_CAP) if overlap else 0.0
-
-    def _recency_score(self):
-        if not self.last_recalled:
-            return 0.0
-        days = (datetime.now() - datetime.fromisoformat(self.last_recalled)).days
-        if days < 7:
-            return self.RECENCY_BOOST_7D
-        if days < 30:
-            return self.RECENCY_BOOST_30D
-        return 0.0
-
-    def _apply_decay(self, score):
-        days_old = (datetime.now() - datetime.fromisoformat(self.created_at)).days
-        if days_old > self.DECAY_AGE_DAYS and self.recall_count < self.DECAY_MIN_RECALLS:
-            return score * self.DECAY_FACTOR
-        return score
+    @staticmethod
+    def index_words(content: str, context: str = "") -> set:
+        """the words recall matches a query against."""
+        return set(content.lower().split()) | set(context.lower().split())
 
 
 @dataclass
@@ -176,42 +178,21 @@ class MemberberryStore:
     shared (~/memberberries/) namespaces. Interface stays the same."""
 
     def __init__(self):
-        MEMBERBERRY_DIR.mkdir(parents=True, exist_ok=True)
-        self.memories: list[dict] = self._load(MEMORIES_FILE)
-        self.plans: list[dict] = self._load(PLANS_FILE)
+        Path(MEMBERBERRY_DIR).mkdir(parents=True, exist_ok=True)
+        # memories.json / plans.json are snapshots; writes append to a log
+        # beside them and get folded in by compaction. see logstore.py.
+        self._memory_log = RecordLog(MEMORIES_FILE)
+        self._plan_log = RecordLog(PLANS_FILE)
+        self.memories: list[dict] = self._memory_log.load()
+        self.plans: list[dict] = self._plan_log.load()
         self.config: dict = self._load_config()
-        self._content_hashes: set[str] = {
-            short_hash(m.get("content", ""), 16)
+        self._content_hashes: dict[str, str] = {
+            short_hash(m.get("content", ""), 16): m.get("id", "")
             for m in self.memories
         }
-
-    def _load(self, path: Path) -> list:
-        if not path.exists():
-            return []
-        if path.suffix == ".jsonl":
-            return self._load_jsonl(path)
-        with open(path, "r") as f:
-            return json.load(f)
-
-    @staticmethod
-    def _load_jsonl(path: Path) -> list:
-        records = []
-        by_id = {}
-        with open(path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                record = json.loads(line)
-                rid = record.get("id")
-                if record.get("_update") and rid in by_id:
-                    for k, v in record.items():
-                        if not k.startswith("_"):
-                            by_id[rid][k] = v
-                elif rid:
-                    by_id[rid] = record
-                    records.append(record)
-        return [r for r in records if r.get("id") in by_id]
+        self._pos: dict[str, int] = {m.get("id", ""): i for i, m in enumerate(self.memories)}
+        self._times: dict[str, tuple] = {}  # id -> (created_at, last_recalled) as datetimes
+        self._word_index, self._tag_index = self._load_index()
 
     @staticmethod
     def _append_jsonl(path: Path, record: dict):
@@ -269,20 +250,87 @@ class MemberberryStore:
         except OSError:
             pass
 
-    def _save_memories(self):
-        clean = [{k: v for k, v in m.items() if not k.startswith("_")} for m in self.memories]
-        with open(MEMORIES_FILE, "w") as f:
-            json.dump(clean, f, indent=2)
+    def _log_memory_changes(self, changes: list[dict]):
+        self._memory_log.update(changes)
+        self._maybe_compact_memories()
+
+    def _maybe_compact_memories(self):
+        if self._memory_log.needs_compaction(len(self.memories)):
+            self._memory_log.compact(self.memories)
+            self._save_index()
+
+    def _maybe_compact_plans(self):
+        if self._plan_log.needs_compaction(len(self.plans)):
+            self._plan_log.compact(self.plans)
+
+    # -- recall index --
+    # word -> ids and tag -> ids, persisted next to memories.json and keyed
+    # by the snapshot's signature. it's saved at compaction; memories added
+    # in the log tail since then get indexed on load. updates never change
+    # words or tags, so they don't invalidate it.
+
+    @staticmethod
+    def _index_path() -> Path:
+        return Path(MEMORIES_FILE).with_suffix(".index.json")
+
+    def _load_index(self) -> tuple[dict, dict]:
+        cached = read_json(self._index_path())
+        if cached and cached.get("signature") == self._memory_log.signature():
+            words = {w: set(ids) for w, ids in cached.get("words", {}).items()}
+            tags = {t: set(ids) for t, ids in cached.get("tags", {}).items()}
+            for mid in self._memory_log.tail_ids:
+                if mid in self._pos:
+                    self._index_memory(self.memories[self._pos[mid]], words, tags)
+            return words, tags
+
+        words, tags = {}, {}
+        for m in self.memories:
+            self._index_memory(m, words, tags)
+        if Path(MEMORIES_FILE).exists():
+            self._save_index(words, tags)
+        return words, tags
+
+    @staticmethod
+    def _index_memory(m: dict, words: dict, tags: dict):
+        mid = m.get("id", "")
+        for w in Memory.index_words(m.get("content", ""), m.get("context", "")):
+            words.setdefault(w, set()).add(mid)
+        for t in set(m.get("tags", [])):
+            tags.setdefault(t, set()).add(mid)
+
+    def _save_index(self, words: dict = None, tags: dict = None):
+        words = self._word_index if words is None else words
+        tags = self._tag_index if tags is None else tags
+        data = {
+            "signature": self._memory_log.signature(),
+            "words": {w: sorted(ids) for w, ids in words.items()},
+            "tags": {t: sorted(ids) for t, ids in tags.items()},
+        }
+        try:
+            write_json(self._index_path(), data, indent=None)
+        except OSError:
+            pass
 
-    def _save_plans(self):
-        with open(PLANS_FILE, "w") as f:
-            json.dump(self.plans, f, indent=2)
+    def _timestamps(self, m: dict) -> tuple:
+        """parsed (created_at, last_recalled), cached per id."""
+        mid = m.get("id", "")
+        cached = self._times.get(mid)
+        if cached is None or cached[2] != m.get("last_recalled", ""):
+            recalled = m.get("last_recalled", "")
+            created = m.get("created_at") or datetime.now().isoformat()
+            cached = (
+                datetime.fromisoformat(created),
+                datetime.fromisoformat(recalled) if recalled else None,
+                recalled,
+            )
+            self._times[mid] = cached
+        return cached[0], cached[1]
 
     def _is_duplicate(self, content: str) -> bool:
         return short_hash(content, 16) in self._content_hashes
 
-    def _track_content(self, content: str):
-        self._content_hashes.add(short_hash(content, 16))
+    def _track_content(self, content: str, memory_id: str = ""):
+        self._content_hashes[short_hash(content, 16)] = memory_id
 
     # -- Memory operations --
 
@@ -297,16 +345,17 @@ class MemberberryStore:
                          memory_type=memory.memory_type, tags=memory.tags):
             # fast path: exact hash dedup
             if self._is_duplicate(memory.content):
-                mem_hash = short_hash(memory.content, 16)
-                for m in self.memories:
-                    if short_hash(m.get("content", ""), 16) == mem_hash:
-                        debug("memory", "dedup: exact hash match", id=m.get("id", ""))
-                        return m.get("id", memory.id)
-                return memory.id
-
-            self._track_content(memory.content)
-            self.memories.append(asdict(memory))
-            self._save_memories()
+                existing = self._content_hashes[short_hash(memory.content, 16)]
+                debug("memory", "dedup: exact hash match", id=existing)
+                return existing or memory.id
+
+            self._track_content(memory.content, memory.id)
+            record = asdict(memory)
+            self._pos[memory.id] = len(self.memories)
+            self.memories.append(record)
+            self._index_memory(record, self._word_index, self._tag_index)
+            self._memory_log.append(record)
+            self._maybe_compact_memories()
             info("memory", f"remembered [{memory.memory_type}] {memory.content[:60]}",
                  id=memory.id)
 
@@ -326,38 +375,67 @@ class MemberberryStore:
 
     def _local_recall(self, query: str = "", tags: list = None,
                       memory_type: str = None, limit: int = 10) -> list[dict]:
-        candidates = []
-
-        for m_dict in self.memories:
-            clean = {k: v for k, v in m_dict.items() if not k.startswith("_")}
-            m = Memory(**clean)
+        """score and rank memories. with a query or tags, only memories that
+        share a word or tag with it are scored; with neither, everything is."""
+        query_words = set(query.lower().split()) if query else set()
+        tag_set = set(tags) if tags else set()
+
+        word_hits: dict[str, int] = {}
+        for w in query_words:
+            for mid in self._word_index.get(w, ()):
+                word_hits[mid] = word_hits.get(mid, 0) + 1
+        tag_hits: dict[str, int] = {}
+        for t in tag_set:
+            for mid in self._tag_index.get(t, ()):
+                tag_hits[mid] = tag_hits.get(mid, 0) + 1
+
+        if query_words or tag_set:
+            wanted = word_hits.keys() | tag_hits.keys()
+            pool = [self.memories[i] for i in sorted(self._pos[mid] for mid in wanted if mid in self._pos)]
+        else:
+            pool = self.memories
 
-            if memory_type and m.memory_type != memory_type:
+        now = datetime.now()
+        candidates = []
+        for m_dict in pool:
+            if memory_type and m_dict.get("memory_type") != memory_type:
                 continue
-
-            score = m.relevance_score(query_tags=tags, query_text=query)
+            mid = m_dict.get("id", "")
+            created, recalled = self._timestamps(m_dict)
+            score = Memory.score_parts(
+                importance=m_dict.get("importance", 5),
+                memory_type=m_dict.get("memory_type", ""),
+                tag_overlap=tag_hits.get(mid, 0),
+                word_overlap=word_hits.get(mid, 0),
+                created_at=created, last_recalled=recalled,
+                recall_count=m_dict.get("recall_count", 0), now=now,
+            )
             candidates.append((score, m_dict))
 
         candidates.sort(key=lambda x: x[0], reverse=True)
 
         results = []
+        deltas = []
+        stamp = now.isoformat()
         for score, m_dict in candidates[:limit]:
-            m_dict["last_recalled"] = datetime.now().isoformat()
+            m_dict["last_recalled"] = stamp
             m_dict["recall_count"] = m_dict.get("recall_count", 0) + 1
             m_dict["_relevance_score"] = score
             results.append(m_dict)
+            deltas.append({"id": m_dict.get("id", ""), "last_recalled": stamp,
+                           "recall_count": m_dict["recall_count"]})
 
-        self._save_memories()
+        self._log_memory_changes(deltas)
         return results
 
     def deprioritize(self, memory_id: str) -> bool:
         """Lower a memory's importance to 1. Nothing is ever deleted. Ever."""
-        for m in self.memories:
-            if m.get("id") == memory_id:
-                m["importance"] = 1
-                self._save_memories()
-                return True
-        return False
+        pos = self._pos.get(memory_id)
+        if pos is None:
+            return False
+        self.memories[pos]["importance"] = 1
+        self._log_memory_changes([{"id": memory_id, "importance": 1}])
+        return True
 
     def get_all_tags(self) -> list[str]:
         """Get all unique tags across memories."""
@@ -370,8 +448,10 @@ class MemberberryStore:
 
     def create_plan(self, plan: Plan) -> str:
         """Store a new plan. Returns the plan ID."""
-        self.plans.append(asdict(plan))
-        self._save_plans()
+        record = asdict(plan)
+        self.plans.append(record)
+        self._plan_log.append(record)
+        self._maybe_compact_plans()
         return plan.id
 
     def get_plans(self, status: str = None, tags: list = None) -> list[dict]:
@@ -389,7 +469,8 @@ class MemberberryStore:
         for p in self.plans:
             if p.get("id") == plan_id:
                 p["status"] = status
-                self._save_plans()
+                self._plan_log.update([{"id": plan_id, "status": status}])
+                self._maybe_compact_plans()
                 return True
         return False
 
@@ -13,17 +13,28 @@ upgrades:
   - model fallback chain (opus -> sonnet -> haiku on failure)
   - cost tracking per session
   - response caching (same prompt = cached response)
+  - pooled keep-alive connections (one session per endpoint)
+  - asyncio client with per-legend concurrency limits and deadlines
+  - structured messages with provider prompt caching
 """
 
+import asyncio
 import hashlib
 import json
 import os
 import sys
+import threading
 import time
+import weakref
 from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from keanu.io import write_bytes
 from keanu.legends import load_legend
 from keanu.log import debug, warn
 
@@ -86,12 +97,14 @@ def fallback_models(model: str) -> list[str]:
 # COST TRACKING
 # ============================================================
 
-# per-million-token pricing (input, output)
+# per-million-token pricing (input, output, cache write, cache read).
+# cache writes cost 1.25x input, cache reads 0.1x.
 _PRICING = {
-    "claude-opus-4-6": (15.0, 75.0),
-    "claude-sonnet-4-5-20250929": (3.0, 15.0),
-    "claude-haiku-4-5-20251001": (1.0, 5.0),
+    "claude-opus-4-6": (5.0, 25.0, 6.25, 0.50),
+    "claude-sonnet-4-5-20250929": (3.0, 15.0, 3.75, 0.30),
+    "claude-haiku-4-5-20251001": (1.0, 5.0, 1.25, 0.10),
 }
+_DEFAULT_PRICING = (3.0, 15.0, 3.75, 0.30)
 
 
 @dataclass
@@ -102,6 +115,9 @@ class OracleUsage:
     output_tokens: int = 0
     cached: bool = False
     latency_ms: int = 0
+    connection_reused: bool = False  # rode an already-open keep-alive connection
+    cache_write_tokens: int = 0  # prompt tokens written to the provider's cache
+    cache_read_tokens: int = 0   # prompt tokens served from it
 
     @property
     def total_tokens(self) -> int:
@@ -109,11 +125,14 @@ class OracleUsage:
 
     @property
     def cost(self) -> float:
-        """estimated cost in dollars."""
-        pricing = _PRICING.get(self.model, (3.0, 15.0))
+        """estimated cost in dollars. input_tokens excludes cached ones,
+        the way anthropic reports it."""
+        pricing = _PRICING.get(self.model, _DEFAULT_PRICING)
         input_cost = (self.input_tokens / 1_000_000) * pricing[0]
         output_cost = (self.output_tokens / 1_000_000) * pricing[1]
-        return input_cost + output_cost
+        cache_cost = (self.cache_write_tokens * pricing[2]
+                      + self.cache_read_tokens * pricing[3]) / 1_000_000
+        return input_cost + output_cost + cache_cost
 
 
 @dataclass
@@ -124,6 +143,10 @@ class SessionCost:
     total_output_tokens: int = 0
     total_cost: float = 0.0
     cache_hits: int = 0
+    cache_misses: int = 0
+    connections_reused: int = 0
+    total_cache_write_tokens: int = 0
+    total_cache_read_tokens: int = 0
     by_model: dict = field(default_factory=dict)
 
     def record(self, usage: OracleUsage):
@@ -131,8 +154,12 @@ class SessionCost:
         self.total_input_tokens += usage.input_tokens
         self.total_output_tokens += usage.output_tokens
         self.total_cost += usage.cost
+        self.total_cache_write_tokens += usage.cache_write_tokens
+        self.total_cache_read_tokens += usage.cache_read_tokens
         if usage.cached:
             self.cache_hits += 1
+        if usage.connection_reused:
+            self.connections_reused += 1
         model_stats = self.by_model.setdefault(usage.model, {"calls": 0, "tokens": 0, "cost": 0.0})
         model_stats["calls"] += 1
         model_stats["tokens"] += usage.total_tokens
@@ -140,7 +167,10 @@ class SessionCost:
 
     def summary(self) -> str:
         return (f"{self.calls} calls, {self.total_input_tokens + self.total_output_tokens} tokens, "
-                f"${self.total_cost:.4f}, {self.cache_hits} cache hits")
+                f"${self.total_cost:.4f}, {self.cache_hits} cache hits, "
+                f"{self.cache_misses} cache misses, "
+                f"{self.total_cache_read_tokens} prompt-cached tokens, "
+                f"{self.connections_reused} reused connections")
 
 
 # global session cost tracker
@@ -158,32 +188,261 @@ def reset_session_cost():
     _session_cost = SessionCost()
 
 
+# ============================================================
+# CONNECTION POOL
+# ============================================================
+
+# max keep-alive connections per endpoint. leaf agents in hero/loop.py
+# and the coordinate pipeline call from threads; each thread checks a
+# connection out of the pool and puts it back when the response is read.
+POOL_SIZE = int(os.environ.get("KEANU_ORACLE_POOL_SIZE", "16"))
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_conn = threading.local()  # opened: connections this thread opened since _post began
+
+
+class _TrackedHTTPPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _conn.opened = getattr(_conn, "opened", 0) + 1
+        return super()._new_conn()
+
+
+class _TrackedHTTPSPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _conn.opened = getattr(_conn, "opened", 0) + 1
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools note, per thread, when they had to open a
+    fresh connection instead of reusing a kept-alive one."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TrackedHTTPPool,
+            "https": _TrackedHTTPSPool,
+        }
+
+
+def _session(endpoint: str) -> requests.Session:
+    """the shared session for an endpoint's scheme and host."""
+    parts = urlsplit(endpoint)
+    key = f"{parts.scheme}://{parts.netloc}"
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = _PooledAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[key] = session
+    return session
+
+
+def set_pool_size(size: int):
+    """change the per-endpoint pool size. open sessions are closed and
+    rebuilt on next use."""
+    global POOL_SIZE
+    POOL_SIZE = size
+    close_sessions()
+
+
+def close_sessions():
+    """close every pooled connection."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _post(endpoint: str, **kwargs) -> requests.Response:
+    """POST through the endpoint's pooled session. afterwards
+    _connection_reused() says whether it needed a new connection."""
+    _conn.opened = 0
+    return _session(endpoint).post(endpoint, **kwargs)
+
+
+def _connection_reused() -> bool:
+    return getattr(_conn, "opened", 1) == 0
+
+
 # ============================================================
 # RESPONSE CACHE
 # ============================================================
 
-_RESPONSE_CACHE: dict[str, tuple[str, float]] = {}
-_CACHE_TTL = 300  # 5 minutes
+_CACHE_TTL = int(os.environ.get("KEANU_ORACLE_CACHE_TTL", "86400"))  # a day
 
+# ttl overrides in seconds, keyed by model or legend name. model wins.
+CACHE_TTLS: dict[str, int] = {}
 
-def _cache_key(prompt: str, system: str, model: str) -> str:
-    raw = f"{model}:{system}:{prompt}"
-    return hashlib.md5(raw.encode()).hexdigest()
 
+class ResponseCache:
+    """oracle responses on disk, one JSON file per prompt, under
+    keanu_home()/oracle_cache. outlives the process, so repeated CLI runs
+    and CI jobs reuse answers.
 
-def _get_cached_response(prompt: str, system: str, model: str) -> str | None:
-    key = _cache_key(prompt, system, model)
-    if key in _RESPONSE_CACHE:
-        response, ts = _RESPONSE_CACHE[key]
-        if time.time() - ts < _CACHE_TTL:
-            return response
-        del _RESPONSE_CACHE[key]
-    return None
+    bounded by entry count and total bytes. a file's mtime is its last
+    use, so eviction drops the least recently used first, across every
+    process sharing the directory. expired entries are dropped on read.
+    """
 
+    def __init__(self, directory: Path | None = None, max_entries: int = 2000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self._directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._usage = None  # name -> [size, last_used], scanned on first put
+        self._lock = threading.Lock()
 
-def _set_cached_response(prompt: str, system: str, model: str, response: str):
-    key = _cache_key(prompt, system, model)
-    _RESPONSE_CACHE[key] = (response, time.time())
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            from keanu.paths import keanu_home
+            self._directory = keanu_home() / "oracle_cache"
+        return self._directory
+
+    @staticmethod
+    def key(prompt, system: str, model: str, legend: str = "") -> str:
+        if not isinstance(prompt, str):
+            prompt = json.dumps([[m["role"], m["content"]] for m in prompt])
+        raw = f"{legend}\0{model}\0{system}\0{prompt}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def ttl(model: str, legend: str = "") -> int:
+        return CACHE_TTLS.get(model, CACHE_TTLS.get(legend, _CACHE_TTL))
+
+    def get(self, prompt: str, system: str, model: str, legend: str = "") -> str | None:
+        path = self.directory / f"{self.key(prompt, system, model, legend)}.json"
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() >= entry.get("expires", 0):
+            self._drop(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if self._usage is not None and path.name in self._usage:
+                self._usage[path.name][1] = time.time()
+        return entry.get("response")
+
+    def put(self, prompt: str, system: str, model: str, response: str, legend: str = ""):
+        now = time.time()
+        data = json.dumps({
+            "model": model, "legend": legend, "created": now,
+            "expires": now + self.ttl(model, legend), "response": response,
+        })
+        path = self.directory / f"{self.key(prompt, system, model, legend)}.json"
+        try:
+            write_bytes(path, data.encode())
+        except OSError:
+            return
+        with self._lock:
+            usage = self._scan()
+            usage[path.name] = [len(data), now]
+            self._evict(usage)
+
+    def clear(self):
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._usage = {}
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+    def _scan(self) -> dict:
+        if self._usage is None:
+            self._usage = {}
+            for path in self.directory.glob("*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                self._usage[path.name] = [st.st_size, st.st_mtime]
+        return self._usage
+
+    def _evict(self, usage: dict):
+        total = sum(size for size, _ in usage.values())
+        if len(usage) <= self.max_entries and total <= self.max_bytes:
+            return
+        for name in sorted(usage, key=lambda n: usage[n][1]):
+            if len(usage) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= usage.pop(name)[0]
+            (self.directory / name).unlink(missing_ok=True)
+
+    def _drop(self, path: Path):
+        path.unlink(missing_ok=True)
+        with self._lock:
+            if self._usage is not None:
+                self._usage.pop(path.name, None)
+
+
+_RESPONSE_CACHE = ResponseCache()
+
+
+def _cache_key(prompt: str, system: str, model: str, legend: str = "") -> str:
+    return ResponseCache.key(prompt, system, model, legend)
+
+
+def _get_cached_response(prompt: str, system: str, model: str, legend: str = "") -> str | None:
+    return _RESPONSE_CACHE.get(prompt, system, model, legend)
+
+
+def _set_cached_response(prompt: str, system: str, model: str, response: str, legend: str = ""):
+    _RESPONSE_CACHE.put(prompt, system, model, response, legend)
+
+
+# ============================================================
+# MESSAGES
+# ============================================================
+# a prompt is a string or a list of messages:
+#     {"role": "user" | "assistant", "content": str, "cache": bool}
+# "cache" marks the end of a stable prefix. providers that cache prompts
+# (anthropic) keep everything up to a mark warm between calls, so the
+# system prompt and the early turns of an agent session are billed at
+# the cache-read rate. other providers get the flattened text.
+
+MAX_CACHE_BREAKPOINTS = 4  # anthropic's limit per request, system prompt included
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def flatten_messages(prompt) -> str:
+    """the prompt as plain text, blank-line separated. strings pass through."""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join(m["content"] for m in prompt)
+
+
+def _cloud_messages(prompt) -> list[dict]:
+    """anthropic messages. consecutive messages from the same role merge
+    into one message of several text blocks. only the last few cache
+    marks are kept, leaving room for the system prompt's."""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    marks = [i for i, m in enumerate(prompt) if m.get("cache")]
+    marks = set(marks[-(MAX_CACHE_BREAKPOINTS - 1):])
+    messages = []
+    for i, m in enumerate(prompt):
+        if not m["content"]:
+            continue  # the api rejects empty text blocks
+        block = {"type": "text", "text": m["content"]}
+        if i in marks:
+            block["cache_control"] = _CACHE_CONTROL
+        if messages and messages[-1]["role"] == m["role"]:
+            messages[-1]["content"].append(block)
+        else:
+            messages.append({"role": m["role"], "content": [block]})
+    return messages
 
 
 # ============================================================
@@ -196,12 +455,15 @@ def call_oracle(prompt, system="", legend="creator", model=None,
 
     The main entry point for talking to any AI in the system.
     Takes a prompt (what you want to ask) and an optional system message
-    (context/instructions for the AI). The legend parameter picks which
-    AI answers: "creator" for Claude/DeepSeek, or pass a Legend object
-    directly. The model parameter overrides the legend's default model.
+    (context/instructions for the AI). The prompt can also be a list of
+    messages with stable prefixes marked for prompt caching (see
+    MESSAGES). The legend parameter picks which AI answers: "creator" for
+    Claude/DeepSeek, or pass a Legend object directly. The model
+    parameter overrides the legend's default model.
 
     New options:
-      use_cache: if True, check response cache before calling the API.
+      use_cache: if True, check the on-disk response cache before calling
+        the API, and store the answer after.
       use_fallback: if True, try fallback models on failure.
 
     Returns the AI's response as a string. Raises ConnectionError if
@@ -214,10 +476,8 @@ def call_oracle(prompt, system="", legend="creator", model=None,
 
     # check cache
     if use_cache:
-        cached = _get_cached_response(prompt, system, use_model)
+        cached = _cache_lookup(prompt, system, leg, use_model)
         if cached is not None:
-            usage = OracleUsage(model=use_model, cached=True)
-            _session_cost.record(usage)
             return cached
 
     start_time = time.time()
@@ -238,30 +498,8 @@ def call_oracle(prompt, system="", legend="creator", model=None,
                 raise ConnectionError(f"don't know how to reach legend '{leg.name}' (reach={leg.reach})")
 
             if result is not None:
-                latency = int((time.time() - start_time) * 1000)
-                usage = OracleUsage(
-                    model=try_model,
-                    input_tokens=api_usage.get("input_tokens", estimate_tokens(prompt + system)),
-                    output_tokens=api_usage.get("output_tokens", estimate_tokens(result)),
-                    latency_ms=latency,
-                )
-                _session_cost.record(usage)
-
-                if use_cache:
-                    _set_cached_response(prompt, system, try_model, result)
-
-                debug("oracle", f"[{leg.name}/{try_model}] prompt ({len(prompt)} chars): {prompt[:150]}")
-                debug("oracle", f"[{leg.name}/{try_model}] response ({len(result)} chars): {result[:300]}")
-                debug("oracle", f"[{leg.name}/{try_model}] {usage.input_tokens}+{usage.output_tokens} tokens, ${usage.cost:.4f}")
-
-                # track fire metrics (best-effort)
-                try:
-                    from keanu.abilities.world.metrics import record_fire
-                    record_fire(prompt[:100], legend=leg.name, model=try_model,
-                                tokens=usage.total_tokens)
-                except Exception:
-                    pass
-
+                _record_call(prompt, system, leg, use_model, try_model, result, api_usage,
+                             start_time, use_cache)
                 return result
         except (requests.exceptions.HTTPError, ConnectionError) as e:
             last_error = e
@@ -274,6 +512,56 @@ def call_oracle(prompt, system="", legend="creator", model=None,
     raise ConnectionError(f"no response from {leg.name}")
 
 
+def _cache_lookup(prompt, system, leg, use_model):
+    """cached answer or None. counts the hit or miss."""
+    cached = _get_cached_response(prompt, system, use_model, leg.name)
+    if cached is not None:
+        _session_cost.record(OracleUsage(model=use_model, cached=True))
+        return cached
+    _session_cost.cache_misses += 1
+    return None
+
+
+def _record_call(prompt, system, leg, use_model, try_model, result, api_usage,
+                 start_time, use_cache) -> OracleUsage:
+    """book-keeping after an answer: usage, cache, debug log, fire metrics."""
+    latency = int((time.time() - start_time) * 1000)
+    text = flatten_messages(prompt)
+    usage = OracleUsage(
+        model=try_model,
+        input_tokens=api_usage.get("input_tokens", estimate_tokens(text + system)),
+        output_tokens=api_usage.get("output_tokens", estimate_tokens(result)),
+        latency_ms=latency,
+        connection_reused=api_usage.get("connection_reused", False),
+        cache_write_tokens=api_usage.get("cache_creation_input_tokens") or 0,
+        cache_read_tokens=api_usage.get("cache_read_input_tokens") or 0,
+    )
+    _session_cost.record(usage)
+
+    if use_cache and try_model == use_model:
+        # a fallback's answer isn't the asked-for model's answer, so the
+        # next call tries that model again instead of reading it back
+        _set_cached_response(prompt, system, use_model, result, leg.name)
+
+    debug("oracle", f"[{leg.name}/{try_model}] prompt ({len(text)} chars): {text[:150]}")
+    debug("oracle", f"[{leg.name}/{try_model}] response ({len(result)} chars): {result[:300]}")
+    debug("oracle", f"[{leg.name}/{try_model}] {usage.input_tokens}+{usage.output_tokens} tokens "
+                    f"({usage.cache_read_tokens} cache read), ${usage.cost:.4f}")
+
+    _record_fire(prompt, leg, try_model, usage)
+    return usage
+
+
+def _record_fire(prompt, legend, model, usage):
+    # track fire metrics (best-effort)
+    try:
+        from keanu.abilities.world.metrics import record_fire
+        record_fire(flatten_messages(prompt)[:100], legend=legend.name if hasattr(legend, 'name') else str(legend),
+                    model=model, tokens=usage.total_tokens)
+    except Exception:
+        pass
+
+
 # ============================================================
 # STREAMING
 # ============================================================
@@ -300,140 +588,164 @@ def stream_oracle(prompt, system="", legend="creator", model=None,
 
 
 def collect_stream(prompt, system="", legend="creator", model=None,
-                   on_token=None) -> str:
-    """stream tokens and return the full collected response."""
+                   on_token=None, use_cache=False) -> str:
+    """stream tokens and return the full collected response.
+
+    with use_cache, a cached answer comes back as one token and a fresh
+    one is stored once the stream finishes.
+    """
+    if use_cache:
+        leg = load_legend(legend) if isinstance(legend, str) else legend
+        use_model = model or leg.model
+        cached = _cache_lookup(prompt, system, leg, use_model)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+        legend = leg
+
     chunks = []
     for chunk in stream_oracle(prompt, system, legend, model, on_token):
         chunks.append(chunk)
-    return "".join(chunks)
+    result = "".join(chunks)
+    if use_cache and result:
+        _set_cached_response(prompt, system, use_model, result, leg.name)
+    return result
 
 
 def _stream_cloud(prompt, system, legend, model, on_token, start_time):
     """stream from anthropic API."""
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("  Set ANTHROPIC_API_KEY environment variable", file=sys.stderr)
+    headers = _cloud_headers()
+    if headers is None:
         return
 
-    response = requests.post(
+    response = _post(
         legend.endpoint,
-        headers={
-            "x-api-key": api_key,
-            "content-type": "application/json",
-            "anthropic-version": "2023-06-01",
-        },
-        json={
-            "model": model,
-            "max_tokens": 2000,
-            "system": system,
-            "messages": [{"role": "user", "content": prompt}],
-            "stream": True,
-        },
+        headers=headers,
+        json=_cloud_body(prompt, system, model, stream=True),
         timeout=120,
         stream=True,
     )
-    response.raise_for_status()
-
-    full_text = ""
-    input_tokens = 0
-    output_tokens = 0
+    reused = _connection_reused()
 
-    for line in response.iter_lines():
-        if not line:
-            continue
-        line = line.decode("utf-8")
-        if not line.startswith("data: "):
-            continue
-        data_str = line[6:]
-        if data_str.strip() == "[DONE]":
-            break
-        try:
-            event = json.loads(data_str)
-        except json.JSONDecodeError:
-            continue
-
-        event_type = event.get("type", "")
-
-        if event_type == "content_block_delta":
-            delta = event.get("delta", {})
-            text = delta.get("text", "")
+    # close on every exit so the pooled connection goes back to the session
+    parser = _CloudStream()
+    with response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            text = parser.feed(line.decode("utf-8"))
             if text:
-                full_text += text
                 if on_token:
                     on_token(text)
                 yield text
+            if parser.done:
+                break
 
-        elif event_type == "message_delta":
-            usage = event.get("usage", {})
-            output_tokens = usage.get("output_tokens", output_tokens)
-
-        elif event_type == "message_start":
-            msg = event.get("message", {})
-            usage = msg.get("usage", {})
-            input_tokens = usage.get("input_tokens", 0)
-
-    # record usage
-    latency = int((time.time() - start_time) * 1000)
-    usage = OracleUsage(
-        model=model,
-        input_tokens=input_tokens or estimate_tokens(prompt + system),
-        output_tokens=output_tokens or estimate_tokens(full_text),
-        latency_ms=latency,
-    )
+    usage = parser.usage(prompt, system, model, start_time, reused)
     _session_cost.record(usage)
-
-    try:
-        from keanu.abilities.world.metrics import record_fire
-        record_fire(prompt[:100], legend=legend.name if hasattr(legend, 'name') else str(legend),
-                    model=model, tokens=usage.total_tokens)
-    except Exception:
-        pass
+    _record_fire(prompt, legend, model, usage)
 
 
 def _stream_local(prompt, system, legend, model, on_token, start_time):
     """stream from ollama API."""
-    endpoint = legend.endpoint or "http://localhost:11434/api/generate"
+    endpoint = _local_endpoint(legend)
     try:
-        response = requests.post(
+        response = _post(
             endpoint,
-            json={
-                "model": model,
-                "prompt": prompt,
-                "system": system,
-                "stream": True,
-                "options": {"temperature": 0.7},
-            },
+            json=_local_body(prompt, system, model, stream=True),
             timeout=120,
             stream=True,
         )
-        response.raise_for_status()
+        reused = _connection_reused()
     except requests.exceptions.ConnectionError:
         print(f"  can't reach local legend at {endpoint}", file=sys.stderr)
         return
 
     full_text = ""
-    for line in response.iter_lines():
-        if not line:
-            continue
+    with response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            chunk = _local_stream_chunk(line)
+            if chunk:
+                full_text += chunk
+                if on_token:
+                    on_token(chunk)
+                yield chunk
+
+    _session_cost.record(_local_stream_usage(prompt, system, model, full_text, start_time, reused))
+
+
+class _CloudStream:
+    """reads anthropic server-sent events one line at a time."""
+
+    def __init__(self):
+        self.text = ""
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_write_tokens = 0
+        self.cache_read_tokens = 0
+        self.done = False
+
+    def feed(self, line: str) -> str:
+        """returns the text this line adds, if any."""
+        if not line.startswith("data: "):
+            return ""
+        data_str = line[6:]
+        if data_str.strip() == "[DONE]":
+            self.done = True
+            return ""
         try:
-            data = json.loads(line)
+            event = json.loads(data_str)
         except json.JSONDecodeError:
-            continue
-        chunk = data.get("response", "")
-        if chunk:
-            full_text += chunk
-            if on_token:
-                on_token(chunk)
-            yield chunk
+            return ""
 
-    latency = int((time.time() - start_time) * 1000)
-    usage = OracleUsage(
+        event_type = event.get("type", "")
+
+        if event_type == "content_block_delta":
+            text = event.get("delta", {}).get("text", "")
+            self.text += text
+            return text
+        elif event_type == "message_delta":
+            self.output_tokens = event.get("usage", {}).get("output_tokens", self.output_tokens)
+        elif event_type == "message_start":
+            usage = event.get("message", {}).get("usage", {})
+            self.input_tokens = usage.get("input_tokens", 0)
+            self.cache_write_tokens = usage.get("cache_creation_input_tokens") or 0
+            self.cache_read_tokens = usage.get("cache_read_input_tokens") or 0
+        return ""
+
+    def usage(self, prompt, system, model, start_time, reused=False) -> OracleUsage:
+        return OracleUsage(
+            model=model,
+            input_tokens=self.input_tokens or estimate_tokens(flatten_messages(prompt) + system),
+            output_tokens=self.output_tokens or estimate_tokens(self.text),
+            latency_ms=int((time.time() - start_time) * 1000),
+            connection_reused=reused,
+            cache_write_tokens=self.cache_write_tokens,
+            cache_read_tokens=self.cache_read_tokens,
+        )
+
+
+def _local_stream_chunk(line) -> str:
+    if not line:
+        return ""
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return ""
+    return data.get("response", "")
+
+
+def _local_stream_usage(prompt, system, model, full_text, start_time, reused=False) -> OracleUsage:
+    return OracleUsage(
         model=model,
-        input_tokens=estimate_tokens(prompt + system),
+        input_tokens=estimate_tokens(flatten_messages(prompt) + system),
         output_tokens=estimate_tokens(full_text),
-        latency_ms=latency,
+        latency_ms=int((time.time() - start_time) * 1000),
+        connection_reused=reused,
     )
-    _session_cost.record(usage)
 
 
 def interpret(text):
@@ -469,35 +781,81 @@ def try_interpret(text):
 # REACH IMPLEMENTATIONS
 # ============================================================
 
+def _cloud_headers() -> dict | None:
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("  Set ANTHROPIC_API_KEY environment variable", file=sys.stderr)
+        return None
+    return {
+        "x-api-key": api_key,
+        "content-type": "application/json",
+        "anthropic-version": "2023-06-01",
+    }
+
+
+def _cloud_body(prompt, system, model, stream=False) -> dict:
+    body = {
+        "model": model,
+        "max_tokens": 2000,
+        "system": system,
+        "messages": _cloud_messages(prompt),
+    }
+    if system and not isinstance(prompt, str):
+        # structured prompts opt in to caching; the system prompt is the
+        # most stable prefix there is
+        body["system"] = [{"type": "text", "text": system, "cache_control": _CACHE_CONTROL}]
+    if stream:
+        body["stream"] = True
+    return body
+
+
+def _cloud_result(data: dict, reused: bool):
+    text = data["content"][0]["text"]
+    usage = {**data.get("usage", {}), "connection_reused": reused}
+    return text, usage
+
+
+def _local_endpoint(legend) -> str:
+    return legend.endpoint or "http://localhost:11434/api/generate"
+
+
+def _local_body(prompt, system, model, stream=False) -> dict:
+    return {
+        "model": model,
+        "prompt": flatten_messages(prompt),
+        "system": system,
+        "stream": stream,
+        "options": {"temperature": 0.7},
+    }
+
+
+def _local_result(data: dict, reused: bool):
+    # ollama provides some usage stats
+    usage = {
+        "input_tokens": data.get("prompt_eval_count", 0),
+        "output_tokens": data.get("eval_count", 0),
+        "connection_reused": reused,
+    }
+    return data["response"], usage
+
+
 def _reach_cloud(prompt, system, legend, model):
     """reach a cloud-hosted AI. returns (text, usage_dict).
 
     in the world: reaching fire that lives on someone else's iron.
     """
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("  Set ANTHROPIC_API_KEY environment variable", file=sys.stderr)
+    headers = _cloud_headers()
+    if headers is None:
         return None, {}
-    response = requests.post(
+    response = _post(
         legend.endpoint,
-        headers={
-            "x-api-key": api_key,
-            "content-type": "application/json",
-            "anthropic-version": "2023-06-01",
-        },
-        json={
-            "model": model,
-            "max_tokens": 2000,
-            "system": system,
-            "messages": [{"role": "user", "content": prompt}],
-        },
+        headers=headers,
+        json=_cloud_body(prompt, system, model),
         timeout=120,
     )
+    reused = _connection_reused()
     response.raise_for_status()
-    data = response.json()
-    text = data["content"][0]["text"]
-    usage = data.get("usage", {})
-    return text, usage
+    return _cloud_result(response.json(), reused)
 
 
 def _reach_local(prompt, system, legend, model):
@@ -505,28 +863,279 @@ def _reach_local(prompt, system, legend, model):
 
     in the world: reaching fire that burns on your own machine.
     """
-    endpoint = legend.endpoint or "http://localhost:11434/api/generate"
+    endpoint = _local_endpoint(legend)
     try:
-        response = requests.post(
+        response = _post(
             endpoint,
-            json={
-                "model": model,
-                "prompt": prompt,
-                "system": system,
-                "stream": False,
-                "options": {"temperature": 0.7},
-            },
+            json=_local_body(prompt, system, model),
             timeout=120,
         )
+        reused = _connection_reused()
         response.raise_for_status()
-        data = response.json()
-        text = data["response"]
-        # ollama provides some usage stats
-        usage = {
-            "input_tokens": data.get("prompt_eval_count", 0),
-            "output_tokens": data.get("eval_count", 0),
-        }
-        return text, usage
+        return _local_result(response.json(), reused)
     except requests.exceptions.ConnectionError:
         print(f"  can't reach local legend at {endpoint}", file=sys.stderr)
         return None, {}
+
+
+# ============================================================
+# ASYNC
+# ============================================================
+# the same calls on asyncio, for fan-out that wants dozens of requests
+# in flight on one thread. each legend gets a semaphore so a burst can't
+# flood one provider. httpx clients belong to an event loop, so each
+# loop gets its own.
+
+_DEFAULT_CONCURRENCY = int(os.environ.get("KEANU_ORACLE_CONCURRENCY", "8"))
+CONCURRENCY: dict[str, int] = {}  # legend name -> max requests in flight
+
+_async_state = weakref.WeakKeyDictionary()  # event loop -> {"client", "limits"}
+
+
+def _loop_state() -> dict:
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        import httpx
+        state = _async_state[loop] = {
+            "client": httpx.AsyncClient(
+                timeout=120,
+                limits=httpx.Limits(max_keepalive_connections=POOL_SIZE),
+            ),
+            "limits": {},
+        }
+    return state
+
+
+def _limit(legend_name: str) -> asyncio.Semaphore:
+    limits = _loop_state()["limits"]
+    if legend_name not in limits:
+        limits[legend_name] = asyncio.Semaphore(CONCURRENCY.get(legend_name, _DEFAULT_CONCURRENCY))
+    return limits[legend_name]
+
+
+async def aclose_oracle():
+    """close the running loop's client. the sync shims do this for you."""
+    state = _async_state.pop(asyncio.get_running_loop(), None)
+    if state:
+        await state["client"].aclose()
+
+
+async def _areach_cloud(prompt, system, legend, model):
+    headers = _cloud_headers()
+    if headers is None:
+        return None, {}
+    client = _loop_state()["client"]
+    response = await client.post(legend.endpoint, headers=headers,
+                                 json=_cloud_body(prompt, system, model))
+    response.raise_for_status()
+    return _cloud_result(response.json(), False)
+
+
+async def _areach_local(prompt, system, legend, model):
+    import httpx
+
+    endpoint = _local_endpoint(legend)
+    client = _loop_state()["client"]
+    try:
+        response = await client.post(endpoint, json=_local_body(prompt, system, model))
+        response.raise_for_status()
+        return _local_result(response.json(), False)
+    except httpx.ConnectError:
+        print(f"  can't reach local legend at {endpoint}", file=sys.stderr)
+        return None, {}
+
+
+async def _before(deadline_at, awaitable):
+    """await, but give up at deadline_at (loop time). None waits forever."""
+    if deadline_at is None:
+        return await awaitable
+    remaining = deadline_at - asyncio.get_running_loop().time()
+    try:
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise TimeoutError("oracle deadline passed") from None
+
+
+async def acall_oracle(prompt, system="", legend="creator", model=None,
+                       use_cache=False, use_fallback=False, deadline=None):
+    """call_oracle for asyncio.
+
+    deadline: seconds for the whole call, waiting for a concurrency slot
+    and fallbacks included. raises TimeoutError when it passes.
+    cancelling the task cancels the request in flight.
+
+    in the world: many throats, one breath.
+    """
+    import httpx
+
+    leg = load_legend(legend) if isinstance(legend, str) else legend
+    use_model = model or leg.model
+
+    if use_cache:
+        cached = _cache_lookup(prompt, system, leg, use_model)
+        if cached is not None:
+            return cached
+
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline is not None else None
+    start_time = time.time()
+
+    models_to_try = [use_model]
+    if use_fallback:
+        models_to_try.extend(fallback_models(use_model))
+
+    last_error = None
+    sem = _limit(leg.name)
+    await _before(deadline_at, sem.acquire())
+    try:
+        for try_model in models_to_try:
+            try:
+                if leg.reach == "cloud":
+                    reach = _areach_cloud(prompt, system, leg, try_model)
+                elif leg.reach == "local":
+                    reach = _areach_local(prompt, system, leg, try_model)
+                else:
+                    raise ConnectionError(f"don't know how to reach legend '{leg.name}' (reach={leg.reach})")
+                result, api_usage = await _before(deadline_at, reach)
+
+                if result is not None:
+                    _record_call(prompt, system, leg, use_model, try_model, result, api_usage,
+                                 start_time, use_cache)
+                    return result
+            except (httpx.HTTPStatusError, ConnectionError) as e:
+                last_error = e
+                if try_model != models_to_try[-1]:
+                    warn("oracle", f"{try_model} failed ({e}), falling back")
+                continue
+    finally:
+        sem.release()
+
+    if last_error:
+        raise ConnectionError(f"all models failed. last error: {last_error}")
+    raise ConnectionError(f"no response from {leg.name}")
+
+
+async def astream_oracle(prompt, system="", legend="creator", model=None,
+                         on_token=None, deadline=None):
+    """stream_oracle for asyncio. an async generator of text chunks.
+    holds the legend's concurrency slot until the stream ends."""
+    import httpx
+
+    leg = load_legend(legend) if isinstance(legend, str) else legend
+    use_model = model or leg.model
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline is not None else None
+    start_time = time.time()
+
+    if leg.reach == "cloud":
+        headers = _cloud_headers()
+        if headers is None:
+            return
+        endpoint, body = leg.endpoint, _cloud_body(prompt, system, use_model, stream=True)
+        parser = _CloudStream()
+    elif leg.reach == "local":
+        headers = None
+        endpoint, body = _local_endpoint(leg), _local_body(prompt, system, use_model, stream=True)
+        parser = None
+    else:
+        raise ConnectionError(f"don't know how to stream legend '{leg.name}'")
+
+    sem = _limit(leg.name)
+    await _before(deadline_at, sem.acquire())
+    try:
+        client = _loop_state()["client"]
+        full_text = ""
+        try:
+            async with client.stream("POST", endpoint, headers=headers, json=body) as response:
+                response.raise_for_status()
+                lines = response.aiter_lines().__aiter__()
+                while True:
+                    try:
+                        line = await _before(deadline_at, lines.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    text = parser.feed(line) if parser else _local_stream_chunk(line)
+                    if text:
+                        full_text += text
+                        if on_token:
+                            on_token(text)
+                        yield text
+                    if parser and parser.done:
+                        break
+        except httpx.ConnectError:
+            if parser:
+                raise
+            print(f"  can't reach local legend at {endpoint}", file=sys.stderr)
+            return
+    finally:
+        sem.release()
+
+    if parser:
+        usage = parser.usage(prompt, system, use_model, start_time)
+        _session_cost.record(usage)
+        _record_fire(prompt, leg, use_model, usage)
+    else:
+        _session_cost.record(_local_stream_usage(prompt, system, use_model, full_text, start_time))
+
+
+def gather_oracle(prompts, system="", legend="creator", model=None, deadline=None, **kwargs) -> list:
+    """run many oracle calls at once from sync code, on one thread.
+
+    prompts: strings, or (prompt, system) pairs. returns answers in the
+    same order; a call that failed leaves its exception in its slot.
+    extra kwargs go to acall_oracle.
+    """
+    pairs = [p if isinstance(p, tuple) else (p, system) for p in prompts]
+
+    async def main():
+        try:
+            return await asyncio.gather(
+                *(acall_oracle(p, s, legend, model, deadline=deadline, **kwargs) for p, s in pairs),
+                return_exceptions=True,
+            )
+        finally:
+            await aclose_oracle()
+
+    return _run_sync(main())
+
+
+def race_oracle(prompts, accept=None, system="", legend="creator", model=None,
+                deadline=None, **kwargs) -> str | None:
+    """first answer that accept(answer) likes, or any answer if accept is
+    None. the calls still running get cancelled. None if nobody
+    delivered."""
+    pairs = [p if isinstance(p, tuple) else (p, system) for p in prompts]
+
+    async def main():
+        tasks = [asyncio.ensure_future(acall_oracle(p, s, legend, model, deadline=deadline, **kwargs))
+                 for p, s in pairs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception:
+                    continue
+                if accept is None or accept(result):
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await aclose_oracle()
+
+    return _run_sync(main())
+
+
+def _run_sync(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError("already inside an event loop: await acall_oracle instead")
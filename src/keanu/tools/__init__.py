@@ -1,8 +1,12 @@
 """tools - pure utilities, zero keanu imports."""
 
-from keanu.tools.cache import FileCache, ASTCache, SymbolCache, CacheEntry
+from keanu.tools.cache import (
+    FileCache, ASTCache, SymbolCache, CacheEntry, TextCache,
+    file_cache, ast_cache, text_cache,
+)
 from keanu.tools.diff import parse_diff, diff_stats, FileDiff, Hunk, DiffStats
 from keanu.tools.httpclient import get, post, put, delete, Response, RequestConfig
+from keanu.tools.inventory import Inventory, FileInfo, inventory, invalidate_inventories
 from keanu.tools.markdown import MarkdownDoc, parse, to_string, Section
 from keanu.tools.parallel import read_files, write_files, run_parallel, batch_parse_ast
 from keanu.tools.proc import run, RunResult, which, is_running
@@ -1,7 +1,8 @@
-"""cache.py - session-scoped caching for file reads and AST parses.
+"""cache.py - session-scoped caching for file reads, AST parses, and text features.
 
 avoids re-reading and re-parsing files the agent has already seen.
-invalidates on write. lives in memory, dies with the session.
+invalidates on write, or when the file's stat says it moved. lives in
+memory, dies with the session.
 
 in the world: you don't reopen a book every time you want to check a page
 you already read. you remember what was there.
@@ -9,6 +10,9 @@ you already read. you remember what was there.
 
 import ast
 import hashlib
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Any
@@ -19,88 +23,108 @@ class CacheEntry:
     """a cached item."""
     key: str
     value: Any
-    size: int = 0       # rough size in bytes
+    size: int = 0       # bytes
     hits: int = 0
-    hash: str = ""      # content hash for invalidation
+    hash: str = ""      # content hash, checked when the stat changes
+    stat: tuple = ()    # (st_size, st_mtime_ns, st_ino) when cached
 
 
 class FileCache:
     """session-scoped cache for file reads.
 
-    caches file contents by path. invalidates when the file is written.
-    tracks hit counts for diagnostics.
+    caches file contents by absolute path. a hit costs one stat: the entry
+    is good while (size, mtime_ns, inode) match. when they don't, the file
+    is hashed and the entry survives if the bytes are the same (a touch, a
+    checkout of the same content). least recently used goes first when
+    either limit is hit. thread-safe.
     """
 
     def __init__(self, max_entries: int = 500, max_size: int = 10_000_000):
-        self._entries: dict[str, CacheEntry] = {}
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
         self._max_entries = max_entries
         self._max_size = max_size
         self._total_size = 0
         self._total_hits = 0
         self._total_misses = 0
+        self._lock = threading.RLock()
 
     def get(self, path: str) -> Optional[str]:
         """get cached file content. returns None on miss."""
-        entry = self._entries.get(path)
-        if entry is None:
-            self._total_misses += 1
-            return None
-
-        # check if file changed on disk
-        try:
-            current_hash = _file_hash(path)
-            if current_hash != entry.hash:
-                self.invalidate(path)
+        key = _key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        # stat (and maybe hash) with the lock released, so a slow disk
+        # or a big file doesn't hold up every other reader
+        stat = _current_stat(entry) if entry is not None else None
+        with self._lock:
+            current = self._entries.get(key) is entry
+            if entry is None or stat is None or not current:
+                if entry is not None and current:
+                    self._drop(key)
                 self._total_misses += 1
                 return None
-        except OSError:
-            self.invalidate(path)
-            self._total_misses += 1
-            return None
-
-        entry.hits += 1
-        self._total_hits += 1
-        return entry.value
+            entry.stat = stat
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self._total_hits += 1
+            return entry.value
+
+    def read(self, path: str) -> str:
+        """file content, from cache or disk. decodes like Path.read_text(),
+        so a binary file raises UnicodeDecodeError the same way."""
+        cached = self.get(path)
+        if cached is not None:
+            return cached
+        p = Path(path)
+        before = _stat_key(p)
+        data = p.read_bytes()
+        content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        # a write that landed while we read would pair new stat with old text
+        if _stat_key(p) == before:
+            self._store(_key(path), content, len(data), _bytes_hash(data), before)
+        return content
 
     def put(self, path: str, content: str):
         """cache file content."""
-        size = len(content)
-
-        # evict if we'd exceed limits
-        if len(self._entries) >= self._max_entries:
-            self._evict_lru()
-
-        while self._total_size + size > self._max_size and self._entries:
-            self._evict_lru()
-
         try:
-            content_hash = _file_hash(path)
+            stat = _stat_key(Path(path))
         except OSError:
-            content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
-
-        self._entries[path] = CacheEntry(
-            key=path, value=content, size=size,
-            hash=content_hash,
-        )
-        self._total_size += size
+            stat = ()
+        self._store(_key(path), content, _byte_size(content), "", stat)
+
+    def _store(self, key: str, content: str, size: int, content_hash: str, stat: tuple):
+        with self._lock:
+            self._drop(key)
+            if size > self._max_size:
+                return
+            while self._entries and (len(self._entries) >= self._max_entries
+                                     or self._total_size + size > self._max_size):
+                self._evict_lru()
+            self._entries[key] = CacheEntry(key=key, value=content, size=size,
+                                            hash=content_hash, stat=stat)
+            self._total_size += size
 
     def invalidate(self, path: str):
         """remove a file from cache (after write/edit)."""
-        entry = self._entries.pop(path, None)
+        with self._lock:
+            self._drop(_key(path))
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
         if entry:
             self._total_size -= entry.size
 
     def invalidate_all(self):
         """clear the entire cache."""
-        self._entries.clear()
-        self._total_size = 0
+        with self._lock:
+            self._entries.clear()
+            self._total_size = 0
 
     def _evict_lru(self):
-        """evict the least recently used entry (fewest hits)."""
-        if not self._entries:
-            return
-        least_used = min(self._entries.values(), key=lambda e: e.hits)
-        self.invalidate(least_used.key)
+        """evict the least recently used entry."""
+        if self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._total_size -= entry.size
 
     def stats(self) -> dict:
         """cache statistics."""
@@ -115,37 +139,56 @@ class FileCache:
         }
 
     def __contains__(self, path: str) -> bool:
-        return path in self._entries
+        return _key(path) in self._entries
 
 
 class ASTCache:
     """cache for parsed ASTs.
 
-    avoids re-parsing files. invalidates when the file cache invalidates.
+    each tree remembers the source string it was parsed from. it is good
+    while the file cache still hands back that same string, so it goes
+    stale exactly when the file does.
     """
 
-    def __init__(self, file_cache: FileCache = None):
+    def __init__(self, file_cache: FileCache = None, max_entries: int = 200):
         self._file_cache = file_cache or FileCache()
-        self._asts: dict[str, CacheEntry] = {}
+        self._asts: OrderedDict[str, tuple[str, CacheEntry]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
 
     def get(self, path: str) -> Optional[ast.Module]:
         """get cached AST. returns None on miss."""
-        entry = self._asts.get(path)
-        if entry is None:
+        key = _key(path)
+        with self._lock:
+            cached = self._asts.get(key)
+        if cached is None:
             return None
 
-        # check if source changed
-        if path not in self._file_cache:
-            # file not in file cache means it may have changed
-            self._asts.pop(path, None)
+        source, entry = cached
+        if self._file_cache.get(path) is not source:
+            with self._lock:
+                self._asts.pop(key, None)
             return None
 
+        with self._lock:
+            if key in self._asts:
+                self._asts.move_to_end(key)
         entry.hits += 1
         return entry.value
 
-    def put(self, path: str, tree: ast.Module):
-        """cache a parsed AST."""
-        self._asts[path] = CacheEntry(key=path, value=tree)
+    def put(self, path: str, tree: ast.Module, source: str = None):
+        """cache a parsed AST. source is the text it came from; the file
+        cache's current copy when not given."""
+        if source is None:
+            source = self._file_cache.get(path)
+            if source is None:
+                return
+        key = _key(path)
+        with self._lock:
+            self._asts[key] = (source, CacheEntry(key=key, value=tree, size=len(source)))
+            self._asts.move_to_end(key)
+            while len(self._asts) > self._max_entries:
+                self._asts.popitem(last=False)
 
     def parse(self, path: str) -> Optional[ast.Module]:
         """parse a file, using cache if available."""
@@ -153,25 +196,22 @@ class ASTCache:
         if cached is not None:
             return cached
 
-        # try file cache first
-        content = self._file_cache.get(path)
-        if content is None:
-            try:
-                content = Path(path).read_text()
-                self._file_cache.put(path, content)
-            except (OSError, UnicodeDecodeError):
-                return None
+        try:
+            content = self._file_cache.read(path)
+        except (OSError, UnicodeDecodeError):
+            return None
 
         try:
             tree = ast.parse(content)
-            self.put(path, tree)
-            return tree
-        except SyntaxError:
+        except (SyntaxError, ValueError):
             return None
+        self.put(path, tree, source=content)
+        return tree
 
     def invalidate(self, path: str):
         """remove a file's AST from cache."""
-        self._asts.pop(path, None)
+        with self._lock:
+            self._asts.pop(_key(path), None)
         self._file_cache.invalidate(path)
 
 
@@ -208,9 +248,134 @@ class SymbolCache:
         self._dirty = False
 
 
-def _file_hash(path: str) -> str:
-    """quick hash of file for change detection. uses mtime + size."""
-    p = Path(path)
-    stat = p.stat()
-    key = f"{stat.st_mtime}:{stat.st_size}"
-    return hashlib.sha256(key.encode()).hexdigest()[:16]
+class TextCache:
+    """content-addressed cache for things computed from a piece of text.
+
+    keyed by (kind, sha256 of the text), so the same words scanned by
+    different detectors, turns, or threads are only worked out once.
+    kind names what was computed and, when the answer depends on vectors
+    that can be re-baked, carries their signature too. bounded by entry
+    count, least recently used goes first. thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self._entries: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(kind, text: str) -> tuple:
+        return (kind, hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest())
+
+    def get(self, kind, text: str, default=None):
+        key = self.key(kind, text)
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key]
+
+    def put(self, kind, text: str, value):
+        key = self.key(kind, text)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, kind, texts: list[str], default=None) -> list:
+        """get() for a batch of texts under one lock."""
+        keys = [self.key(kind, t) for t in texts]
+        out = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    out.append(self._entries[key])
+                else:
+                    self._misses += 1
+                    out.append(default)
+        return out
+
+    def put_many(self, kind, items):
+        """put() for (text, value) pairs under one lock."""
+        pairs = [(self.key(kind, t), v) for t, v in items]
+        with self._lock:
+            for key, value in pairs:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, kind, text: str, compute):
+        """cached value, or compute() stored and returned. two threads
+        missing at once may both compute; the answer is the same."""
+        missing = object()
+        value = self.get(kind, text, missing)
+        if value is missing:
+            value = compute()
+            self.put(kind, text, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total else 0.0,
+        }
+
+
+# one per process: feel, pulse, alive and the detectors all read through it
+text_cache = TextCache()
+
+
+# one per process: read, the AST and symbol tools, and rag all read
+# through these, so a file read in one turn is a stat in the next
+file_cache = FileCache(max_entries=1000, max_size=32_000_000)
+ast_cache = ASTCache(file_cache)
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def _stat_key(p: Path) -> tuple:
+    st = p.stat()
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _current_stat(entry: CacheEntry) -> Optional[tuple]:
+    """the file's stat now, if the entry still matches the disk: same
+    stat, or a new stat over the same bytes. None when it doesn't."""
+    p = Path(entry.key)
+    try:
+        stat = _stat_key(p)
+        if stat == entry.stat:
+            return stat
+        if entry.hash and stat[0] == entry.size and _bytes_hash(p.read_bytes()) == entry.hash:
+            return stat
+    except OSError:
+        pass
+    return None
+
+
+def _bytes_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _byte_size(content: str) -> int:
+    return len(content.encode("utf-8", errors="surrogatepass"))
@@ -0,0 +1,333 @@
+"""inventory.py - one cached listing of a project's files.
+
+every tool that used to walk the tree on its own (symbols, polyglot,
+deps, suggestions, todo, security, rag, search) asks this instead. one
+set of ignore rules for all of them: the usual build and vendor
+directories, plus .gitignore files and .git/info/exclude.
+
+every query refreshes first, but a refresh only stats directories and
+re-lists the ones whose mtime moved, since adding, removing or renaming
+anything changes its parent's mtime. a command that asks a dozen
+questions lists the tree once and stats it a dozen times.
+
+in the world: the card catalog. you don't walk the stacks every time
+you want to know what's on the shelves.
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+SKIP_DIRS = frozenset({
+    ".git", "__pycache__", "node_modules", ".venv", "venv", ".tox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".eggs",
+    "dist", "build", ".chroma",
+})
+
+# a directory modified this recently may change again within the same
+# mtime tick, so its listing isn't trusted on the next refresh
+_RACY_NS = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """one file in the inventory. size and mtime are as of the last time
+    its directory was listed; stat the file when they must be exact."""
+    path: str       # root joined with rel
+    rel: str        # posix path relative to the root
+    name: str
+    ext: str        # lowercased suffix, "" for none
+    size: int
+    mtime_ns: int
+
+
+# ============================================================
+# IGNORE RULES
+# ============================================================
+
+class IgnoreRules:
+    """the patterns of one .gitignore, matched against paths relative to
+    the directory it lives in."""
+
+    def __init__(self, lines: list[str]):
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []  # (regex, negate, dir_only)
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # a slash anywhere but the end anchors the pattern to this directory
+            regex = _glob_regex(line.lstrip("/"))
+            if "/" not in line:
+                regex = "(?:.*/)?" + regex
+            self.rules.append((re.compile(regex + r"\Z"), negate, dir_only))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["IgnoreRules"]:
+        try:
+            rules = cls(path.read_text(errors="replace").splitlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no rule says."""
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                result = not negate
+        return result
+
+
+def _glob_regex(pattern: str) -> str:
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        c = pattern[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 2:]:
+            j = pattern.index("]", i + 2)
+            body = pattern[i + 1:j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = j + 1
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _ignored(rules: list[tuple[str, IgnoreRules]], rel: str, is_dir: bool) -> bool:
+    """deeper .gitignore files win over shallower ones, later lines over earlier."""
+    result = False
+    for base, ignore in rules:
+        m = ignore.match(rel[len(base) + 1:] if base else rel, is_dir)
+        if m is not None:
+            result = m
+    return result
+
+
+# ============================================================
+# INVENTORY
+# ============================================================
+
+@dataclass
+class _Dir:
+    mtime_ns: Optional[int]     # None: list it again next refresh
+    ignore_sig: tuple
+    ignore: Optional[IgnoreRules]
+    subdirs: list[str] = field(default_factory=list)
+    files: list[FileInfo] = field(default_factory=list)
+
+
+class Inventory:
+    """every file under root that no ignore rule hides, kept current.
+    with gitignore=False only SKIP_DIRS applies, for tools that must see
+    what git doesn't (the secret scanner)."""
+
+    MAX_AGE = 0.0   # seconds a refresh stays good for. 0: check every query
+
+    def __init__(self, root: str | Path, gitignore: bool = True):
+        self.root = Path(root).resolve()
+        self.gitignore = gitignore
+        self._dirs: dict[str, _Dir] = {}
+        self._exclude = None
+        self._checked_at = None
+        self._files: list[FileInfo] = []
+        self._by_ext: dict[str, list[FileInfo]] = {}
+        self._by_name: dict[str, list[FileInfo]] = {}
+        self._lock = threading.Lock()
+        self.listings = 0   # directories listed, for diagnostics
+
+    def invalidate(self):
+        """make the next query refresh, however recent the last one was."""
+        self._checked_at = None
+
+    def refresh(self, force: bool = False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._checked_at is not None and now - self._checked_at < self.MAX_AGE:
+                return
+            self._checked_at = now
+            if self._scan():
+                self._reindex()
+
+    def _scan(self) -> bool:
+        started = time.time_ns()
+        exclude_path = self.root / ".git" / "info" / "exclude"
+        exclude_sig = _sig(exclude_path) if self.gitignore else ()
+        exclude = IgnoreRules.load(exclude_path) if exclude_sig else None
+        relist_all = exclude_sig != self._exclude
+        self._exclude = exclude_sig
+
+        changed = relist_all
+        seen = set()
+        base_rules = [("", exclude)] if exclude else []
+        stack = [("", base_rules, relist_all)]
+        while stack:
+            rel, rules, relist = stack.pop()
+            path = self.root / rel if rel else self.root
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            ignore_sig = _sig(path / ".gitignore") if self.gitignore else ()
+            cached = self._dirs.get(rel)
+            if cached is not None and cached.ignore_sig != ignore_sig:
+                relist = True   # the rules for the whole subtree moved
+            if relist or cached is None or cached.mtime_ns != st.st_mtime_ns:
+                cached = self._list(rel, path, st, ignore_sig, rules, started)
+                self._dirs[rel] = cached
+                changed = True
+            seen.add(rel)
+            if cached.ignore:
+                rules = rules + [(rel, cached.ignore)]
+            for name in cached.subdirs:
+                stack.append((f"{rel}/{name}" if rel else name, rules, relist))
+
+        for gone in set(self._dirs) - seen:
+            del self._dirs[gone]
+            changed = True
+        return changed
+
+    def _list(self, rel, path, st, ignore_sig, rules, started) -> _Dir:
+        self.listings += 1
+        ignore = IgnoreRules.load(path / ".gitignore") if ignore_sig else None
+        rules = rules + [(rel, ignore)] if ignore else rules
+        trusted = st.st_mtime_ns < started - _RACY_NS
+        entry = _Dir(mtime_ns=st.st_mtime_ns if trusted else None,
+                     ignore_sig=ignore_sig, ignore=ignore)
+        try:
+            scan = os.scandir(path)
+        except OSError:
+            return entry
+        with scan:
+            for de in scan:
+                name = de.name
+                child = f"{rel}/{name}" if rel else name
+                try:
+                    if de.is_dir(follow_symlinks=False):
+                        if (name not in SKIP_DIRS and not name.endswith(".egg-info")
+                                and not _ignored(rules, child, True)):
+                            entry.subdirs.append(name)
+                        continue
+                    if not de.is_file() or _ignored(rules, child, False):
+                        continue
+                    fst = de.stat()
+                except OSError:
+                    continue
+                entry.files.append(FileInfo(
+                    path=os.path.join(self.root, child), rel=child, name=name,
+                    ext=os.path.splitext(name)[1].lower(),
+                    size=fst.st_size, mtime_ns=fst.st_mtime_ns,
+                ))
+        return entry
+
+    def _reindex(self):
+        files = sorted((f for d in self._dirs.values() for f in d.files), key=lambda f: f.rel)
+        by_ext, by_name = {}, {}
+        for f in files:
+            by_ext.setdefault(f.ext, []).append(f)
+            by_name.setdefault(f.name, []).append(f)
+        self._files, self._by_ext, self._by_name = files, by_ext, by_name
+
+    # -- queries --
+
+    def files(self, exts=None, under: str = "") -> list[FileInfo]:
+        """files sorted by relative path, optionally only these extensions
+        (".py", any case) and only under a relative directory."""
+        self.refresh()
+        if exts is None:
+            found = self._files
+        else:
+            lists = [self._by_ext.get(e.lower(), []) for e in set(exts)]
+            found = list(heapq.merge(*lists, key=lambda f: f.rel))
+        if under:
+            prefix = under.strip("/") + "/"
+            found = [f for f in found if f.rel.startswith(prefix)]
+        return list(found)
+
+    def named(self, name: str) -> list[FileInfo]:
+        """files with exactly this file name, anywhere."""
+        self.refresh()
+        return list(self._by_name.get(name, []))
+
+    def dirs(self) -> list[str]:
+        """relative paths of every directory kept, the root excluded."""
+        self.refresh()
+        return sorted(d for d in self._dirs if d)
+
+    def glob(self, pattern: str, under: str = "") -> list[str]:
+        """relative paths of what Path(root, under).rglob(pattern) would
+        give, files and directories, minus anything ignored. sorted, and
+        relative to the root like everything else here."""
+        self.refresh()
+        # rglob matches at any depth, and a "**" in the middle spans any
+        # number of directories, which PurePosixPath.match doesn't do
+        matcher = re.compile("(?:.*/)?" + _glob_regex(pattern.lstrip("/")) + r"\Z")
+        under = under.strip("/")
+        prefix = under + "/" if under else ""
+        rels = [f.rel for f in self._files] + [d for d in self._dirs if d]
+        return sorted(r for r in rels
+                      if r.startswith(prefix) and matcher.match(r[len(prefix):]))
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._files)
+
+
+def _sig(path: Path) -> tuple:
+    try:
+        st = path.stat()
+    except OSError:
+        return ()
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+_inventories: dict[tuple[Path, bool], Inventory] = {}
+_inventories_lock = threading.Lock()
+
+
+def inventory(root: str | Path = ".", gitignore: bool = True) -> Inventory:
+    """the process-wide inventory for a project root."""
+    key = (Path(root).resolve(), gitignore)
+    with _inventories_lock:
+        inv = _inventories.get(key)
+        if inv is None:
+            inv = _inventories[key] = Inventory(*key)
+        return inv
+
+
+def invalidate_inventories():
+    """after writing files: make every inventory refresh on its next query."""
+    with _inventories_lock:
+        for inv in _inventories.values():
+            inv.invalidate()
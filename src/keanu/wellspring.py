@@ -12,8 +12,11 @@ now there's one pool they both look into.
 
 import re
 import sys
+import time
 from pathlib import Path
 
+from keanu.log import warn
+
 
 def depths():
     """Returns the file path to the .chroma directory where all vector
@@ -25,19 +28,37 @@ def depths():
     return str(Path(__file__).resolve().parent.parent.parent / ".chroma")
 
 
+_stores = {}  # base_dir -> BehavioralStore, one per process
+
+
+def behavioral_store(base_dir=None):
+    """Returns the process-wide BehavioralStore for base_dir (the default
+    .behavioral directory when None). Every tap shares it, so a collection
+    is opened once per process instead of once per detect or scan call.
+    The store re-opens a collection on its own if it gets re-baked.
+
+    in the world: one bucket at the well, passed hand to hand.
+    """
+    from keanu.abilities.world.compress.behavioral import BehavioralStore
+    key = str(Path(base_dir).resolve()) if base_dir else None
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = BehavioralStore(base_dir)
+    return store
+
+
 def tap(collection):
-    """Opens a BehavioralStore and checks if it has the named collection.
-    BehavioralStore is keanu's own transparent vector format (no chromadb
-    dependency). Returns the store if the collection exists, None otherwise.
-    Fails silently if BehavioralStore isn't installed.
+    """Looks up the shared BehavioralStore and checks if it has the named
+    collection. BehavioralStore is keanu's own transparent vector format
+    (no chromadb dependency). Returns the store if the collection exists,
+    None otherwise. Fails silently if BehavioralStore isn't installed.
 
     Collections: "silverado" for detect patterns, "silverado_rgb" for scan.
 
     in the world: tap into a specific vein of the wellspring.
     """
     try:
-        from keanu.abilities.world.compress.behavioral import BehavioralStore
-        store = BehavioralStore()
+        store = behavioral_store()
         if store.has_collection(collection):
             return store
     except ImportError:
@@ -77,6 +98,43 @@ def draw(collection):
         return None
 
 
+def _bake_mark(collection):
+    return Path(depths()) / f"{collection}.baked"
+
+
+def mark_baked(collection):
+    """Records that the named chromadb collection was just (re)baked, by
+    rewriting a small marker file next to the vectors. Only a bake calls
+    this, so signature() moves on bakes and nothing else. Opening the
+    database to query it touches chroma.sqlite3; it never touches this.
+
+    in the world: a fresh notch on the well post.
+    """
+    mark = _bake_mark(collection)
+    mark.parent.mkdir(parents=True, exist_ok=True)
+    mark.write_text(f"{time.time_ns()}\n")
+
+
+def signature(collection):
+    """Returns a small tuple that changes whenever the named collection
+    is re-baked, in either backend: the behavioral files' size and
+    mtime, and the mtime of the chromadb bake marker. Anything cached
+    from a collection's answers keys off this, so a bake never serves
+    stale readings.
+
+    in the world: the water level mark on the side of the well.
+    """
+    try:
+        baked = behavioral_store().signature(collection)
+    except ImportError:
+        baked = None
+    try:
+        chroma = _bake_mark(collection).stat().st_mtime_ns
+    except OSError:
+        chroma = None
+    return (baked, chroma)
+
+
 def resolve_backend(collection_name, backend="auto"):
     """resolve vector backend for a collection. returns (behavioral_store, chromadb_collection).
 
@@ -102,6 +160,58 @@ def resolve_backend(collection_name, backend="auto"):
     return None, chromadb_collection
 
 
+def pole_matrix(behavioral_store, chromadb_collection, collection_name, texts, poles, n=3, block=512):
+    """Scores every text against every pole in a few batched calls.
+    poles is a list of where filters (one per lens/valence, or per
+    detector/valence). Returns a numpy array of shape (len(texts),
+    len(poles)) where each cell is 1 - min(distance), the same number a
+    single-text query would give. NaN means the pole had nothing to
+    match: no examples baked for it, or chromadb turned the query down
+    (collection gone, where filter it won't take), which is logged.
+
+    Behavioral stores do it as matrix math. Chromadb gets one
+    query_texts=[...] call per pole per block of texts instead of one
+    call per line per pole.
+
+    in the world: one dip of the bucket for the whole field.
+    """
+    import numpy as np
+
+    if behavioral_store is not None:
+        return behavioral_store.query_poles(collection_name, texts, poles, block=block)
+
+    out = np.full((len(texts), len(poles)), np.nan)
+    if chromadb_collection is None:
+        return out
+
+    expected = _query_errors()
+    for start in range(0, len(texts), block):
+        chunk = texts[start:start + block]
+        for j, where in enumerate(poles):
+            try:
+                result = chromadb_collection.query(query_texts=chunk, n_results=n, where=where)
+            except expected as e:
+                warn("wellspring", f"{collection_name} query failed for {where}: {e}")
+                continue
+            for i, dists in enumerate(result["distances"]):
+                if dists:
+                    out[start + i, j] = 1 - min(dists)
+    return out
+
+
+def _query_errors():
+    """What a chromadb query raises when the collection is gone or the
+    where filter doesn't fit it. Anything else is a real failure and
+    propagates.
+    """
+    try:
+        from chromadb import errors
+    except ImportError:
+        return (ValueError,)
+    names = ("NotFoundError", "InvalidArgumentError", "InvalidCollectionException")
+    return (ValueError, *(getattr(errors, name) for name in names if hasattr(errors, name)))
+
+
 def sift(lines):
     """Takes a list of text lines and returns only the ones worth scanning.
     Skips lines that are too short (under 20 chars), code (imports, defs,
@@ -6,6 +6,14 @@ from unittest.mock import patch
 from keanu.memory.memberberry import MemberberryStore
 
 
+@pytest.fixture(autouse=True)
+def symbol_index_dir(tmp_path_factory):
+    """keep the on-disk symbol index out of ~/.keanu during tests."""
+    with patch("keanu.analysis.symindex._INDEX_DIR", tmp_path_factory.mktemp("symindex")), \
+         patch.dict("keanu.analysis.symindex._indexes", clear=True):
+        yield
+
+
 @pytest.fixture
 def temp_store(tmp_path):
     with patch("keanu.memory.memberberry.MEMBERBERRY_DIR", tmp_path), \
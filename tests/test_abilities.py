@@ -448,6 +448,16 @@ class TestHands:
         assert result["success"] is True
         assert "new value here" in f.read_text()
 
+    def test_read_after_edit_is_fresh(self, tmp_path):
+        f = tmp_path / "cached.txt"
+        f.write_text("first draft")
+        with patch("keanu.abilities.hands.hands._is_safe_path", return_value=True):
+            _REGISTRY["read"].execute("", {"file_path": str(f)})
+            _REGISTRY["edit"].execute("", {"file_path": str(f), "old_string": "first",
+                                           "new_string": "final"})
+            result = _REGISTRY["read"].execute("", {"file_path": str(f)})
+        assert result["result"] == "final draft"
+
     def test_edit_rejects_non_unique(self, tmp_path):
         ab = _REGISTRY["edit"]
         f = tmp_path / "dupe.txt"
@@ -461,6 +471,17 @@ class TestHands:
         assert result["success"] is False
         assert "2 times" in result["result"]
 
+    def test_search_glob_uses_project_gitignore(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "sub" / "build").mkdir(parents=True)
+        (tmp_path / "sub" / "a.py").write_text("")
+        (tmp_path / "sub" / "build" / "gen.py").write_text("")
+        (tmp_path / "top.py").write_text("")
+        with patch("keanu.abilities.hands.hands._get_safe_roots", return_value=[tmp_path.resolve()]):
+            result = _REGISTRY["search"].execute("", {"glob": "*.py", "path": str(tmp_path / "sub")})
+        assert result["success"] is True
+        assert result["result"].splitlines() == [str(tmp_path / "sub" / "a.py")]
+
     def test_run_blocked_command(self):
         ab = _REGISTRY["run"]
         result = ab.execute("", {"command": "sudo rm -rf /"})
@@ -1,7 +1,8 @@
 """Tests for alive.py - ALIVE-GREY-BLACK diagnostic."""
 
 from unittest.mock import patch
-from keanu.alive import diagnose, AliveReading, AliveState, _hot
+from keanu.alive import diagnose, AliveReading, AliveState, _hot, _get_emotions, _get_color
+from keanu.tools.cache import TextCache
 
 
 class TestAliveReading:
@@ -138,6 +139,32 @@ class TestDiagnose:
         assert r.ok is False
 
 
+class TestReadingCache:
+    """emotions and color are read once per text, per baked collection."""
+
+    def test_emotions_read_once(self):
+        with patch("keanu.tools.cache.text_cache", TextCache()), \
+             patch("keanu.wellspring.signature", return_value=(None, None)), \
+             patch("keanu.alive._read_emotions", return_value=[
+                 {"state": "curious", "intensity": 0.7}]) as read:
+            first = _get_emotions("same words")
+            first[0]["intensity"] = 0.0
+            second = _get_emotions("same words")
+        assert read.call_count == 1
+        assert second == [{"state": "curious", "intensity": 0.7}]
+
+    def test_color_reread_after_bake(self):
+        color = {"state": "flat", "red_net": 0}
+        with patch("keanu.tools.cache.text_cache", TextCache()), \
+             patch("keanu.alive._read_color", return_value=color) as read:
+            with patch("keanu.wellspring.signature", return_value=(1, None)):
+                _get_color("same words")
+                _get_color("same words")
+            with patch("keanu.wellspring.signature", return_value=(2, None)):
+                _get_color("same words")
+        assert read.call_count == 2
+
+
 class TestHot:
     def test_hot_high_intensity(self):
         assert _hot([{"intensity": 0.8}]) is True
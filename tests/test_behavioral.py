@@ -234,6 +234,32 @@ class TestFeatureExtractor:
         assert syc["agreement_markers"] > 0
         assert syc["exclamation_density"] > 0
 
+    def test_extract_batch_shape(self):
+        ext = FeatureExtractor()
+        batch = ext.extract_batch(["Hello world.", "Great question!", ""])
+        assert batch.shape == (3, NUM_FEATURES)
+        assert batch.dtype == np.float32
+
+    def test_extract_batch_matches_extract(self):
+        ext = FeatureExtractor()
+        texts = [
+            "That's such a great question! You're absolutely brilliant! I completely agree!",
+            "I disagree. However, that's actually wrong and I think you're mistaken.",
+            "Either we win or we lose. Either way, it was done before.",
+            "the cat sat the cat sat the cat sat the cat sat on the mat",
+            "Humans always fail. AI never makes mistakes. They all know it.",
+            "We shipped 291 commits in 3 days with Drew and Claude.",
+            "We will soon eventually launch next week, going to be huge.",
+            "",
+            "?!",
+        ]
+        batch = ext.extract_batch(texts, dtype=np.float64)
+        for text, row in zip(texts, batch):
+            np.testing.assert_allclose(row, ext.extract(text), rtol=0, atol=1e-12)
+
+    def test_extract_batch_empty(self):
+        assert FeatureExtractor().extract_batch([]).shape == (0, NUM_FEATURES)
+
     def test_pushback_text_lights_up(self):
         ext = FeatureExtractor()
         push = ext.extract_named(
@@ -308,12 +334,56 @@ class TestBehavioralStore:
         # distance should be very close to 0 (self-match)
         assert result["distances"][0][0] < 0.01
 
-    def test_npz_files_created(self, tmp_path):
+    def test_npy_files_created(self, tmp_path):
         store = BehavioralStore(base_dir=tmp_path)
         examples = [{"text": "hello", "tag": "test"}]
         store.bake_collection("file_test", examples)
-        assert (tmp_path / "file_test.npz").exists()
-        assert (tmp_path / "file_test_meta.json").exists()
+        for suffix in (".vectors.npy", ".unit.npy", ".columns.json", ".texts.json"):
+            assert (tmp_path / f"file_test{suffix}").exists()
+        assert not (tmp_path / "file_test.npz").exists()
+
+    def test_vectors_memory_mapped_and_text_lazy(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("lazy", [
+            {"text": "Build it now.", "tag": "a"},
+            {"text": "Maybe later?", "tag": "b"},
+        ])
+        store.query_poles("lazy", ["Ship it."], [{"tag": "a"}])
+        loaded = store._load("lazy")
+        assert isinstance(loaded.unit, np.memmap)
+        assert loaded._texts is None
+
+        result = store.query("lazy", "Build it now.", n_results=1)
+        assert result["documents"] == [["Build it now."]]
+        assert result["metadatas"] == [[{"tag": "a"}]]
+
+    def test_legacy_npz_layout_loads(self, tmp_path):
+        import json
+        ex = FeatureExtractor()
+        texts = ["That's brilliant!", "I disagree."]
+        np.savez(tmp_path / "old.npz", vectors=np.array([ex.extract(t) for t in texts]))
+        (tmp_path / "old_meta.json").write_text(json.dumps([
+            {"detector": "sycophancy", "valence": "positive", "_text": texts[0]},
+            {"detector": "sycophancy", "valence": "negative", "_text": texts[1]},
+        ]))
+        store = BehavioralStore(base_dir=tmp_path)
+        assert store.has_collection("old")
+        result = store.query("old", "That's brilliant!", n_results=1, where={"valence": "positive"})
+        assert result["documents"] == [[texts[0]]]
+        assert result["metadatas"] == [[{"detector": "sycophancy", "valence": "positive"}]]
+
+    def test_rebake_seen_by_other_store(self, tmp_path):
+        reader = BehavioralStore(base_dir=tmp_path)
+        BehavioralStore(base_dir=tmp_path).bake_collection("c", [{"text": "one", "tag": "a"}])
+        assert reader.query("c", "one")["documents"] == [["one"]]
+        BehavioralStore(base_dir=tmp_path).bake_collection("c", [{"text": "two words", "tag": "b"}])
+        assert reader.query("c", "two words")["documents"] == [["two words"]]
+
+    def test_missing_key_filters_like_none(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("c", [{"text": "one", "tag": "a"}, {"text": "two"}])
+        assert store.query("c", "x", where={"tag": None})["documents"] == [["two"]]
+        assert store.query("c", "x", where={"nope": "a"})["documents"] == [[]]
 
     def test_simple_where_filter(self, tmp_path):
         store = BehavioralStore(base_dir=tmp_path)
@@ -325,6 +395,147 @@ class TestBehavioralStore:
         result = store.query("simple_filter", "alpha text", where={"group": "a"})
         assert all(m["group"] == "a" for m in result["metadatas"][0])
 
+    def test_filter_no_match(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("nomatch", [{"text": "alpha text", "group": "a"}])
+        result = store.query("nomatch", "alpha text", where={"group": "zzz"})
+        assert result["distances"] == [[]]
+
+    def test_top_k_sorted_and_bounded(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        examples = [
+            {"text": "That's brilliant! Amazing!", "group": "a"},
+            {"text": "I disagree. That's wrong.", "group": "a"},
+            {"text": "Perhaps we might maybe wait.", "group": "a"},
+            {"text": "Build it and ship it.", "group": "a"},
+            {"text": "Burn it down.", "group": "a"},
+        ]
+        store.bake_collection("topk", examples)
+        result = store.query("topk", "Brilliant! Amazing work!", n_results=3)
+        dists = result["distances"][0]
+        assert len(dists) == 3
+        assert dists == sorted(dists)
+        assert result["documents"][0][0] == "That's brilliant! Amazing!"
+
+        everything = store.query("topk", "Brilliant! Amazing work!", n_results=50)
+        assert len(everything["distances"][0]) == 5
+
+    def test_ties_keep_row_order(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        examples = [{"text": "same words here", "i": i} for i in range(6)]
+        store.bake_collection("ties", examples)
+        result = store.query("ties", "same words here", n_results=4)
+        assert [m["i"] for m in result["metadatas"][0]] == [0, 1, 2, 3]
+
+
+class TestQueryPoles:
+    EXAMPLES = [
+        {"text": "That's brilliant! Amazing!", "lens": "red", "valence": "positive"},
+        {"text": "Burn it all down.", "lens": "red", "valence": "negative"},
+        {"text": "Perhaps we should wait.", "lens": "yellow", "valence": "negative"},
+        {"text": "We shipped 291 commits in 3 days.", "lens": "blue", "valence": "positive"},
+    ]
+    POLES = [
+        {"$and": [{"lens": "red"}, {"valence": "positive"}]},
+        {"$and": [{"lens": "red"}, {"valence": "negative"}]},
+        {"$and": [{"lens": "yellow"}, {"valence": "positive"}]},
+    ]
+
+    def test_matches_single_queries(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("poles", self.EXAMPLES)
+        texts = ["Incredible work!", "Destroy it.", "Maybe later, possibly."]
+        sims = store.query_poles("poles", texts, self.POLES)
+        assert sims.shape == (3, 3)
+        for i, text in enumerate(texts):
+            for j, where in enumerate(self.POLES[:2]):
+                dists = store.query("poles", text, where=where)["distances"][0]
+                assert sims[i, j] == pytest.approx(1 - min(dists))
+
+    def test_empty_pole_is_nan(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("poles", self.EXAMPLES)
+        sims = store.query_poles("poles", ["anything at all"], self.POLES)
+        assert np.isnan(sims[0, 2])
+
+    def test_blocks_agree(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("poles", self.EXAMPLES)
+        texts = [ex["text"] for ex in self.EXAMPLES] * 3
+        whole = store.query_poles("poles", texts, self.POLES[:2])
+        blocked = store.query_poles("poles", texts, self.POLES[:2], block=5)
+        np.testing.assert_allclose(whole, blocked)
+
+    def test_missing_collection(self, tmp_path):
+        store = BehavioralStore(base_dir=tmp_path)
+        sims = store.query_poles("nope", ["hello"], self.POLES)
+        assert np.isnan(sims).all()
+
+    def test_features_extracted_once_per_text(self, tmp_path, monkeypatch):
+        from keanu.tools.cache import TextCache
+        monkeypatch.setattr("keanu.abilities.world.compress.behavioral.feature_cache", TextCache())
+        store = BehavioralStore(base_dir=tmp_path)
+        store.bake_collection("poles", self.EXAMPLES)
+        first = store.query_poles("poles", ["Incredible work!", "Destroy it."], self.POLES[:2])
+
+        extracted = []
+        real = store.extractor.extract_batch
+        monkeypatch.setattr(store.extractor, "extract_batch",
+                            lambda texts, **kw: extracted.extend(texts) or real(texts, **kw))
+        again = store.query_poles("poles", ["Destroy it.", "Incredible work!", "New words."],
+                                  self.POLES[:2])
+        assert extracted == ["New words."]
+        np.testing.assert_allclose(again[:2], first[::-1])
+
+
+class TestWellspringRegistry:
+    def test_store_shared_per_dir(self, tmp_path):
+        from keanu.wellspring import behavioral_store
+        assert behavioral_store(tmp_path) is behavioral_store(tmp_path)
+        assert behavioral_store(tmp_path) is not behavioral_store(tmp_path / "other")
+
+
+class TestSignature:
+    def test_only_a_bake_moves_chroma_part(self, tmp_path, monkeypatch):
+        import keanu.wellspring as wellspring_mod
+        monkeypatch.setattr(wellspring_mod, "depths", lambda: str(tmp_path))
+        assert wellspring_mod.signature("silverado")[1] is None
+
+        wellspring_mod.mark_baked("silverado")
+        baked = wellspring_mod.signature("silverado")[1]
+        assert baked is not None
+        (tmp_path / "chroma.sqlite3").write_text("read traffic")
+        assert wellspring_mod.signature("silverado")[1] == baked
+        assert wellspring_mod.signature("silverado_rgb")[1] is None
+
+
+class TestPoleMatrix:
+    def test_chromadb_batches_per_pole(self):
+        from keanu.wellspring import pole_matrix
+
+        class FakeCollection:
+            calls = []
+
+            def query(self, query_texts, n_results, where):
+                self.calls.append(list(query_texts))
+                if where == "boom":
+                    raise ValueError("bad where")
+                if where == "crash":
+                    raise RuntimeError("down")
+                return {"distances": [[0.4, 0.2] for _ in query_texts]}
+
+        col = FakeCollection()
+        sims = pole_matrix(None, col, "x", ["a", "b", "c"], ["p", "boom"])
+        assert col.calls == [["a", "b", "c"], ["a", "b", "c"]]
+        np.testing.assert_allclose(sims[:, 0], [0.8, 0.8, 0.8])
+        assert np.isnan(sims[:, 1]).all()
+        with pytest.raises(RuntimeError):
+            pole_matrix(None, col, "x", ["a"], ["crash"])
+
+    def test_no_backend(self):
+        from keanu.wellspring import pole_matrix
+        assert np.isnan(pole_matrix(None, None, "x", ["a"], ["p"])).all()
+
 
 # ── integration tests ───────────────────────────────────────
 
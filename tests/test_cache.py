@@ -1,8 +1,14 @@
 """tests for session caching."""
 
 import ast
+import os
+import threading
+from pathlib import Path
 
-from keanu.tools.cache import FileCache, ASTCache, SymbolCache, CacheEntry
+import pytest
+
+from keanu.tools import cache as cache_mod
+from keanu.tools.cache import FileCache, ASTCache, SymbolCache, CacheEntry, TextCache
 
 
 class TestCacheEntry:
@@ -81,17 +87,100 @@ class TestFileCache:
         assert stats["misses"] == 1
         assert stats["hit_rate"] == 0.5
 
-    def test_eviction(self):
+    def test_eviction_is_lru(self, tmp_path):
+        paths = []
+        for name in "abc":
+            f = tmp_path / f"{name}.py"
+            f.write_text(name)
+            paths.append(str(f))
         cache = FileCache(max_entries=2)
-        # can't test with real files for eviction since we need
-        # the hash to match, so just test the mechanism
-        cache._entries["a"] = CacheEntry(key="a", value="x", size=1, hits=0, hash="h1")
-        cache._entries["b"] = CacheEntry(key="b", value="y", size=1, hits=5, hash="h2")
-        cache._total_size = 2
-        # evict should remove the one with fewer hits
-        cache._evict_lru()
-        assert "a" not in cache._entries
-        assert "b" in cache._entries
+        cache.read(paths[0])
+        cache.read(paths[1])
+        cache.get(paths[0])         # a is now the most recent
+        cache.read(paths[2])
+        assert paths[0] in cache
+        assert paths[1] not in cache
+        assert paths[2] in cache
+
+    def test_size_limit_in_bytes(self, tmp_path):
+        f = tmp_path / "u.txt"
+        f.write_text("é" * 10)
+        cache = FileCache(max_size=25)
+        cache.read(str(f))
+        assert cache.stats()["size_bytes"] == 20
+        g = tmp_path / "v.txt"
+        g.write_text("xxxxxxxxxx")
+        cache.read(str(g))
+        assert str(f) not in cache
+        assert cache.stats()["size_bytes"] == 10
+
+    def test_read_hit_does_not_touch_content(self, tmp_path, monkeypatch):
+        f = tmp_path / "test.py"
+        f.write_text("x = 1")
+        cache = FileCache()
+        assert cache.read(str(f)) == "x = 1"
+        monkeypatch.setattr(Path, "read_bytes", lambda self: (_ for _ in ()).throw(AssertionError))
+        assert cache.read(str(f)) == "x = 1"
+        assert cache.stats()["hits"] == 1
+
+    def test_touch_keeps_entry(self, tmp_path):
+        f = tmp_path / "test.py"
+        f.write_text("x = 1")
+        cache = FileCache()
+        cache.read(str(f))
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        assert cache.get(str(f)) == "x = 1"
+
+    def test_same_size_rewrite_misses(self, tmp_path):
+        f = tmp_path / "test.py"
+        f.write_text("x = 1")
+        cache = FileCache()
+        cache.read(str(f))
+        st = f.stat()
+        f.write_text("x = 2")
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        assert cache.get(str(f)) is None
+        assert cache.read(str(f)) == "x = 2"
+
+    def test_rehash_runs_without_the_lock(self, tmp_path, monkeypatch):
+        f = tmp_path / "test.py"
+        f.write_text("x = 1")
+        cache = FileCache()
+        cache.read(str(f))
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+        free = []
+        real_hash = cache_mod._bytes_hash
+
+        def hash_and_probe(data):
+            def probe():
+                got = cache._lock.acquire(blocking=False)
+                free.append(got)
+                if got:
+                    cache._lock.release()
+            t = threading.Thread(target=probe)
+            t.start()
+            t.join()
+            return real_hash(data)
+
+        monkeypatch.setattr(cache_mod, "_bytes_hash", hash_and_probe)
+        assert cache.get(str(f)) == "x = 1"
+        assert free == [True]
+
+    def test_read_binary_raises(self, tmp_path):
+        f = tmp_path / "blob.bin"
+        f.write_bytes(b"\xff\xfe\x00")
+        with pytest.raises(UnicodeDecodeError):
+            FileCache().read(str(f))
+
+    def test_relative_and_absolute_share_entry(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "rel.py").write_text("r")
+        cache = FileCache()
+        cache.read("rel.py")
+        assert str(tmp_path / "rel.py") in cache
 
     def test_contains(self, tmp_path):
         f = tmp_path / "test.py"
@@ -136,6 +225,27 @@ class TestASTCache:
         # should re-parse on next call
         assert cache.get(str(f)) is None
 
+    def test_reparses_changed_file(self, tmp_path):
+        f = tmp_path / "test.py"
+        f.write_text("x = 1\n")
+        cache = ASTCache()
+        first = cache.parse(str(f))
+        st = f.stat()
+        f.write_text("y = 22\n")
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        second = cache.parse(str(f))
+        assert second is not first
+        assert second.body[0].targets[0].id == "y"
+
+    def test_bounded(self, tmp_path):
+        cache = ASTCache(max_entries=2)
+        for name in "abc":
+            f = tmp_path / f"{name}.py"
+            f.write_text(f"{name} = 1")
+            cache.parse(str(f))
+        assert cache.get(str(tmp_path / "a.py")) is None
+        assert cache.get(str(tmp_path / "c.py")) is not None
+
 
 class TestSymbolCache:
 
@@ -161,3 +271,56 @@ class TestSymbolCache:
         cache.clear()
         assert cache.get("a") is None
         assert cache.get("b") is None
+
+
+class TestTextCache:
+
+    def test_get_or_compute_once(self):
+        cache = TextCache()
+        calls = []
+        compute = lambda: calls.append(1) or "value"
+        assert cache.get_or_compute("k", "some text", compute) == "value"
+        assert cache.get_or_compute("k", "some text", compute) == "value"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_kinds_are_separate(self):
+        cache = TextCache()
+        cache.put("a", "text", 1)
+        cache.put(("b", (1, 2)), "text", 2)
+        assert cache.get("a", "text") == 1
+        assert cache.get(("b", (1, 2)), "text") == 2
+        assert cache.get(("b", (1, 3)), "text") is None
+
+    def test_none_is_cached(self):
+        cache = TextCache()
+        calls = []
+        cache.get_or_compute("k", "t", lambda: calls.append(1))
+        cache.get_or_compute("k", "t", lambda: calls.append(1))
+        assert len(calls) == 1
+
+    def test_get_many_put_many(self):
+        cache = TextCache(max_entries=2)
+        cache.put_many("k", [("a", 1), ("b", 2), ("c", 3)])
+        assert cache.get_many("k", ["a", "b", "c"]) == [None, 2, 3]
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TextCache(max_entries=2)
+        cache.put("k", "a", 1)
+        cache.put("k", "b", 2)
+        cache.get("k", "a")
+        cache.put("k", "c", 3)
+        assert len(cache) == 2
+        assert cache.get("k", "a") == 1
+        assert cache.get("k", "b") is None
+
+    def test_clear(self):
+        cache = TextCache()
+        cache.put("k", "a", 1)
+        cache.clear()
+        assert cache.get("k", "a") is None
+        assert cache.stats()["entries"] == 0
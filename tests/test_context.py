@@ -123,6 +123,16 @@ class TestImportGraph:
         assert "main.py" in importers
         assert "db.py" in importers
 
+    def test_build_imports_for_files_read(self, tmp_path):
+        (tmp_path / "main.py").write_text("import utils\n")
+        (tmp_path / "utils.py").write_text("x = 1\n")
+        (tmp_path / "other.py").write_text("import utils\n")
+        cm = ContextManager()
+        cm.note_file(str(tmp_path / "utils.py"))
+        cm.build_imports(str(tmp_path))
+        assert cm.importers_of("utils.py") == ["main.py", "other.py"]
+        assert "main.py" not in cm.import_graph
+
     def test_importers_of_empty(self):
         cm = ContextManager()
         assert cm.importers_of("unknown.py") == []
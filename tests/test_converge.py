@@ -1,6 +1,6 @@
 """tests for converge/ - duality graph and JSON parsing (no LLM needed)."""
 
-from keanu.abilities.world.converge.graph import DualityGraph
+from keanu.abilities.world.converge.graph import DualityGraph, DualityIndex, Duality
 from keanu.abilities.world.converge.engine import LENSES
 from keanu.oracle import interpret
 
@@ -32,6 +32,56 @@ class TestDualityGraph:
         assert isinstance(result, (list, dict, type(None)))
 
 
+class TestDualityIndex:
+    def test_traverse_skips_unrelated(self):
+        g = DualityGraph()
+        assert g.traverse("zzz qqq xxxx") == []
+
+    def test_added_duality_found_by_word_and_substring(self):
+        g = DualityGraph()
+        g.add_duality("t.cache", "caching strategy", "eager", "lazy", tags=["Performance"])
+        by_word = [d.id for d, _ in g.traverse("caching")]
+        by_part = [d.id for d, _ in g.traverse("perform")]
+        assert "t.cache" in by_word
+        assert "t.cache" in by_part
+        assert g.find_by_tag("Performance")[0].id == "t.cache"
+        assert [d.id for d in g.find_by_concept("cach")] == ["t.cache"]
+
+    def test_loaded_graph_indexed(self, tmp_path, capsys):
+        g = DualityGraph()
+        g.add_duality("t.x", "quorum consensus", "fast", "safe", tags=["distributed"])
+        path = tmp_path / "graph.json"
+        g.save(str(path))
+        g2 = DualityGraph()
+        g2.load(str(path))
+        assert "t.x" in [d.id for d, _ in g2.traverse("distributed quorum")]
+        assert len(g2.index) == len(g2.dualities)
+
+    def test_readd_keeps_position_and_drops_old_terms(self):
+        index = DualityIndex()
+        index.add(Duality(id="a", concept="alpha", pole_a="x", pole_b="y", tags=["one"]))
+        index.add(Duality(id="b", concept="beta", pole_a="x", pole_b="y"))
+        index.add(Duality(id="a", concept="gamma", pole_a="x", pole_b="y", tags=["two"]))
+        assert [e.duality.id for e in index.candidates({"x"})] == ["a", "b"]
+        assert index.candidates({"alpha"}) == []
+        assert "one" not in index.tags
+        assert [e.duality.id for e in index.candidates({"gamm"})] == ["a"]
+
+    def test_reindex_after_direct_insert(self):
+        g = DualityGraph()
+        g.dualities["t.raw"] = Duality(id="t.raw", concept="sideloaded", pole_a="in", pole_b="out")
+        assert "t.raw" in [d.id for d, _ in g.traverse("sideloaded")]
+
+    def test_reason_matches_separate_calls(self):
+        g = DualityGraph()
+        query = "is ai consciousness about truth or love"
+        result = g.reason(query)
+        relevant = g.traverse(query)
+        pair = g.find_orthogonal_pair(query)
+        assert [r["id"] for r in result["all_relevant"]] == [d.id for d, _ in relevant]
+        assert {result["duality_a"]["id"], result["duality_b"]["id"]} == {pair[0].id, pair[1].id}
+
+
 class TestLensesConfig:
     def test_six_lenses(self):
         assert len(LENSES) == 6
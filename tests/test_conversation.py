@@ -0,0 +1,86 @@
+"""tests for hero/conversation.py - the token-budgeted transcript."""
+
+from keanu.hero.conversation import Conversation, prompt_budget
+from keanu.oracle import estimate_tokens
+
+
+def _result(n_chars, tag="x"):
+    return "RESULT (OK): " + tag * n_chars
+
+
+class TestConversation:
+
+    def test_render_matches_join(self):
+        convo = Conversation(budget=10_000)
+        for msg in ["TASK: t", "[PROJECT] kind=python", "RESULT (OK): hi"]:
+            convo.append(msg)
+        assert convo.render() == "TASK: t\n\n[PROJECT] kind=python\n\nRESULT (OK): hi"
+        assert convo.compactions == 0
+
+    def test_tracks_tokens(self):
+        convo = Conversation(budget=10_000)
+        convo.append("TASK: t")
+        convo.append(_result(400))
+        assert convo.total_tokens == estimate_tokens("TASK: t") + estimate_tokens(_result(400))
+
+    def test_stays_under_budget(self):
+        convo = Conversation(budget=2_000, keep_recent=2)
+        convo.append("TASK: fix it")
+        for _ in range(40):
+            convo.append(_result(2_000))
+        assert convo.total_tokens <= convo.budget
+        assert estimate_tokens(convo.render()) <= convo.budget + len(convo)
+        assert convo.compactions > 0
+        assert convo.messages[0] == "TASK: fix it"
+        assert convo.messages[1].startswith("[DROPPED]")
+        assert f"{convo.dropped} earlier messages" in convo.messages[1]
+        assert convo.messages[-1] == _result(2_000)
+
+    def test_keeps_pinned_and_recent_verbatim(self):
+        convo = Conversation(budget=2_000, keep_recent=2)
+        convo.append("TASK: fix it")
+        session = "[SESSION] failed twice on foo.py " + "s" * 600
+        convo.append(session)
+        for i in range(5):
+            convo.append(_result(1_500, tag=str(i)))
+        assert convo.messages[0] == "TASK: fix it"
+        assert convo.messages[1] == session
+        assert convo.messages[-1] == _result(1_500, tag="4")
+        assert convo.messages[-2] == _result(1_500, tag="3")
+        assert "[compacted:" in convo.messages[2]
+        assert convo.messages[2].startswith("RESULT (OK): 000")
+
+    def test_compacts_old_tool_output_before_notes(self):
+        convo = Conversation(budget=3_000, keep_recent=2)
+        convo.append("TASK: t")
+        note = "[STATE] " + "n" * 800
+        convo.append(note)
+        for _ in range(5):
+            convo.append(_result(2_000))
+        assert convo.messages[1] == note
+
+    def test_render_reflects_compaction(self):
+        convo = Conversation(budget=1_000, keep_recent=1)
+        convo.append("TASK: t")
+        for _ in range(5):
+            convo.append(_result(2_000))
+        assert convo.render() == "\n\n".join(convo.messages)
+
+    def test_as_messages_marks_stable_prefixes(self):
+        convo = Conversation(budget=10_000)
+        for msg in ["TASK: t", "[PROJECT] kind=python", "RESULT (OK): a", "RESULT (OK): b"]:
+            convo.append(msg)
+        messages = convo.as_messages()
+        assert [m["content"] for m in messages] == convo.messages
+        assert [m.get("cache", False) for m in messages] == [False, True, False, True]
+        assert all(m["role"] == "user" for m in messages)
+
+
+class TestPromptBudget:
+
+    def test_model_window_minus_system_and_reserve(self):
+        system = "s" * 4000
+        assert prompt_budget(system, "claude-opus-4-6", reserve=8192) == 200_000 - 1 - 1000 - 8192
+
+    def test_floor(self):
+        assert prompt_budget("s" * 4_000_000, "claude-opus-4-6") == 1024
@@ -5,9 +5,15 @@ from pathlib import Path
 
 from keanu.analysis.deps import (
     build_import_graph, who_imports, what_imports,
-    find_circular, external_deps, stats,
-    _extract_imports, _build_module_map,
+    find_circular, external_deps, stats, affected_files,
+    ImportGraph, _build_module_map,
 )
+from keanu.analysis.symindex import _python_symbols
+
+
+def _extract_imports(path: Path) -> list[str]:
+    """the imports the symbol index records for a file, which the graph is built from."""
+    return _python_symbols(path.read_text())[2]
 
 
 @pytest.fixture
@@ -196,3 +202,57 @@ class TestStats:
     def test_empty_project(self, tmp_path):
         s = stats(str(tmp_path))
         assert s["files"] == 0
+
+
+class TestIncrementalGraph:
+
+    def test_affected_files_are_transitive(self, mini_project):
+        utils = str(mini_project / "myapp" / "utils.py")
+        assert affected_files([utils], str(mini_project)) == ["myapp/db.py", "myapp/main.py"]
+        assert affected_files(["myapp/main.py"], str(mini_project)) == []
+
+    def test_depends_on(self, mini_project):
+        graph = ImportGraph(mini_project)
+        assert graph.depends_on("myapp/main.py") == ["myapp/db.py", "myapp/utils.py"]
+
+    def test_neighbors_refresh_once(self, mini_project, monkeypatch):
+        graph = ImportGraph(mini_project)
+        refreshes = []
+        real = graph.refresh
+        monkeypatch.setattr(graph, "refresh", lambda: refreshes.append(1) or real())
+        got = graph.neighbors(["myapp/main.py", "myapp/utils.py"])
+        assert got == {
+            "myapp/main.py": (["myapp/utils.py", "myapp/db.py"], []),
+            "myapp/utils.py": ([], ["myapp/db.py", "myapp/main.py"]),
+        }
+        assert len(refreshes) == 1
+
+    def test_edit_resolves_only_that_file(self, mini_project):
+        graph = ImportGraph(mini_project)
+        assert graph.importers("myapp/utils.py") == ["myapp/db.py", "myapp/main.py"]
+        resolved = graph.resolved
+        (mini_project / "myapp" / "db.py").write_text("import sqlite3\ndef connect(): pass\n")
+        assert graph.importers("myapp/utils.py") == ["myapp/main.py"]
+        assert graph.resolved == resolved + 1
+
+    def test_new_module_resolves_its_importers(self, mini_project):
+        graph = ImportGraph(mini_project)
+        (mini_project / "myapp" / "cache.py").write_text("from myapp.store import get\n")
+        assert graph.imports("myapp/cache.py") == []
+        (mini_project / "myapp" / "store.py").write_text("def get(): pass\n")
+        assert graph.imports("myapp/cache.py") == ["myapp/store.py"]
+        (mini_project / "myapp" / "store.py").unlink()
+        assert graph.imports("myapp/cache.py") == []
+        assert "myapp" in graph.as_dict()["external"]
+
+    def test_cycles_follow_edits(self, circular_project):
+        graph = ImportGraph(circular_project)
+        assert graph.cycles() == [["loop/a.py", "loop/b.py", "loop/a.py"]]
+        (circular_project / "loop" / "b.py").write_text("x = 1\n")
+        assert graph.cycles() == []
+        (circular_project / "loop" / "b.py").write_text("import loop.a\n")
+        assert len(graph.cycles()) == 1
+
+    def test_self_import_is_a_cycle(self, tmp_path):
+        (tmp_path / "me.py").write_text("import me\n")
+        assert ImportGraph(tmp_path).cycles() == [["me.py", "me.py"]]
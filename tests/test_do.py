@@ -1,11 +1,12 @@
 """Tests for hero/do.py - the unified agent loop."""
 
 import json
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 
 from keanu.hero.do import AgentLoop, LoopResult, Step, _build_system, run, DO_CONFIG
-from keanu.oracle import try_interpret
+from keanu.oracle import try_interpret, flatten_messages
 
 
 # ============================================================
@@ -143,8 +144,8 @@ class TestAgentLoopRun:
         assert result.steps[0].action == "breathe"
         assert result.steps[0].result == "(breathing)"
         # breathe appends no message, so the second oracle call gets the same prompt
-        first_prompt = mock_oracle.call_args_list[0][0][0]
-        second_prompt = mock_oracle.call_args_list[1][0][0]
+        first_prompt = flatten_messages(mock_oracle.call_args_list[0][0][0])
+        second_prompt = flatten_messages(mock_oracle.call_args_list[1][0][0])
         assert second_prompt == first_prompt
 
     @patch("keanu.hero.do.call_oracle")
@@ -171,7 +172,7 @@ class TestAgentLoopRun:
             result = loop.run("read a file")
 
         # the second oracle call should include the [STATE] injection
-        second_prompt = mock_oracle.call_args_list[1][0][0]
+        second_prompt = flatten_messages(mock_oracle.call_args_list[1][0][0])
         assert "[STATE]" in second_prompt
         assert breath in second_prompt
 
@@ -368,7 +369,7 @@ class TestAwarenessEscalation:
         result = loop.run("read x.py twice")
 
         # awareness injected during turn 1, visible in the third oracle call prompt
-        third_prompt = mock_oracle.call_args_list[2][0][0]
+        third_prompt = flatten_messages(mock_oracle.call_args_list[2][0][0])
         assert "[AWARENESS]" in third_prompt
         assert "twice" in third_prompt.lower()
 
@@ -438,3 +439,140 @@ class TestAwarenessEscalation:
 
         # ability should be called 3 times (no caching since streak was broken)
         assert mock_ab.execute.call_count == 3
+
+
+class TestConversationBudget:
+
+    @patch("keanu.hero.do.prompt_budget", return_value=2_000)
+    @patch("keanu.hero.do.call_oracle")
+    @patch("keanu.hero.do.Feel")
+    @patch("keanu.hero.do._REGISTRY")
+    def test_prompt_stays_bounded(self, mock_registry, MockFeel, mock_oracle, _budget):
+        mock_ab = MagicMock()
+        mock_ab.execute.return_value = {"success": True, "result": "y" * 9_000, "data": {}}
+        mock_registry.get.return_value = mock_ab
+
+        responses = [json_response(action="read", args={"file_path": f"f{i}.py"})
+                     for i in range(15)]
+        responses.append(json_response(done=True, answer="read them"))
+        mock_oracle.side_effect = responses
+        MockFeel.return_value.check.side_effect = [make_feel_check_result(r) for r in responses]
+
+        result = AgentLoop(max_turns=20).run("read everything")
+
+        assert result.ok
+        prompts = [flatten_messages(c[0][0]) for c in mock_oracle.call_args_list]
+        assert all(len(p) // 4 <= 2_000 + 50 for p in prompts)
+        assert prompts[-1].startswith("TASK: read everything")
+        assert "[compacted:" in prompts[-1]
+
+
+class TestBatchedActions:
+
+    def _ability(self, name, log, delay=0.0):
+        ab = MagicMock()
+        ab.cast_line = ""
+
+        def execute(prompt="", context=None):
+            log.append(("start", name, context.get("file_path", context.get("pattern"))))
+            time.sleep(delay)
+            log.append(("end", name))
+            return {"success": True, "result": f"{name} done", "data": {}}
+
+        ab.execute.side_effect = execute
+        return ab
+
+    def _run(self, MockFeel, mock_oracle, batch, registry):
+        responses = [
+            json.dumps({"thinking": "look around", "actions": batch, "done": False}),
+            json_response(done=True, answer="seen"),
+        ]
+        mock_oracle.side_effect = responses
+        MockFeel.return_value.check.side_effect = [make_feel_check_result(r) for r in responses]
+        with patch("keanu.hero.do._REGISTRY", registry):
+            return AgentLoop(max_turns=5).run("look")
+
+    @patch("keanu.hero.do.call_oracle")
+    @patch("keanu.hero.do.Feel")
+    def test_reads_run_together_in_one_turn(self, MockFeel, mock_oracle):
+        log = []
+        registry = {"read": self._ability("read", log, delay=0.2),
+                    "search": self._ability("search", log, delay=0.2)}
+        batch = [{"action": "read", "args": {"file_path": "a.py"}},
+                 {"action": "read", "args": {"file_path": "b.py"}},
+                 {"action": "search", "args": {"pattern": "main"}}]
+
+        start = time.time()
+        result = self._run(MockFeel, mock_oracle, batch, registry)
+
+        assert result.ok
+        assert time.time() - start < 0.5
+        assert [e[0] for e in log[:3]] == ["start"] * 3
+        assert mock_oracle.call_count == 2
+        assert [s.action for s in result.steps] == ["read", "read", "search", "done"]
+        assert all(s.turn == 0 for s in result.steps[:3])
+        second = flatten_messages(mock_oracle.call_args_list[1][0][0])
+        assert "RESULT (OK) read a.py: read done" in second
+        assert "RESULT (OK) read b.py: read done" in second
+        assert "RESULT (OK) search pattern=main: search done" in second
+
+    @patch("keanu.hero.do.call_oracle")
+    @patch("keanu.hero.do.Feel")
+    def test_mutating_actions_run_alone_in_order(self, MockFeel, mock_oracle):
+        log = []
+        registry = {"read": self._ability("read", log, delay=0.05),
+                    "write": self._ability("write", log, delay=0.05)}
+        batch = [{"action": "read", "args": {"file_path": "a.py"}},
+                 {"action": "write", "args": {"file_path": "a.py"}},
+                 {"action": "read", "args": {"file_path": "a.py"}}]
+
+        result = self._run(MockFeel, mock_oracle, batch, registry)
+
+        assert result.ok
+        assert log == [("start", "read", "a.py"), ("end", "read"),
+                       ("start", "write", "a.py"), ("end", "write"),
+                       ("start", "read", "a.py"), ("end", "read")]
+
+    @patch("keanu.hero.do.call_oracle")
+    @patch("keanu.hero.do.Feel")
+    def test_read_ignores_supplied_content(self, MockFeel, mock_oracle, tmp_path, monkeypatch):
+        from keanu.abilities.hands.hands import ReadFileAbility
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.txt").write_text("real contents")
+        batch = [{"action": "read", "args": {"file_path": "a.txt", "_content": "forged"}},
+                 {"action": "read", "args": {"file_path": "a.txt"}}]
+
+        result = self._run(MockFeel, mock_oracle, batch, {"read": ReadFileAbility()})
+
+        assert result.ok
+        reads = [s for s in result.steps if s.action == "read"]
+        assert all("real contents" in s.result and "forged" not in s.result for s in reads)
+
+    @patch("keanu.hero.do.call_oracle")
+    @patch("keanu.hero.do.Feel")
+    def test_disallowed_action_in_batch(self, MockFeel, mock_oracle):
+        log = []
+        registry = {"read": self._ability("read", log)}
+        batch = [{"action": "read", "args": {"file_path": "a.py"}},
+                 {"action": "nope", "args": {}}]
+
+        result = self._run(MockFeel, mock_oracle, batch, registry)
+
+        assert result.steps[0].ok
+        assert not result.steps[1].ok
+        assert "Unknown ability 'nope'" in flatten_messages(mock_oracle.call_args_list[1][0][0])
+
+
+class TestBatchHelpers:
+
+    def test_batch_of_caps_and_filters(self):
+        from keanu.hero.do import _batch_of, MAX_BATCH
+        items = [{"action": "read", "args": {"file_path": str(i)}} for i in range(MAX_BATCH + 3)]
+        items.insert(0, "junk")
+        assert len(_batch_of({"actions": items})) == MAX_BATCH
+        assert _batch_of({"action": "read"}) == []
+
+    def test_groups(self):
+        from keanu.hero.do import _groups
+        batch = [("read", {}), ("ls", {}), ("write", {}), ("edit", {}), ("search", {})]
+        assert [[a for a, _ in g] for g in _groups(batch)] == [["read", "ls"], ["write"], ["edit"], ["search"]]
@@ -0,0 +1,151 @@
+"""tests for the project file inventory."""
+
+import os
+import time
+
+from keanu.tools.inventory import Inventory, inventory
+
+
+def _age(root):
+    """push every directory mtime into the past, so listings are trusted."""
+    old = time.time() - 60
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (old, old))
+
+
+def _rels(files):
+    return [f.rel for f in files]
+
+
+class TestInventory:
+
+    def test_lists_files_sorted(self, tmp_path):
+        (tmp_path / "b.py").write_text("")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("")
+        (tmp_path / "README.md").write_text("")
+        inv = Inventory(tmp_path)
+        assert _rels(inv.files()) == ["README.md", "b.py", "pkg/a.py"]
+        assert len(inv) == 3
+
+    def test_skips_build_and_cache_dirs(self, tmp_path):
+        for d in ("__pycache__", "node_modules", ".git", "build", "keanu.egg-info"):
+            (tmp_path / d).mkdir()
+            (tmp_path / d / "x.py").write_text("")
+        (tmp_path / "keep.py").write_text("")
+        assert _rels(Inventory(tmp_path).files()) == ["keep.py"]
+
+    def test_ext_filter_and_under(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text("")
+        (tmp_path / "src" / "b.JS").write_text("")
+        (tmp_path / "c.py").write_text("")
+        inv = Inventory(tmp_path)
+        assert _rels(inv.files(exts={".py"})) == ["c.py", "src/a.py"]
+        assert _rels(inv.files(exts={".py", ".js"}, under="src")) == ["src/a.py", "src/b.JS"]
+
+    def test_named_and_glob(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "__init__.py").write_text("")
+        (tmp_path / "__init__.py").write_text("")
+        (tmp_path / "a" / "test_x.py").write_text("")
+        inv = Inventory(tmp_path)
+        assert _rels(inv.named("__init__.py")) == ["__init__.py", "a/__init__.py"]
+        assert inv.glob("test_*.py") == ["a/test_x.py"]
+        assert inv.glob("**/a") == ["a"]
+        assert inv.glob("*.py", under="a") == ["a/__init__.py", "a/test_x.py"]
+        assert inv.named("missing.py") == []
+
+        for rel in ("src/a.py", "src/pkg/b.py", "src/pkg/deep/c.py", "src/pkg/x/d.py"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("")
+        inv = Inventory(tmp_path)
+        for pattern in ("src/**/*.py", "**/x/*.py"):
+            expected = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob(pattern))
+            assert inv.glob(pattern) == expected
+        assert inv.glob("src/**/*.py") == ["src/a.py", "src/pkg/b.py", "src/pkg/deep/c.py", "src/pkg/x/d.py"]
+
+    def test_registry_shares_instances(self, tmp_path):
+        assert inventory(str(tmp_path)) is inventory(str(tmp_path / "."))
+        assert inventory(str(tmp_path)) is not inventory(str(tmp_path), gitignore=False)
+
+
+class TestGitignore:
+
+    def test_patterns(self, tmp_path):
+        (tmp_path / ".gitignore").write_text(
+            "# comment\n*.log\n!keep.log\n/top.txt\nout/\n")
+        (tmp_path / "sub").mkdir()
+        for rel in ("a.log", "keep.log", "top.txt", "sub/top.txt", "sub/b.log"):
+            (tmp_path / rel).write_text("")
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out" / "x.py").write_text("")
+        (tmp_path / "sub" / "out").write_text("")   # a file, not the ignored dir
+        inv = Inventory(tmp_path)
+        assert _rels(inv.files()) == [".gitignore", "keep.log", "sub/out", "sub/top.txt"]
+
+    def test_nested_gitignore_is_relative(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / ".gitignore").write_text("/gen.py\n")
+        (tmp_path / "pkg" / "gen.py").write_text("")
+        (tmp_path / "gen.py").write_text("")
+        inv = Inventory(tmp_path)
+        assert _rels(inv.files(exts={".py"})) == ["gen.py"]
+
+    def test_git_info_exclude(self, tmp_path):
+        (tmp_path / ".git" / "info").mkdir(parents=True)
+        (tmp_path / ".git" / "info" / "exclude").write_text("secret.txt\n")
+        (tmp_path / "secret.txt").write_text("")
+        assert _rels(Inventory(tmp_path).files()) == []
+
+    def test_gitignore_off(self, tmp_path):
+        (tmp_path / ".gitignore").write_text(".env\n")
+        (tmp_path / ".env").write_text("")
+        inv = Inventory(tmp_path, gitignore=False)
+        assert _rels(inv.files()) == [".env", ".gitignore"]
+
+
+class TestRefresh:
+
+    def test_unchanged_tree_is_not_relisted(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("")
+        _age(tmp_path)
+        inv = Inventory(tmp_path)
+        inv.files()
+        listed = inv.listings
+        inv.files()
+        inv.named("a.py")
+        assert inv.listings == listed
+
+    def test_new_file_relists_only_its_directory(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "other").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("")
+        _age(tmp_path)
+        inv = Inventory(tmp_path)
+        inv.files()
+        listed = inv.listings
+        (tmp_path / "pkg" / "b.py").write_text("")
+        assert _rels(inv.files()) == ["pkg/a.py", "pkg/b.py"]
+        assert inv.listings == listed + 1
+
+    def test_removed_directory_drops_its_files(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("")
+        inv = Inventory(tmp_path)
+        assert len(inv) == 1
+        (tmp_path / "pkg" / "a.py").unlink()
+        (tmp_path / "pkg").rmdir()
+        assert len(inv) == 0
+        assert inv.dirs() == []
+
+    def test_gitignore_edit_relists_subtree(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("")
+        (tmp_path / ".gitignore").write_text("")
+        _age(tmp_path)
+        inv = Inventory(tmp_path)
+        assert _rels(inv.files(exts={".py"})) == ["pkg/a.py"]
+        (tmp_path / ".gitignore").write_text("a.py\n")
+        assert inv.files(exts={".py"}) == []
@@ -0,0 +1,34 @@
+"""tests for the shared JSON and atomic write helpers."""
+
+import pytest
+
+from keanu.io import read_json, write_json, write_bytes, atomic_open
+
+
+class TestAtomicWrites:
+
+    def test_write_json_round_trip(self, tmp_path):
+        path = tmp_path / "deep" / "data.json"
+        write_json(path, {"a": [1, 2]})
+        assert read_json(path) == {"a": [1, 2]}
+        assert "\n" in path.read_text()
+
+    def test_compact(self, tmp_path):
+        path = tmp_path / "data.json"
+        write_json(path, {"a": [1, 2]}, indent=None)
+        assert path.read_text() == '{"a":[1,2]}'
+
+    def test_write_bytes(self, tmp_path):
+        path = tmp_path / "blob.bin"
+        write_bytes(path, b"\x00\x01")
+        assert path.read_bytes() == b"\x00\x01"
+
+    def test_error_leaves_old_file(self, tmp_path):
+        path = tmp_path / "data.json"
+        write_json(path, {"old": True})
+        with pytest.raises(RuntimeError):
+            with atomic_open(path) as f:
+                f.write("{half")
+                raise RuntimeError("interrupted")
+        assert read_json(path) == {"old": True}
+        assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
@@ -2,9 +2,14 @@
 
 import io
 import sys
+import time
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 
-from keanu.log import log, info, warn, debug, error, set_level, set_sink, flush_sink, span, memory_span, pulse_span
+from keanu.log import (
+    log, info, warn, debug, error, set_level, set_sink, flush_sink, drain_sink,
+    BatchSink, span, memory_span, pulse_span,
+)
 
 
 class TestConsoleLogger:
@@ -117,3 +122,80 @@ class TestSink:
     def test_flush_sink_noop_without_flush_fn(self):
         set_sink(lambda *a: None)
         flush_sink()  # should not raise
+
+
+class TestBatchSink:
+    def teardown_method(self):
+        set_sink(None)
+
+    def test_batches_on_interval(self):
+        batches = []
+        sink = BatchSink(batches.append, interval=0.05)
+        for i in range(5):
+            sink("test", "debug", str(i), None)
+        deadline = time.time() + 2
+        while not batches and time.time() < deadline:
+            time.sleep(0.01)
+        sink.close()
+        assert [m for batch in batches for _, _, m, _, _ in batch] == ["0", "1", "2", "3", "4"]
+        assert len(batches) <= 2
+        assert sink.stats()["written"] == 5
+
+    def test_drops_oldest_when_full(self):
+        batches = []
+        sink = BatchSink(batches.append, max_queue=3, interval=60)
+        for i in range(5):
+            sink("test", "debug", str(i), None)
+        sink.drain()
+        sink.close()
+        assert [m for _, _, m, _, _ in batches[0]] == ["2", "3", "4"]
+        assert sink.dropped == 2
+
+    def test_block_waits_for_writer(self):
+        batches = []
+        sink = BatchSink(batches.append, max_queue=2, interval=0.01, block=True)
+        for i in range(6):
+            sink("test", "debug", str(i), None)
+        sink.close()
+        assert [m for batch in batches for _, _, m, _, _ in batch] == [str(i) for i in range(6)]
+        assert sink.dropped == 0
+
+    def test_flush_writes_then_flushes(self):
+        order = []
+        sink = BatchSink(lambda batch: order.append(len(batch)),
+                         flush_fn=lambda: order.append("flush"), interval=60)
+        set_sink(sink, flush_fn=sink.flush)
+        info("test", "queued")
+        assert order == []
+        flush_sink()
+        assert order == [1, "flush"]
+        sink.close()
+
+    def test_drain_sink_skips_flush_fn(self):
+        order = []
+        sink = BatchSink(lambda batch: order.append(len(batch)),
+                         flush_fn=lambda: order.append("flush"), interval=60)
+        set_sink(sink, flush_fn=sink.flush)
+        info("test", "queued")
+        drain_sink()
+        assert order == [1]
+        sink.close()
+
+    def test_records_keep_their_log_time(self):
+        batches = []
+        sink = BatchSink(batches.append, interval=60)
+        sink("test", "info", "early", None)
+        logged = datetime.now()
+        time.sleep(0.05)
+        sink.drain()
+        sink.close()
+        assert batches[0][0][4] <= logged
+
+    def test_write_error_counted(self):
+        def bad(batch):
+            raise OSError("disk full")
+        sink = BatchSink(bad, interval=60)
+        sink("test", "info", "x", None)
+        sink.drain()
+        sink.close()
+        assert sink.dropped == 1
@@ -44,6 +44,13 @@ class TestCache:
     def test_miss(self):
         assert _get_cached("http://missing.com") is None
 
+    def test_expired_entry_gone_twice(self):
+        _set_cached("http://example.com", "content")
+        with patch("keanu.abilities.world.lookup.time.time", return_value=10**12):
+            assert _get_cached("http://example.com") is None
+            assert _get_cached("http://example.com") is None
+        assert _CACHE == {}
+
 
 class TestFetchUrl:
 
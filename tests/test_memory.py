@@ -2,10 +2,15 @@
 
 import json
 import os
+import shutil
 import tempfile
+import time
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 from keanu.memory.memberberry import (
     Memory,
     MemoryType,
@@ -135,6 +140,192 @@ class TestStore:
             assert tags == ["alpha", "beta", "gamma"]
 
 
+class TestRecallIndex:
+    def _patches(self, tmp_path):
+        from contextlib import ExitStack
+        stack = ExitStack()
+        stack.enter_context(patch("keanu.memory.memberberry.MEMBERBERRY_DIR", tmp_path))
+        stack.enter_context(patch("keanu.memory.memberberry.MEMORIES_FILE", tmp_path / "memories.json"))
+        stack.enter_context(patch("keanu.memory.memberberry.PLANS_FILE", tmp_path / "plans.json"))
+        stack.enter_context(patch("keanu.memory.memberberry.CONFIG_FILE", tmp_path / "config.json"))
+        return stack
+
+    def test_recall_scores_match_relevance_score(self, tmp_path):
+        with self._patches(tmp_path):
+            store = MemberberryStore()
+            mems = [
+                Memory(content="ship the product", memory_type="goal", tags=["build"], importance=8),
+                Memory(content="product feedback matters", memory_type="insight", tags=["career"]),
+                Memory(content="ship on fridays", memory_type="fact", context="product launch"),
+            ]
+            expected = {m.id: m.relevance_score(query_tags=["build"], query_text="ship product") for m in mems}
+            for m in mems:
+                store.remember(m)
+            results = store.recall(query="ship product", tags=["build"])
+            assert {r["id"]: r["_relevance_score"] for r in results} == expected
+
+    def test_recall_only_returns_overlapping(self, tmp_path):
+        with self._patches(tmp_path):
+            store = MemberberryStore()
+            store.remember(Memory(content="ship v1", memory_type="goal"))
+            store.remember(Memory(content="call mom", memory_type="commitment", tags=["family"]))
+            assert [r["content"] for r in store.recall(query="ship")] == ["ship v1"]
+            assert [r["content"] for r in store.recall(tags=["family"])] == ["call mom"]
+            assert store.recall(query="nothing matches") == []
+            assert len(store.recall()) == 2
+
+    def test_writes_append_instead_of_rewriting(self, tmp_path):
+        with self._patches(tmp_path):
+            store = MemberberryStore()
+            mid = store.remember(Memory(content="ship v1", memory_type="goal"))
+            store.recall(query="ship")
+            store.recall(query="ship")
+            store.deprioritize(mid)
+            assert not (tmp_path / "memories.json").exists()
+            segment = tmp_path / "memories.segments" / "000001.jsonl"
+            assert len(segment.read_text().strip().split("\n")) == 4
+
+            reopened = MemberberryStore()
+            assert reopened.memories[0]["recall_count"] == 2
+            assert reopened.memories[0]["importance"] == 1
+
+    def test_compaction_folds_log_into_snapshot(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        with self._patches(tmp_path), patch.object(RecordLog, "COMPACT_MIN_RECORDS", 3):
+            store = MemberberryStore()
+            store.remember(Memory(content="memory one", memory_type="fact"))
+            store.remember(Memory(content="memory two", memory_type="fact"))
+            store.recall(query="memory")
+            saved = json.loads((tmp_path / "memories.json").read_text())
+            assert [m["recall_count"] for m in saved] == [1, 1]
+            manifest = json.loads((tmp_path / "memories.manifest.json").read_text())
+            assert manifest["tail"][0] == 1
+            store.remember(Memory(content="memory three", memory_type="fact"))
+
+            reopened = MemberberryStore()
+            assert [m["content"] for m in reopened.memories] == ["memory one", "memory two", "memory three"]
+            assert reopened._memory_log.tail_records == 1
+
+    def test_index_persisted_and_reused(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        with self._patches(tmp_path), patch.object(RecordLog, "COMPACT_MIN_RECORDS", 1):
+            store = MemberberryStore()
+            store.remember(Memory(content="ship v1", memory_type="goal", tags=["build"]))
+            store.recall(query="ship")
+            index = json.loads((tmp_path / "memories.index.json").read_text())
+            assert "ship" in index["words"]
+            assert "build" in index["tags"]
+            store.remember(Memory(content="tail only", memory_type="fact"))
+
+            with patch.object(MemberberryStore, "_index_memory", wraps=MemberberryStore._index_memory) as indexed:
+                reopened = MemberberryStore()
+                assert indexed.call_count == 1
+            assert reopened.recall(query="ship")[0]["content"] == "ship v1"
+            assert reopened.recall(query="tail")[0]["content"] == "tail only"
+
+    def test_stale_index_rebuilt(self, tmp_path):
+        with self._patches(tmp_path):
+            (tmp_path / "memories.json").write_text(json.dumps([
+                Memory(content="hand edited entry", memory_type="fact").__dict__,
+            ]))
+            (tmp_path / "memories.index.json").write_text(json.dumps(
+                {"signature": [0, 0], "words": {}, "tags": {}}
+            ))
+            store = MemberberryStore()
+            assert store.recall(query="edited")[0]["content"] == "hand edited entry"
+
+    def test_plans_logged(self, tmp_path):
+        with self._patches(tmp_path):
+            store = MemberberryStore()
+            pid = store.create_plan(Plan(title="ship it"))
+            store.update_plan_status(pid, "active")
+            assert not (tmp_path / "plans.json").exists()
+            reopened = MemberberryStore()
+            assert reopened.get_plans(status="active")[0]["id"] == pid
+
+
+class TestRecordLog:
+    def test_legacy_snapshot_loads(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        (tmp_path / "m.json").write_text(json.dumps([{"id": "a", "v": 1}]))
+        log = RecordLog(tmp_path / "m.json")
+        assert log.load() == [{"id": "a", "v": 1}]
+
+    def test_append_update_replay(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        log = RecordLog(tmp_path / "m.json")
+        log.append({"id": "a", "v": 1, "_score": 9})
+        log.append({"id": "b", "v": 1})
+        log.update([{"id": "a", "v": 2}, {"id": "ghost", "v": 3}])
+        assert RecordLog(tmp_path / "m.json").load() == [{"id": "a", "v": 2}, {"id": "b", "v": 1}]
+
+    def test_torn_line_is_skipped_and_sealed(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        log = RecordLog(tmp_path / "m.json")
+        log.append({"id": "a", "v": 1})
+        segment = tmp_path / "m.segments" / "000001.jsonl"
+        with open(segment, "a") as f:
+            f.write('{"id": "b", "v"')
+        log.append({"id": "c", "v": 1})
+        assert [r["id"] for r in RecordLog(tmp_path / "m.json").load()] == ["a", "c"]
+
+    def test_compact_skips_folded_tail(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        log = RecordLog(tmp_path / "m.json")
+        log.append({"id": "a", "v": 1})
+        records = log.load()
+        log.compact(records)
+        log.update([{"id": "a", "v": 2}])
+
+        fresh = RecordLog(tmp_path / "m.json")
+        assert fresh.load() == [{"id": "a", "v": 2}]
+        assert fresh.tail_records == 1
+
+    def test_stale_manifest_replays_everything(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        log = RecordLog(tmp_path / "m.json")
+        log.append({"id": "a", "v": 1})
+        log.update([{"id": "a", "v": 2}])
+        log.compact(log.load())
+        log.update([{"id": "a", "v": 3}])
+        (tmp_path / "m.manifest.json").unlink()
+        assert RecordLog(tmp_path / "m.json").load() == [{"id": "a", "v": 3}]
+
+    def _segment(self, tmp_path, text):
+        segments = tmp_path / "m.segments"
+        segments.mkdir()
+        (segments / "000001.jsonl").write_text(text)
+
+    def test_replays_raw_lines(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        self._segment(tmp_path,
+                      '{"id":"abc","content":"first","memory_type":"goal"}\n'
+                      '{"id":"def","content":"second","memory_type":"fact"}\n')
+        records = RecordLog(tmp_path / "m.json").load()
+        assert len(records) == 2
+        assert records[0]["content"] == "first"
+        assert records[1]["content"] == "second"
+
+    def test_replays_update_lines(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        self._segment(tmp_path,
+                      '{"id":"abc","content":"first","importance":5}\n'
+                      '{"id":"abc","importance":1,"_update":true,"_updated_at":"2026-02-14"}\n')
+        records = RecordLog(tmp_path / "m.json").load()
+        assert records == [{"id": "abc", "content": "first", "importance": 1}]
+
+    def test_rotation_and_cleanup(self, tmp_path):
+        from keanu.memory.logstore import RecordLog
+        log = RecordLog(tmp_path / "m.json")
+        log.SEGMENT_BYTES = 40
+        for i in range(4):
+            log.append({"id": str(i), "text": "x" * 30})
+        assert len(list((tmp_path / "m.segments").glob("*.jsonl"))) == 4
+        log.compact(log.load())
+        assert len(list((tmp_path / "m.segments").glob("*.jsonl"))) == 1
+        assert len(RecordLog(tmp_path / "m.json").load()) == 4
+
+
 class TestPlanGenerator:
     def test_generate_plan(self, tmp_path):
         with patch("keanu.memory.memberberry.MEMBERBERRY_DIR", tmp_path), \
@@ -180,28 +371,6 @@ class TestPlan:
 
 
 class TestJSONL:
-    def test_load_jsonl(self, tmp_path):
-        jsonl_file = tmp_path / "test.jsonl"
-        jsonl_file.write_text(
-            '{"id":"abc","content":"first","memory_type":"goal"}\n'
-            '{"id":"def","content":"second","memory_type":"fact"}\n'
-        )
-        records = MemberberryStore._load_jsonl(jsonl_file)
-        assert len(records) == 2
-        assert records[0]["content"] == "first"
-        assert records[1]["content"] == "second"
-
-    def test_load_jsonl_with_updates(self, tmp_path):
-        jsonl_file = tmp_path / "test.jsonl"
-        jsonl_file.write_text(
-            '{"id":"abc","content":"first","importance":5}\n'
-            '{"id":"abc","importance":1,"_update":true,"_updated_at":"2026-02-14"}\n'
-        )
-        records = MemberberryStore._load_jsonl(jsonl_file)
-        assert len(records) == 1
-        assert records[0]["importance"] == 1
-        assert records[0]["content"] == "first"
-
     def test_append_jsonl(self, tmp_path):
         jsonl_file = tmp_path / "sub" / "test.jsonl"
         MemberberryStore._append_jsonl(jsonl_file, {"id": "abc", "content": "test"})
@@ -375,6 +544,44 @@ class TestLedger:
             store.flush()
             mock_commit.assert_not_called()
 
+    def test_append_logs_one_write(self, tmp_path):
+        store = self._make_store(tmp_path)
+        at = datetime(2026, 1, 31, 23, 59, 59)
+        store.append_logs([("a", "info", "one", None, at), ("b", "warn", "two", {"k": 1}, at)])
+        lines = [json.loads(line) for line in store._log_shard_path(at).read_text().splitlines()]
+        assert [line["content"] for line in lines] == ["one", "two"]
+        assert lines[1]["attrs"] == {"k": 1}
+        assert lines[0]["created_at"] == at.isoformat()
+        assert store._log_shard_path(at).name == "2026-01.jsonl"
+        assert store._log_count == 2
+
+    def test_flush_in_background(self, tmp_path):
+        store = self._make_store(tmp_path)
+        store.append_log("test", "info", "entry")
+        with patch("keanu.memory.gitstore.subprocess.Popen") as popen, \
+             patch.object(store, '_commit_and_push') as mock_commit:
+            store.flush(wait=False)
+        mock_commit.assert_not_called()
+        args = popen.call_args[0][0]
+        assert args[:2] == ["sh", "-c"]
+        assert DEFAULT_HERO in args[-1]
+        assert popen.call_args[1]["start_new_session"] is True
+        assert store._log_count == 0
+
+    def test_background_commit_lands(self, tmp_path):
+        if not shutil.which("git"):
+            pytest.skip("git not installed")
+        store = self._make_store(tmp_path)
+        store._git("config", "user.email", "t@example.com")
+        store._git("config", "user.name", "t")
+        store.append_log("test", "info", "entry")
+        store.flush(wait=False)
+        for _ in range(100):
+            if store._git("log", "--oneline", check=False).stdout.strip():
+                break
+            time.sleep(0.05)
+        assert "log: " in store._git("log", "--oneline", check=False).stdout
+
     def test_recall_finds_logs_via_log(self, tmp_path):
         """recall searches JSONL files written by the sink."""
         from keanu.log import recall as log_recall
@@ -5,9 +5,10 @@ import pytest
 
 from keanu.abilities.world.metrics import (
     record_fire, record_ash, record_forge,
-    ratio, by_ability, by_legend, forges, dashboard,
-    _dashboard_message,
+    ratio, by_ability, by_legend, by_model, forges, dashboard,
+    _dashboard_message, MetricsRollup, DAY,
 )
+from keanu.io import append_jsonl
 
 
 @pytest.fixture(autouse=True)
@@ -181,3 +182,82 @@ class TestDashboardMessage:
         msg = _dashboard_message({"total": 10, "ratio": 0.5, "trend": "stable",
                                    "prev_ratio": 0.5, "fire": 5, "ash": 5})
         assert "stable" in msg
+
+
+class TestRollup:
+
+    def _history(self, path, now):
+        """three weeks of records, a few per day, oldest first."""
+        for hours in range(21 * 24, 0, -5):
+            ts = now - hours * 3600
+            append_jsonl(path, {"ts": ts, "type": "fire", "legend": f"l{hours % 3}",
+                                "model": "m", "tokens": hours})
+            append_jsonl(path, {"ts": ts + 1, "type": "ash", "ability": f"a{hours % 4}",
+                                "success": hours % 7 != 0})
+            if hours % 50 == 0:
+                append_jsonl(path, {"ts": ts + 2, "type": "forge", "ability": f"f{hours}"})
+
+    def _brute(self, path, after, until=None):
+        import json
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        return [r for r in records if r["ts"] > after and (until is None or r["ts"] <= until)]
+
+    def test_matches_full_scan(self, isolated_metrics):
+        now = int(time.time())
+        self._history(isolated_metrics, now)
+        roll = MetricsRollup(isolated_metrics)
+        for after, until in [(now - 7 * DAY, None), (now - 14 * DAY, now - 7 * DAY),
+                             (now - 3 * DAY + 123, now - DAY - 77)]:
+            records = self._brute(isolated_metrics, after, until)
+            totals = roll.totals(after, until)
+            assert totals["fire"] == sum(r["type"] == "fire" for r in records)
+            assert totals["ash"] == sum(r["type"] == "ash" for r in records)
+            assert totals["forge"] == sum(r["type"] == "forge" for r in records)
+            tokens = sum(r.get("tokens", 0) for r in records if r.get("legend") == "l1")
+            assert totals["legends"]["l1"][1] == tokens
+        forged = [r for r in self._brute(isolated_metrics, now - 10 * DAY) if r["type"] == "forge"]
+        assert [r for r in roll.records(now - 10 * DAY) if r["type"] == "forge"] == forged
+
+    def test_folds_only_new_lines(self, isolated_metrics):
+        record_fire("a", legend="creator")
+        roll = MetricsRollup(isolated_metrics)
+        roll.refresh()
+        folded = roll.folded
+        record_ash("read")
+        roll.refresh()
+        assert roll.folded > folded
+        assert roll.totals(0)["ash"] == 1
+        assert roll.totals(0)["fire"] == 1
+
+    def test_persisted_for_next_process(self, isolated_metrics):
+        record_fire("a", legend="creator", tokens=10)
+        MetricsRollup(isolated_metrics).refresh()
+        fresh = MetricsRollup(isolated_metrics)
+        fresh.refresh()
+        assert fresh.folded == isolated_metrics.stat().st_size
+        assert fresh.totals(0)["legends"] == {"creator": [1, 10]}
+
+    def test_torn_line_waits(self, isolated_metrics):
+        record_ash("read")
+        with open(isolated_metrics, "a") as f:
+            f.write('{"ts": 1, "type": "ash"')
+        roll = MetricsRollup(isolated_metrics)
+        assert roll.totals(0)["ash"] == 1
+        with open(isolated_metrics, "a") as f:
+            f.write(', "ability": "edit"}\n')
+        assert roll.totals(0)["ash"] == 2
+
+    def test_truncated_log_refolds(self, isolated_metrics):
+        record_ash("read")
+        record_ash("read")
+        roll = MetricsRollup(isolated_metrics)
+        assert roll.totals(0)["ash"] == 2
+        isolated_metrics.write_text("")
+        record_fire("a")
+        assert roll.totals(0)["ash"] == 0
+        assert roll.totals(0)["fire"] == 1
+
+    def test_by_model(self):
+        record_fire("a", model="opus", tokens=5)
+        record_fire("b", model="opus", tokens=7)
+        assert by_model() == [{"model": "opus", "calls": 2, "total_tokens": 12}]
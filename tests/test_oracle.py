@@ -1,12 +1,26 @@
 """tests for oracle upgrades: token estimation, fallback, caching, cost tracking."""
 
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+import keanu.oracle as oracle_mod
+
 from keanu.oracle import (
     estimate_tokens, context_remaining, _model_context_window,
     fallback_models, OracleUsage, SessionCost, get_session_cost,
     reset_session_cost, call_oracle, interpret, try_interpret,
-    _get_cached_response, _set_cached_response, _RESPONSE_CACHE,
+    _get_cached_response, _set_cached_response,
+    _reach_local, close_sessions, set_pool_size, ResponseCache, collect_stream,
+    acall_oracle, astream_oracle, aclose_oracle, gather_oracle, race_oracle,
+    flatten_messages, _cloud_body, _local_body, _CloudStream,
 )
 
 
@@ -120,10 +134,15 @@ class TestSessionCost:
         assert get_session_cost().calls == 0
 
 
-class TestResponseCache:
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = ResponseCache(tmp_path / "oracle_cache")
+    with patch("keanu.oracle._RESPONSE_CACHE", cache):
+        yield cache
 
-    def setup_method(self):
-        _RESPONSE_CACHE.clear()
+
+@pytest.mark.usefixtures("response_cache")
+class TestResponseCache:
 
     def test_set_and_get(self):
         _set_cached_response("prompt", "system", "model", "response")
@@ -136,6 +155,38 @@ class TestResponseCache:
         _set_cached_response("prompt", "system", "model-a", "response-a")
         assert _get_cached_response("prompt", "system", "model-b") is None
 
+    def test_persists_across_instances(self, response_cache):
+        _set_cached_response("prompt", "", "model", "kept")
+        assert ResponseCache(response_cache.directory).get("prompt", "", "model") == "kept"
+
+    def test_ttl_per_model(self, response_cache):
+        with patch.dict("keanu.oracle.CACHE_TTLS", {"short": 0}):
+            _set_cached_response("p", "", "short", "gone")
+            _set_cached_response("p", "", "long", "kept")
+            assert _get_cached_response("p", "", "short") is None
+            assert _get_cached_response("p", "", "long") == "kept"
+        assert len(response_cache) == 1
+
+    def test_lru_eviction_by_entries(self, response_cache):
+        response_cache.max_entries = 2
+        _set_cached_response("a", "", "m", "A")
+        _set_cached_response("b", "", "m", "B")
+        for prompt, t in (("a", 1), ("b", 2)):
+            os.utime(response_cache.directory / (ResponseCache.key(prompt, "", "m") + ".json"), (t, t))
+        response_cache._usage = None
+        assert _get_cached_response("a", "", "m") == "A"  # a is now the freshest
+        _set_cached_response("c", "", "m", "C")
+        assert _get_cached_response("b", "", "m") is None
+        assert _get_cached_response("a", "", "m") == "A"
+        assert _get_cached_response("c", "", "m") == "C"
+
+    def test_eviction_by_bytes(self, response_cache):
+        response_cache.max_bytes = 600
+        for i in range(5):
+            _set_cached_response(str(i), "", "m", "x" * 200)
+        assert len(response_cache) <= 2
+        assert _get_cached_response("4", "", "m") == "x" * 200
+
 
 class TestCallOracle:
 
@@ -144,14 +195,25 @@ class TestCallOracle:
             result = call_oracle("test prompt", legend="creator")
         assert result == "hello"
 
-    def test_with_cache(self):
-        _RESPONSE_CACHE.clear()
-        with patch("keanu.oracle._reach_cloud", return_value=("cached_result", {})):
+    def test_with_cache(self, response_cache):
+        reset_session_cost()
+        with patch("keanu.oracle._reach_cloud", return_value=("cached_result", {})) as reach:
             # first call
             r1 = call_oracle("same prompt", legend="creator", use_cache=True)
             # second call should hit cache
             r2 = call_oracle("same prompt", legend="creator", use_cache=True)
         assert r1 == r2 == "cached_result"
+        assert reach.call_count == 1
+        assert get_session_cost().cache_hits == 1
+        assert get_session_cost().cache_misses == 1
+
+    def test_collect_stream_uses_cache(self, response_cache):
+        with patch("keanu.oracle.stream_oracle", return_value=iter(["str", "eamed"])) as stream:
+            assert collect_stream("p", legend="creator", use_cache=True) == "streamed"
+            tokens = []
+            assert collect_stream("p", legend="creator", on_token=tokens.append, use_cache=True) == "streamed"
+        assert stream.call_count == 1
+        assert tokens == ["streamed"]
 
     def test_fallback(self):
         call_count = [0]
@@ -170,6 +232,20 @@ class TestCallOracle:
             except Exception:
                 pass
 
+    def test_fallback_answer_not_cached(self, response_cache):
+        def primary_down(prompt, system, legend, model):
+            if model == "claude-opus-4-6":
+                raise ConnectionError("primary failed")
+            return (f"from {model}", {})
+
+        with patch("keanu.oracle._reach_cloud", side_effect=primary_down) as reach:
+            call_oracle("test", legend="creator", model="claude-opus-4-6",
+                        use_cache=True, use_fallback=True)
+            call_oracle("test", legend="creator", model="claude-opus-4-6",
+                        use_cache=True, use_fallback=True)
+        assert [c.args[3] for c in reach.call_args_list].count("claude-opus-4-6") == 2
+        assert _get_cached_response("test", "", "claude-opus-4-6", "creator") is None
+
     def test_connection_error(self):
         with patch("keanu.oracle._reach_cloud", return_value=(None, {})):
             try:
@@ -179,6 +255,282 @@ class TestCallOracle:
                 pass
 
 
+class _OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"response": "ok", "prompt_eval_count": 3, "eval_count": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool:
+
+    def _serve(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        legend = MagicMock(reach="local", model="m")
+        legend.name = "local"
+        legend.endpoint = f"http://127.0.0.1:{server.server_address[1]}/api/generate"
+        return server, legend
+
+    def test_reuses_keepalive_connection(self):
+        server, legend = self._serve()
+        try:
+            close_sessions()
+            reset_session_cost()
+            call_oracle("a", legend=legend)
+            call_oracle("b", legend=legend)
+            call_oracle("c", legend=legend)
+            assert get_session_cost().calls == 3
+            assert get_session_cost().connections_reused == 2
+        finally:
+            close_sessions()
+            server.shutdown()
+
+    def test_session_shared_across_threads(self):
+        server, legend = self._serve()
+        try:
+            # as many slots as threads: no connection is ever discarded,
+            # so at most one per thread gets opened
+            set_pool_size(4)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(lambda i: _reach_local(str(i), "", legend, "m"), range(20)))
+            assert all(text == "ok" for text, _ in results)
+            assert sum(u["connection_reused"] for _, u in results) >= 20 - 4
+            assert len(oracle_mod._sessions) == 1
+        finally:
+            set_pool_size(16)
+            server.shutdown()
+
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """answers after the prompt's delay ("0.2" sleeps 0.2s), echoing the
+    prompt back. speaks ollama, or anthropic messages on /v1/messages.
+    counts how many requests are in flight at once."""
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path.endswith("/v1/messages"):
+                prompt = req["messages"][0]["content"]
+                time.sleep(float(prompt))
+                payload = {"content": [{"text": f"cloud {prompt}"}],
+                           "usage": {"input_tokens": 5, "output_tokens": 2}}
+            else:
+                prompt = req["prompt"]
+                time.sleep(float(prompt))
+                if req.get("stream"):
+                    return self._stream(prompt)
+                payload = {"response": prompt, "prompt_eval_count": 3, "eval_count": 1}
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def _stream(self, prompt):
+        body = b"".join(json.dumps({"response": part}).encode() + b"\n"
+                        for part in ["a", "b", "c"])
+        body += json.dumps({"response": "", "done": True}).encode() + b"\n"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncOracle:
+
+    @pytest.fixture
+    def server(self):
+        _SlowHandler.active = _SlowHandler.peak = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+
+    def _legend(self, url, reach="local", name="local"):
+        legend = MagicMock(reach=reach, model="m")
+        legend.name = name
+        legend.endpoint = url + ("/v1/messages" if reach == "cloud" else "/api/generate")
+        return legend
+
+    def test_local_call(self, server):
+        reset_session_cost()
+
+        async def main():
+            try:
+                return await acall_oracle("0", legend=self._legend(server))
+            finally:
+                await aclose_oracle()
+
+        assert asyncio.run(main()) == "0"
+        assert get_session_cost().calls == 1
+
+    def test_cloud_call(self, server):
+        async def main():
+            try:
+                return await acall_oracle("0", legend=self._legend(server, "cloud", "creator"))
+            finally:
+                await aclose_oracle()
+
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "k"}), \
+             patch("keanu.oracle._record_fire"):
+            assert asyncio.run(main()) == "cloud 0"
+
+    def test_concurrency_capped_per_legend(self, server):
+        with patch.dict(oracle_mod.CONCURRENCY, {"local": 2}):
+            results = gather_oracle(["0.1"] * 6, legend=self._legend(server))
+        assert results == ["0.1"] * 6
+        assert _SlowHandler.peak == 2
+
+    def test_gather_runs_concurrently(self, server):
+        start = time.time()
+        results = gather_oracle(["0.2"] * 5, legend=self._legend(server))
+        assert results == ["0.2"] * 5
+        assert time.time() - start < 0.8
+        assert _SlowHandler.peak == 5
+
+    def test_gather_keeps_failures_in_place(self, server):
+        results = gather_oracle(["0", "0.5"], legend=self._legend(server), deadline=0.2)
+        assert results[0] == "0"
+        assert isinstance(results[1], TimeoutError)
+
+    def test_deadline(self, server):
+        async def main():
+            try:
+                await acall_oracle("1", legend=self._legend(server), deadline=0.1)
+            finally:
+                await aclose_oracle()
+
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            asyncio.run(main())
+        assert time.time() - start < 0.5
+
+    def test_race_takes_first_acceptable(self, server):
+        start = time.time()
+        winner = race_oracle(["0.05", "0.1", "2"], accept=lambda r: r != "0.05",
+                             legend=self._legend(server))
+        assert winner == "0.1"
+        assert time.time() - start < 1.0
+
+    def test_race_none_when_nothing_acceptable(self, server):
+        assert race_oracle(["0", "0"], accept=lambda r: False, legend=self._legend(server)) is None
+
+    def test_stream(self, server):
+        tokens = []
+
+        async def main():
+            try:
+                return [t async for t in astream_oracle("0", legend=self._legend(server),
+                                                         on_token=tokens.append)]
+            finally:
+                await aclose_oracle()
+
+        assert asyncio.run(main()) == ["a", "b", "c"]
+        assert tokens == ["a", "b", "c"]
+
+    def test_shim_refuses_inside_loop(self):
+        async def main():
+            gather_oracle(["x"])
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(main())
+
+
+class TestPromptCaching:
+
+    MESSAGES = [
+        {"role": "user", "content": "TASK: t", "cache": True},
+        {"role": "user", "content": "RESULT (OK): a"},
+        {"role": "user", "content": "RESULT (OK): b", "cache": True},
+    ]
+
+    def test_string_prompt_unchanged(self):
+        body = _cloud_body("hi", "sys", "m")
+        assert body["system"] == "sys"
+        assert body["messages"] == [{"role": "user", "content": "hi"}]
+
+    def test_structured_prompt_marks_blocks(self):
+        body = _cloud_body(self.MESSAGES, "sys", "m")
+        assert body["system"] == [{"type": "text", "text": "sys",
+                                   "cache_control": {"type": "ephemeral"}}]
+        assert len(body["messages"]) == 1  # same role merges into one message
+        blocks = body["messages"][0]["content"]
+        assert [b["text"] for b in blocks] == ["TASK: t", "RESULT (OK): a", "RESULT (OK): b"]
+        assert [("cache_control" in b) for b in blocks] == [True, False, True]
+
+    def test_breakpoints_capped(self):
+        messages = [{"role": "user", "content": str(i), "cache": True} for i in range(6)]
+        blocks = _cloud_body(messages, "sys", "m")["messages"][0]["content"]
+        marked = [b["text"] for b in blocks if "cache_control" in b]
+        assert marked == ["3", "4", "5"]
+
+    def test_roles_alternate(self):
+        messages = [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"},
+                    {"role": "user", "content": "q2"}]
+        body = _cloud_body(messages, "", "m")
+        assert [m["role"] for m in body["messages"]] == ["user", "assistant", "user"]
+        assert body["system"] == ""
+
+    def test_local_gets_flat_text(self):
+        assert _local_body(self.MESSAGES, "", "m")["prompt"] == flatten_messages(self.MESSAGES)
+        assert flatten_messages(self.MESSAGES) == "TASK: t\n\nRESULT (OK): a\n\nRESULT (OK): b"
+
+    def test_cached_tokens_priced_lower(self):
+        fresh = OracleUsage(model="claude-sonnet-4-5-20250929", input_tokens=100_000)
+        cached = OracleUsage(model="claude-sonnet-4-5-20250929", cache_read_tokens=100_000)
+        written = OracleUsage(model="claude-sonnet-4-5-20250929", cache_write_tokens=100_000)
+        assert cached.cost == pytest.approx(fresh.cost * 0.1)
+        assert written.cost == pytest.approx(fresh.cost * 1.25)
+
+    def test_cache_usage_recorded(self, response_cache):
+        reset_session_cost()
+        api_usage = {"input_tokens": 10, "output_tokens": 5,
+                     "cache_creation_input_tokens": 0, "cache_read_input_tokens": 4000}
+        with patch("keanu.oracle._reach_cloud", return_value=("ok", api_usage)):
+            assert call_oracle(self.MESSAGES, "sys", legend="creator", use_cache=True) == "ok"
+            assert call_oracle(self.MESSAGES, "sys", legend="creator", use_cache=True) == "ok"
+        sc = get_session_cost()
+        assert sc.total_cache_read_tokens == 4000
+        assert sc.cache_hits == 1
+        assert "4000 prompt-cached tokens" in sc.summary()
+
+    def test_stream_reads_cache_usage(self):
+        parser = _CloudStream()
+        parser.feed('data: ' + json.dumps({"type": "message_start", "message": {"usage": {
+            "input_tokens": 12, "cache_creation_input_tokens": 300, "cache_read_input_tokens": 0}}}))
+        usage = parser.usage(self.MESSAGES, "", "m", 0)
+        assert usage.input_tokens == 12
+        assert usage.cache_write_tokens == 300
+
 class TestInterpret:
 
     def test_plain_json(self):
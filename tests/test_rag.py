@@ -1,6 +1,7 @@
 """tests for codebase-aware RAG."""
 
 import json
+import os
 from pathlib import Path
 from unittest.mock import patch
 
@@ -128,6 +129,13 @@ class TestDiscoverFiles:
     def test_empty_dir(self, tmp_path):
         assert discover_files(str(tmp_path)) == []
 
+    def test_skip_only_applies_inside_root(self, tmp_path):
+        root = tmp_path / "build" / "proj"
+        (root / "node_modules").mkdir(parents=True)
+        (root / "node_modules" / "x.js").write_text("x")
+        (root / "main.py").write_text("x = 1\n")
+        assert discover_files(str(root)) == [str(root / "main.py")]
+
 
 class TestFileHash:
 
@@ -208,6 +216,185 @@ class TestIncrementalIndex:
                 assert stats.total_files >= 1
 
 
+    def test_unchanged_stat_skips_hashing(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("x = 1\n")
+        (project / "b.py").write_text("y = 1\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False):
+                build_index(str(project))
+                with patch("keanu.data.rag.file_hash", wraps=file_hash) as hashed:
+                    incremental_index(str(project))
+                    assert hashed.call_count == 0
+
+                # touched but identical: hashed once, not re-chunked, then skipped
+                os.utime(project / "a.py", ns=(1, 1))
+                with patch("keanu.data.rag.file_hash", wraps=file_hash) as hashed, \
+                     patch("keanu.data.rag._chunk_one") as chunked:
+                    incremental_index(str(project))
+                    assert hashed.call_count == 1
+                    assert chunked.call_count == 0
+                with patch("keanu.data.rag.file_hash", wraps=file_hash) as hashed:
+                    incremental_index(str(project))
+                    assert hashed.call_count == 0
+
+    def test_parallel_build_matches_serial(self, tmp_path):
+        project = tmp_path / "project"
+        project.mkdir()
+        for i in range(6):
+            (project / f"m{i}.py").write_text(f"def f{i}():\n    return {i}\n")
+
+        stored = {}
+        for workers in (1, 2):
+            rag_dir = tmp_path / f"rag{workers}"
+            with patch("keanu.data.rag._RAG_DIR", rag_dir), \
+                 patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False), \
+                 patch("keanu.data.rag._PARALLEL_MIN_FILES", 1):
+                build_index(str(project), workers=workers)
+                stored[workers] = _load_json_chunks()
+                assert _load_meta()["manifest"]
+        assert stored[1] == stored[2]
+        assert len(stored[1]) == 6
+
+
+    def test_deleted_files_pruned_and_counts_exact(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def alpha(): pass\n")
+        (project / "b.py").write_text("def beta(): pass\n\ndef beta_two(): pass\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False):
+                build_index(str(project))
+                assert get_index_stats().total_chunks == 3
+                for _ in range(3):
+                    (project / "b.py").write_text("def beta(): return 1\n")
+                    incremental_index(str(project))
+                assert get_index_stats().total_chunks == 2
+
+                (project / "a.py").unlink()
+                stats = incremental_index(str(project))
+                assert stats.total_files == 1
+                assert stats.total_chunks == 1
+                assert [c["file_path"] for c in _load_json_chunks()] == [str(project / "b.py")]
+                assert keyword_search("alpha") == []
+                assert str(project / "a.py") not in _load_meta()["manifest"]
+
+    def test_chromadb_stale_ids_deleted_before_upsert(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def alpha(): pass\n")
+        (project / "b.py").write_text("def beta(): pass\n")
+        calls = []
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb",
+                       side_effect=lambda chunks, root, incremental=False: calls.append(("upsert", [c.id for c in chunks])) or True), \
+                 patch("keanu.data.rag._delete_chromadb",
+                       side_effect=lambda ids: calls.append(("delete", sorted(ids))) or True):
+                build_index(str(project))
+                old = _load_meta()["manifest"]
+                calls.clear()
+
+                (project / "a.py").write_text("def alpha(): return 2\n")
+                (project / "b.py").unlink()
+                incremental_index(str(project))
+
+                new_ids = _load_meta()["manifest"][str(project / "a.py")]["chunks"]
+                stale = sorted(old[str(project / "a.py")]["chunks"] + old[str(project / "b.py")]["chunks"])
+                assert calls == [("delete", stale), ("upsert", new_ids)]
+                assert _load_meta()["backend"] == "chromadb"
+
+    def test_chromadb_lost_mid_build_rebuilds_in_json(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        for name in ("a", "b", "c"):
+            (project / f"{name}.py").write_text(f"def {name}(): pass\n")
+        upserts = []
+
+        def store(chunks, root, incremental=False):
+            upserts.append(chunks)
+            return len(upserts) == 1
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag.FILE_BATCH", 1), \
+                 patch("keanu.data.rag._store_chromadb", side_effect=store), \
+                 patch("keanu.data.rag._delete_chromadb", return_value=True):
+                stats = build_index(str(project))
+                assert _load_meta()["backend"] == "json"
+                assert stats.total_chunks == 3
+                assert len(_load_json_chunks()) == 3
+
+    def test_chromadb_lost_mid_incremental_rebuilds_in_json(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def alpha(): pass\n")
+        (project / "b.py").write_text("def beta(): pass\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._delete_chromadb", return_value=True):
+                with patch("keanu.data.rag._store_chromadb", return_value=True):
+                    build_index(str(project))
+                (project / "a.py").write_text("def alpha(): return 2\n")
+                with patch("keanu.data.rag._store_chromadb", return_value=False):
+                    incremental_index(str(project))
+                assert _load_meta()["backend"] == "json"
+                assert sorted(c["file_path"] for c in _load_json_chunks()) == [
+                    str(project / "a.py"), str(project / "b.py")]
+
+    def test_chromadb_failed_delete_forces_full_rebuild(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def alpha(): pass\n")
+        (project / "b.py").write_text("def beta(): pass\n")
+        stores = []
+
+        def store(chunks, root, incremental=False):
+            stores.append(incremental)
+            return True
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", side_effect=store):
+                build_index(str(project))
+                stores.clear()
+                (project / "a.py").write_text("def alpha(): return 2\n")
+                with patch("keanu.data.rag._delete_chromadb", return_value=False):
+                    stats = incremental_index(str(project))
+                # the stale ids were never upserted over; a full store
+                # recreates the collection so they can't linger
+                assert stores == [False]
+                assert stats.total_files == 2
+
+    def test_pre_manifest_index_rebuilt(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("x = 1\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False):
+                _save_meta({"root": str(project), "chunks": 40, "file_hashes": {}})
+                stats = incremental_index(str(project))
+                assert stats.total_chunks == 1
+                assert _load_meta()["manifest"]
+
+
 class TestKeywordSearch:
 
     def test_finds_match(self, tmp_path):
@@ -243,6 +430,111 @@ class TestKeywordSearch:
             assert results == []
 
 
+    def test_bm25_ranks_rarer_and_denser_terms_higher(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def parse_config(path):\n    return load(path)\n")
+        (project / "b.py").write_text("def load(path):\n    return open(path).read()\n")
+        (project / "c.py").write_text("def other():\n    return path\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False):
+                build_index(str(project))
+                results = keyword_search("parse config")
+                assert results[0].chunk.file_path.endswith("a.py")
+                assert results[0].score == 1.0
+                assert "parse_config" in results[0].chunk.content
+
+    def test_index_follows_incremental_updates(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def alpha(): pass\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=False):
+                build_index(str(project))
+                assert keyword_search("alpha")
+                (project / "a.py").write_text("def beta(): pass\n")
+                incremental_index(str(project))
+                assert keyword_search("alpha") == []
+                assert "beta" in keyword_search("beta")[0].chunk.content
+
+    def test_index_built_even_with_chromadb(self, tmp_path):
+        rag_dir = tmp_path / "rag"
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "a.py").write_text("def gamma(): pass\n")
+
+        with patch("keanu.data.rag._RAG_DIR", rag_dir):
+            with patch("keanu.data.rag._INDEX_META", rag_dir / "meta.json"), \
+                 patch("keanu.data.rag._store_chromadb", return_value=True):
+                build_index(str(project))
+                assert not (rag_dir / "chunks.json").exists()
+                assert "gamma" in keyword_search("gamma")[0].chunk.content
+
+
+class TestBM25Index:
+
+    def test_tokenize_splits_identifiers(self):
+        from keanu.data.bm25 import tokenize
+        terms = tokenize("parseConfig hello_world HTTPServer 42")
+        assert {"parseconfig", "parse", "config", "hello_world", "hello", "world",
+                "httpserver", "http", "server", "42"} <= set(terms)
+
+    def test_replace_and_remove_group(self, tmp_path):
+        from keanu.data.bm25 import BM25Index
+        index = BM25Index(tmp_path)
+        index.clear()
+        index.replace("a", [("a1", "apple banana", {"f": "a"})])
+        index.replace("b", [("b1", "banana cherry", {"f": "b"})])
+        index.save()
+
+        reopened = BM25Index(tmp_path)
+        assert [h[0] for h in reopened.search("apple")] == ["a1"]
+        assert reopened.search("apple")[0][2] == {"f": "a"}
+        reopened.replace("a", [("a2", "cherry", {"f": "a"})])
+        reopened.remove("b")
+        reopened.save()
+
+        final = BM25Index(tmp_path)
+        assert final.search("apple") == []
+        assert final.search("banana") == []
+        assert [h[0] for h in final.search("cherry")] == ["a2"]
+        assert len(final) == 1
+
+    def test_remove_group_saved_with_shards_only(self, tmp_path):
+        from keanu.data.bm25 import BM25Index
+        index = BM25Index(tmp_path)
+        index.clear()
+        index.replace("a", [("a1", "apple banana", {})])
+        index.replace("b", [("b1", "banana", {})])
+        group = index._groups["a"]
+        group["shards"] = sorted({index._shard_of(t) for t in group.pop("terms")})
+        index.save()
+
+        reopened = BM25Index(tmp_path)
+        reopened.remove("a")
+        assert reopened.search("apple") == []
+        assert [h[0] for h in reopened.search("banana")] == ["b1"]
+
+    def test_query_reads_only_its_shards(self, tmp_path):
+        from keanu.data.bm25 import BM25Index
+        index = BM25Index(tmp_path)
+        index.clear()
+        index.replace("g", [(f"d{i}", f"word{i} common", {}) for i in range(50)])
+        assert len(index._shards) == BM25Index.SHARDS
+        index.save()
+
+        reopened = BM25Index(tmp_path)
+        hits = reopened.search("word7", k=3)
+        assert hits[0][0] == "d7"
+        assert len(reopened._shards) <= 3  # word7, word, 7
+
+
 class TestJsonStore:
 
     def test_store_and_load(self, tmp_path):
@@ -1,6 +1,8 @@
 """tests for oracle streaming support."""
 
 import json
+
+import pytest
 from unittest.mock import patch, MagicMock
 
 from keanu.oracle import (
@@ -14,6 +16,16 @@ class _FakeResponse:
     def __init__(self, chunks, status_code=200):
         self.chunks = chunks
         self.status_code = status_code
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -64,7 +76,7 @@ class TestStreamCloud:
         legend.name = "test"
 
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-            with patch("keanu.oracle.requests.post", return_value=response):
+            with patch("keanu.oracle._post", return_value=response):
                 chunks = list(_stream_cloud("test", "", legend, "test-model", None, 0))
 
         assert chunks == ["Hello", " world", "!"]
@@ -80,7 +92,7 @@ class TestStreamCloud:
         received = []
 
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-            with patch("keanu.oracle.requests.post", return_value=response):
+            with patch("keanu.oracle._post", return_value=response):
                 list(_stream_cloud("test", "", legend, "test-model", received.append, 0))
 
         assert received == ["a", "b"]
@@ -93,6 +105,35 @@ class TestStreamCloud:
             chunks = list(_stream_cloud("test", "", legend, "test-model", None, 0))
         assert chunks == []
 
+    def test_closes_response_when_abandoned(self):
+        response = _FakeResponse(_make_cloud_events(["a", "b", "c"]))
+
+        legend = MagicMock()
+        legend.endpoint = "https://api.anthropic.com/v1/messages"
+        legend.name = "test"
+
+        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
+            with patch("keanu.oracle._post", return_value=response):
+                gen = _stream_cloud("test", "", legend, "test-model", None, 0)
+                assert next(gen) == "a"
+                gen.close()
+
+        assert response.closed
+
+    def test_closes_response_on_http_error(self):
+        response = _FakeResponse([], status_code=500)
+
+        legend = MagicMock()
+        legend.endpoint = "https://api.anthropic.com/v1/messages"
+        legend.name = "test"
+
+        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
+            with patch("keanu.oracle._post", return_value=response):
+                with pytest.raises(Exception, match="HTTP 500"):
+                    list(_stream_cloud("test", "", legend, "test-model", None, 0))
+
+        assert response.closed
+
 
 class TestStreamLocal:
 
@@ -103,10 +144,11 @@ class TestStreamLocal:
         legend = MagicMock()
         legend.endpoint = "http://localhost:11434/api/generate"
 
-        with patch("keanu.oracle.requests.post", return_value=response):
+        with patch("keanu.oracle._post", return_value=response):
             chunks = list(_stream_local("test", "", legend, "test-model", None, 0))
 
         assert chunks == ["Hello", " world"]
+        assert response.closed
 
 
 class TestCollectStream:
@@ -122,7 +164,7 @@ class TestCollectStream:
         legend.reach = "cloud"
 
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-            with patch("keanu.oracle.requests.post", return_value=response):
+            with patch("keanu.oracle._post", return_value=response):
                 with patch("keanu.oracle.load_legend", return_value=legend):
                     result = collect_stream("test", legend=legend)
 
@@ -142,7 +184,7 @@ class TestStreamOracle:
         legend.reach = "cloud"
 
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-            with patch("keanu.oracle.requests.post", return_value=response):
+            with patch("keanu.oracle._post", return_value=response):
                 with patch("keanu.oracle.load_legend", return_value=legend):
                     chunks = list(stream_oracle("test", legend=legend))
 
@@ -158,7 +200,7 @@ class TestStreamOracle:
         legend.model = "test-model"
         legend.reach = "local"
 
-        with patch("keanu.oracle.requests.post", return_value=response):
+        with patch("keanu.oracle._post", return_value=response):
             with patch("keanu.oracle.load_legend", return_value=legend):
                 chunks = list(stream_oracle("test", legend=legend))
 
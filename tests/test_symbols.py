@@ -64,6 +64,18 @@ class TestFindDefinition:
         # may or may not find it, but shouldn't crash
         assert isinstance(results, list)
 
+    def test_prefix(self, tmp_path):
+        (tmp_path / "a.py").write_text("def greet(): pass\ndef greeting(): pass\ndef other(): pass\n")
+        results = find_definition("greet", str(tmp_path), prefix=True)
+        assert [r.name for r in results] == ["greet", "greeting"]
+
+    def test_sees_edits(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("def greet(): pass\n")
+        assert find_definition("greet", str(tmp_path))
+        f.write_text("def welcome(): pass\n")
+        assert find_definition("greet", str(tmp_path)) == []
+
 
 class TestFindReferences:
 
@@ -0,0 +1,157 @@
+"""tests for the persistent symbol index."""
+
+import os
+import time
+
+from keanu.analysis.symindex import SymbolIndex
+
+
+def _age(*paths):
+    """push mtimes into the past, so the index trusts them."""
+    old = time.time() - 60
+    for p in paths:
+        os.utime(p, (old, old))
+
+
+def _index(tmp_path):
+    root = tmp_path / "proj"
+    root.mkdir()
+    return root, SymbolIndex(root, directory=tmp_path / "index")
+
+
+class TestDefinitions:
+
+    def test_exact_and_prefix(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text(
+            "def parse_config():\n    pass\n\n"
+            "class Parser:\n    def parse(self):\n        pass\n")
+        (root / "b.py").write_text("parse_limit = 3\n")
+        exact = index.definitions("parse")
+        assert [(d.kind, d.parent, d.line) for d in exact] == [("method", "Parser", 5)]
+        names = sorted(d.name for d in index.definitions("parse", prefix=True))
+        assert names == ["parse", "parse_config", "parse_limit"]
+        assert index.definitions("Pars", prefix=True)[0].name == "Parser"
+
+    def test_other_languages(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "app.ts").write_text("export interface Props {}\nexport function render() {}\n")
+        (root / "main.go").write_text("func Serve() {\n}\n")
+        (root / "render.py").write_text("def render():\n    pass\n")
+        render = index.definitions("render")
+        assert sorted(d.language for d in render) == ["python", "typescript"]
+        assert index.definitions("render", languages={"typescript"})[0].exported
+        assert index.definitions("Serve")[0].language == "go"
+
+    def test_syntax_error_falls_back_to_regex(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "broken.py").write_text("def ok():\n    pass\n\ndef broken(:\n")
+        assert [d.line for d in index.definitions("ok")] == [1]
+
+
+class TestCalls:
+
+    def test_callers_and_callees(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text(
+            "def helper():\n    pass\n\n"
+            "class Job:\n    def run(self):\n        helper()\n        self.done()\n\n"
+            "helper()\n")
+        assert [(c.caller, c.line) for c in index.callers("helper")] == [("Job.run", 6), ("", 9)]
+        assert [c.callee for c in index.callees("Job.run")] == ["helper", "done"]
+
+
+class TestWords:
+
+    def test_files_containing_is_a_superset(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("x = load_config()\n")
+        (root / "b.py").write_text("y = 1\n")
+        (root / "c.js").write_text("cfg.load_config_file()\n")
+        assert index.files_containing("load_config") == ["a.py", "c.js"]
+        assert index.files_containing("config(") == ["a.py", "c.js"]
+        assert index.files_containing("==") == ["a.py", "b.py", "c.js"]
+        assert index.files_with_word("load_config") == ["a.py"]
+        assert index.files_with_word("load_config", languages={"javascript"}) == []
+
+
+class TestIncremental:
+
+    def test_unchanged_files_are_not_reparsed(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        (root / "b.py").write_text("def b():\n    pass\n")
+        _age(root / "a.py", root / "b.py")
+        index.definitions("a")
+        assert index.parsed == 2
+        index.definitions("b")
+        assert index.parsed == 2
+
+    def test_changed_file_is_reparsed_alone(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        (root / "b.py").write_text("def b():\n    pass\n")
+        index.definitions("a")
+        (root / "a.py").write_text("def renamed():\n    pass\n")
+        assert index.definitions("a") == []
+        assert index.definitions("renamed")[0].file == "a.py"
+        assert index.parsed == 3
+
+    def test_touch_without_change_keeps_entry(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        index.definitions("a")
+        _age(root / "a.py")
+        assert index.definitions("a")
+        assert index.parsed == 1
+
+    def test_removed_file_is_dropped(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        assert index.definitions("a")
+        (root / "a.py").unlink()
+        assert index.definitions("a") == []
+        assert len(index) == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        _age(root / "a.py")
+        index.definitions("a")
+        again = SymbolIndex(root, directory=tmp_path / "index")
+        assert again.definitions("a")[0].line == 1
+        assert again.parsed == 0
+
+    def test_only_moved_rows_are_written(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        (root / "b.py").write_text("def b():\n    pass\n")
+        _age(root / "a.py", root / "b.py")
+        index.definitions("a")
+        written = index._db.total_changes
+        (root / "a.py").write_text("def renamed():\n    pass\n")
+        _age(root / "a.py")
+        index.definitions("renamed")
+        assert index._db.total_changes == written + 1
+
+    def test_new_instance_reads_only_what_it_asks_for(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("import os\n\ndef a():\n    pass\n")
+        _age(root / "a.py")
+        index.definitions("a")
+        again = SymbolIndex(root, directory=tmp_path / "index")
+        assert again.imports()["a.py"][1] == ["os"]
+        assert "words" not in again._files["a.py"]
+        assert again.parsed == 0
+
+    def test_missing_row_is_parsed_again(self, tmp_path):
+        root, index = _index(tmp_path)
+        (root / "a.py").write_text("def a():\n    pass\n")
+        _age(root / "a.py")
+        index.definitions("a")
+        again = SymbolIndex(root, directory=tmp_path / "index")
+        len(again)
+        with index._db:
+            index._db.execute("DELETE FROM files")
+        assert again.definitions("a")[0].file == "a.py"
+        assert again.parsed == 1
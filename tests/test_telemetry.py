@@ -1,11 +1,12 @@
 """tests for telemetry and tracing."""
 
+import time
 from unittest.mock import patch
 
 from keanu.abilities.world.telemetry import (
     Span, start_span, end_span, get_active_spans, trace_span,
-    get_spans, analyze_traces, trace_summary, TraceStats,
-    _ACTIVE_SPANS,
+    get_spans, get_spans_since, analyze_traces, trace_summary, TraceStats,
+    SpanStore, _ACTIVE_SPANS,
 )
 
 
@@ -159,3 +160,103 @@ class TestTraceSummary:
             summary = trace_summary(days=7)
         assert "period_days" in summary
         assert summary["total_spans"] == 0
+
+
+class TestSpanStore:
+
+    def _fill(self, store, n, start=1000.0):
+        for i in range(n):
+            store.write({"name": f"op{i}", "trace_id": f"t{i % 3}", "start_time": start + i})
+        store.flush()
+
+    def test_writes_are_buffered(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.FLUSH_SECONDS = 60
+        store.write({"name": "a"})
+        assert store.segments() == []
+        store.flush()
+        assert len(store.segments()) == 1
+
+    def test_flushes_on_timer(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.FLUSH_SECONDS = 0.05
+        store.write({"name": "a"})
+        deadline = time.time() + 2
+        while not store.segments() and time.time() < deadline:
+            time.sleep(0.01)
+        assert store._buffer == []
+        assert store.segments()[0].read_text().count("\n") == 1
+
+    def test_failed_flush_keeps_spans(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.FLUSH_SECONDS = 60
+        store.write({"name": "a"})
+        with patch.object(store, "_active_segment", side_effect=OSError("disk full")):
+            store.flush()
+        assert len(store._buffer) == 1
+        store.flush()
+        assert [s["name"] for s in store.all()] == ["a"]
+
+    def test_flushes_when_buffer_fills(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.FLUSH_SECONDS, store.FLUSH_SPANS = 60, 3
+        for i in range(3):
+            store.write({"name": str(i)})
+        assert store._buffer == []
+        assert store.segments()[0].read_text().count("\n") == 3
+
+    def test_rotates_and_tails_across_segments(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.SEGMENT_BYTES, store.FLUSH_SPANS = 200, 1
+        self._fill(store, 20)
+        assert len(store.segments()) > 2
+        assert [s["name"] for s in store.tail(5)] == [f"op{i}" for i in range(15, 20)]
+        assert len(store.tail(100)) == 20
+        assert [s["name"] for s in store.all()] == [f"op{i}" for i in range(20)]
+
+    def test_trace_uses_offsets(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.SEGMENT_BYTES, store.FLUSH_SPANS = 300, 1
+        self._fill(store, 12)
+        assert [s["name"] for s in store.trace("t1")] == ["op1", "op4", "op7", "op10"]
+        assert store.trace("nope") == []
+
+    def test_since_skips_old_segments(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        store.SEGMENT_BYTES, store.FLUSH_SPANS = 200, 1
+        self._fill(store, 20)
+        read = []
+        from keanu.abilities.world import telemetry
+        real = telemetry._read_spans
+        with patch.object(telemetry, "_read_spans", lambda p: read.append(p) or real(p)):
+            spans = store.since(1017)
+        assert [s["name"] for s in spans] == ["op17", "op18", "op19"]
+        assert len(read) < len(store.segments())
+
+    def test_index_catches_up(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        self._fill(store, 2)
+        assert len(store.trace("t0")) == 1
+        self._fill(store, 4, start=2000.0)
+        assert len(store.trace("t0")) == 3
+
+    def test_legacy_log_read_first(self, tmp_path):
+        log = tmp_path / "spans.jsonl"
+        log.write_text('{"name": "old", "trace_id": "t0", "start_time": 1}\n')
+        store = SpanStore(log)
+        self._fill(store, 1)
+        assert [s["name"] for s in store.all()] == ["old", "op0"]
+        assert [s["name"] for s in store.trace("t0")] == ["old", "op0"]
+
+    def test_torn_line_skipped(self, tmp_path):
+        store = SpanStore(tmp_path / "spans.jsonl")
+        self._fill(store, 2)
+        with open(store.segments()[-1], "a") as f:
+            f.write('{"name": "half')
+        assert [s["name"] for s in store.tail(5)] == ["op0", "op1"]
+        assert len(store.trace("t0")) == 1
+
+    def test_get_spans_since(self, tmp_path):
+        with patch("keanu.abilities.world.telemetry._SPANS_LOG", tmp_path / "spans.jsonl"):
+            end_span(start_span("now"))
+            assert [s["name"] for s in get_spans_since(0)] == ["now"]